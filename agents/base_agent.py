@@ -4,16 +4,29 @@ Foundation for all AI agents with common functionality.
 """
 
 import logging
+from collections import deque
+from itertools import islice
 
 import anthropic
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Smallest usable history: a user prompt plus one tool_use/tool_result exchange
+_HISTORY_MIN = 3
+
+
+def _is_prompt(message):
+    """Return True for a plain-text user message (the start of a turn)."""
+    return message["role"] == "user" and isinstance(message["content"], str)
+
 
 class BaseAgent:
     """Base class for all AI agents."""
 
+    # Read once at import so tests that patch Settings still get an int
+    history_max = max(Settings.HISTORY_MAX or 64, _HISTORY_MIN)
+
     def __init__(self, api_key=None, model=None):
         """
         Initialize the base agent.
@@ -29,18 +42,40 @@ class BaseAgent:
             raise ValueError("Anthropic API key not configured")
 
         self.client = anthropic.Anthropic(api_key=self.api_key)
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=self.history_max)
 
     def add_to_history(self, role, content):
-        """Add a message to conversation history."""
-        self.conversation_history.append({
-            "role": role,
-            "content": content
-        })
+        """
+        Add a message to conversation history.
+
+        Once the history is full the oldest messages are evicted. Eviction
+        continues up to the next plain-text user message so the history never
+        starts with an assistant turn or an orphaned tool_result.
+
+        If a single turn outgrows the history, its prompt is kept and the
+        oldest tool_use/tool_result exchange after it is dropped instead.
+        """
+        history = self.conversation_history
+        message = {"role": role, "content": content}
+        if len(history) < history.maxlen:
+            history.append(message)
+            return
+
+        if not _is_prompt(message) and not any(_is_prompt(m) for m in islice(history, 1, None)):
+            # The whole history is the current turn
+            del history[1]
+            if len(history) > 1:
+                del history[1]
+            history.append(message)
+            return
+
+        history.append(message)
+        while len(history) > 1 and not _is_prompt(history[0]):
+            history.popleft()
 
     def clear_history(self):
         """Clear conversation history."""
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=self.history_max)
 
     def call_claude(self, messages, tools=None, max_tokens=None, system=None):
         """
@@ -5,15 +5,49 @@ Collects and summarizes news about topics you care about.
 """
 
 import os
+import queue
 import re
 import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 
+import requests
+
 from agents.base_agent import BaseAgent
 from config.settings import Settings
+from utils.news_cache import NewsCache
 
 logger = logging.getLogger(__name__)
 
+BRAVE_SEARCH_URL = "https://api.search.brave.com/res/v1/web/search"
+SEARCH_TIMEOUT_SECONDS = 15
+MAX_CONCURRENT_SEARCHES = 4  # stay well inside Brave's per-second rate limit
+
+# Markdown subset used in digests. Inline markup (bold, links) is matched on
+# its own so it can be re-applied inside headers, bold text and link labels.
+_INLINE_MD = r"\*\*(?P<bold>.+?)\*\*|\[(?P<link_text>.+?)\]\((?P<link_url>.+?)\)"
+_INLINE_MD_RE = re.compile(_INLINE_MD)
+_MD_RE = re.compile(
+    r"^(?P<hashes>#{1,3}) (?P<header>.+)$|" + _INLINE_MD + r"|(?P<breaks>\n\n?)",
+    re.MULTILINE,
+)
+
+
+def _md_sub(match):
+    """Return the HTML for whichever markdown construct matched."""
+    groups = match.groupdict()
+    if groups.get("header") is not None:
+        level = len(groups["hashes"])
+        return f"<h{level}>{_INLINE_MD_RE.sub(_md_sub, groups['header'])}</h{level}>"
+    if groups["bold"] is not None:
+        return f"<strong>{_INLINE_MD_RE.sub(_md_sub, groups['bold'])}</strong>"
+    if groups["link_text"] is not None:
+        text = _INLINE_MD_RE.sub(_md_sub, groups["link_text"])
+        return f'<a href="{groups["link_url"]}">{text}</a>'
+    return "<br>" * len(groups["breaks"])
+
 
 class NewsDigestAgent(BaseAgent):
     def __init__(self):
@@ -28,24 +62,86 @@ class NewsDigestAgent(BaseAgent):
         self.email_from = Settings.EMAIL_FROM
         self.email_to = Settings.EMAIL_TO
 
+        # Searches reuse pooled sessions (and their TLS connections). A
+        # requests.Session isn't guaranteed thread-safe, so each concurrent
+        # search in search_news_many borrows its own.
+        self._http = self._new_session()
+        self._idle_sessions = queue.Queue(maxsize=MAX_CONCURRENT_SEARCHES)
+        self._idle_sessions.put_nowait(self._http)
+
+        # Reruns within the same hour reuse earlier results instead of
+        # refetching; without a usable cache every search goes to Brave
+        self._cache = None
+        try:
+            self._cache = NewsCache()
+            self._cache.prune()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("News cache unavailable, searching without it: %s", e)
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+
+    def _new_session(self):
+        """Create an HTTP session carrying the Brave Search headers."""
+        session = requests.Session()
+        session.headers.update({
+            "Accept": "application/json",
+            "X-Subscription-Token": self.brave_key
+        })
+        return session
+
+    @contextmanager
+    def _session(self):
+        """Borrow an HTTP session, returning it to the pool afterwards."""
+        try:
+            session = self._idle_sessions.get_nowait()
+        except queue.Empty:
+            session = self._new_session()
+
+        try:
+            yield session
+        finally:
+            try:
+                self._idle_sessions.put_nowait(session)
+            except queue.Full:
+                session.close()
+
+    def close(self):
+        """Close the pooled HTTP sessions and the results cache."""
+        while True:
+            try:
+                self._idle_sessions.get_nowait().close()
+            except queue.Empty:
+                break
+        self._http.close()
+        if self._cache is not None:
+            self._cache.close()
+
     def search_news(self, topic, num_results=5):
         """Search for recent news about a topic using Brave Search."""
         logger.info("Searching news about: %s", topic)
 
+        cached = None
+        if self._cache is not None:
+            try:
+                cached = self._cache.get(topic, num_results)
+            except sqlite3.Error as e:
+                logger.warning("News cache read failed for '%s': %s", topic, e)
+        if cached is not None:
+            logger.info("Using cached results for '%s'", topic)
+            return cached
+
         try:
-            import requests
-            url = "https://api.search.brave.com/res/v1/web/search"
-            headers = {
-                "Accept": "application/json",
-                "X-Subscription-Token": self.brave_key
-            }
             params = {
                 "q": f"{topic} news",
                 "count": num_results,
                 "freshness": "pd"  # Past day
             }
 
-            response = requests.get(url, headers=headers, params=params)
+            with self._session() as http:
+                response = http.get(
+                    BRAVE_SEARCH_URL, params=params, timeout=SEARCH_TIMEOUT_SECONDS
+                )
             response.raise_for_status()
             data = response.json()
 
@@ -60,12 +156,36 @@ class NewsDigestAgent(BaseAgent):
                 })
 
             logger.info("Found %d articles for '%s'", len(articles), topic)
+            if self._cache is not None:
+                try:
+                    self._cache.put(topic, num_results, None, articles)
+                except sqlite3.Error as e:
+                    logger.warning("News cache write failed for '%s': %s", topic, e)
             return articles
 
         except Exception as e:
             logger.error("Error searching for '%s': %s", topic, e)
             return []
 
+    def search_news_many(self, topics, num_results=5):
+        """
+        Search several topics concurrently.
+
+        Args:
+            topics: List of topics to search
+            num_results: Number of articles per topic
+
+        Returns:
+            Dict mapping each topic to its articles, in the order given
+        """
+        if len(topics) <= 1:
+            return {topic: self.search_news(topic, num_results=num_results) for topic in topics}
+
+        workers = min(len(topics), MAX_CONCURRENT_SEARCHES)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda topic: self.search_news(topic, num_results=num_results), topics)
+            return dict(zip(topics, results))
+
     def generate_digest(self, topics_with_articles):
         """Use Claude to generate a news digest from collected articles."""
         logger.info("Generating digest with Claude...")
@@ -169,36 +289,15 @@ Format the digest in clean markdown with headers (start with ##), bullet points,
             return False
 
     def _markdown_to_html(self, markdown_text):
-        """Simple markdown to HTML conversion for email."""
-        html = markdown_text
-
-        # Convert headers (must do in reverse order to avoid conflicts)
-        html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-        html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-        html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-
-        # Convert bold
-        html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
-
-        # Convert links
-        html = re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2">\1</a>', html)
-
-        # Convert line breaks
-        html = html.replace('\n\n', '<br><br>')
-        html = html.replace('\n', '<br>')
-
-        return html
+        """Simple markdown to HTML conversion for email (single regex pass)."""
+        return _MD_RE.sub(_md_sub, markdown_text)
 
     def create_digest(self, topics, articles_per_topic=5):
         """Create a news digest for the given topics."""
         logger.info("Creating digest for topics: %s", ', '.join(topics))
 
         # Collect articles for each topic
-        topics_with_articles = {}
-
-        for topic in topics:
-            articles = self.search_news(topic, num_results=articles_per_topic)
-            topics_with_articles[topic] = articles
+        topics_with_articles = self.search_news_many(topics, num_results=articles_per_topic)
 
         # Generate the digest
         digest = self.generate_digest(topics_with_articles)
@@ -246,6 +345,7 @@ Daily News Digest Agent
 Powered by Claude + Brave Search
 """)
 
+    agent = None
     try:
         agent = NewsDigestAgent()
 
@@ -275,6 +375,9 @@ Powered by Claude + Brave Search
 
     except Exception as e:
         logger.error("Error: %s", e)
+    finally:
+        if agent:
+            agent.close()
 
 
 if __name__ == "__main__":
@@ -115,7 +115,7 @@ class ResearchAgent(BaseAgent):
 
             # Call Claude with tool definitions
             response = self.call_claude(
-                messages=self.conversation_history,
+                messages=list(self.conversation_history),
                 tools=tools
             )
 
@@ -190,7 +190,7 @@ class ResearchAgent(BaseAgent):
                     break
 
                 if user_input.lower() == 'clear':
-                    self.conversation_history = []
+                    self.clear_history()
                     print("Conversation history cleared\n")
                     continue
 
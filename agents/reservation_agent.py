@@ -6,6 +6,7 @@ Interactive agent for making restaurant reservations via Resy.
 import json
 import logging
 import os
+import shlex
 import subprocess
 import sys
 from datetime import datetime
@@ -25,6 +26,83 @@ _BROWSER_SEARCH_SCRIPT = os.path.join(
     "scripts", "browser_search.py"
 )
 
+# Reuse one SSH connection for back-to-back remote sniper scheduling: the
+# first call becomes the master and later calls open a channel on it
+# instead of paying a full handshake. %C hashes user/host/port so long
+# hostnames can't overflow the unix-socket path limit (ssh would silently
+# fall back to unmultiplexed connections)
+_SSH_MULTIPLEX_OPTIONS = (
+    "-o", "ControlMaster=auto",
+    "-o", "ControlPath=~/.ssh/cm-%C",
+    "-o", "ControlPersist=60s",
+)
+
+# Fail fast instead of hanging: no interactive prompts, bounded connect time,
+# and drop a connection whose server stops answering keepalives
+_SSH_BATCH_OPTIONS = (
+    "-o", "BatchMode=yes",
+    "-o", "ConnectTimeout=5",
+    "-o", "ServerAliveInterval=5",
+)
+
+# ssh exits with 255 when the connection itself fails (vs. the remote command)
+_SSH_CONNECTION_ERROR = 255
+_SSH_TIMEOUT_SECONDS = 15
+
+# schedule_sniper calls from one model response share a single SSH exec;
+# each job's output ends with a marker line carrying its exit status
+_SNIPER_BATCH_MARKER = "__SNIPER_EXIT__"
+_SNIPER_BATCH_MAX = 50
+
+
+def _ssh_command(remote_host: str, remote_cmd: str) -> list:
+    """Build the ssh argv that runs remote_cmd on remote_host."""
+    return [
+        "ssh", "-o", "StrictHostKeyChecking=accept-new",
+        *_SSH_BATCH_OPTIONS, *_SSH_MULTIPLEX_OPTIONS,
+        remote_host, remote_cmd,
+    ]
+
+
+def _remote_sniper_command(job: dict) -> str:
+    """Build the run_sniper.py invocation for one job, every argument shell-quoted."""
+    return (
+        f"python3 scripts/run_sniper.py "
+        f"{shlex.quote(job['venue_slug'])} {shlex.quote(job['date'])} {shlex.quote(job['preferred_time'])} "
+        f"--party-size {shlex.quote(str(job['party_size']))} --at {shlex.quote(job['drop_time'])}"
+    )
+
+
+def _split_batch_output(stdout: str) -> list:
+    """Split batched remote output into (output, exit_status) pairs, one per finished job."""
+    finished = []
+    lines = []
+    for line in stdout.splitlines():
+        if line.startswith(_SNIPER_BATCH_MARKER):
+            finished.append(("\n".join(lines).strip(), int(line[len(_SNIPER_BATCH_MARKER):])))
+            lines = []
+        else:
+            lines.append(line)
+    return finished
+
+
+# Venue and time-slot fields passed through to the model from cuisine search
+_VENUE_FIELDS = ('name', 'slug', 'rating', 'review_count', 'cuisine', 'price_range', 'neighborhood')
+_SLOT_FIELDS = ('time', 'type', 'config_id')
+
+
+def _format_venue_results(results: list) -> list:
+    """Trim cuisine search results to the fields returned to the model."""
+    formatted = []
+    for r in results:
+        venue = {k: r.get(k) for k in _VENUE_FIELDS}
+        # Include available time slots
+        times = r.get('available_times')
+        if times:
+            venue['available_times'] = [{k: t[k] for k in _SLOT_FIELDS} for t in times]
+        formatted.append(venue)
+    return formatted
+
 
 class ReservationAgent(BaseAgent):
     """Interactive agent for making restaurant reservations on Resy."""
@@ -396,25 +474,7 @@ IMPORTANT BEHAVIORS:
                         raise
 
             if results:
-                formatted = []
-                for r in results:
-                    venue = {
-                        'name': r.get('name'),
-                        'slug': r.get('slug'),
-                        'rating': r.get('rating'),
-                        'review_count': r.get('review_count'),
-                        'cuisine': r.get('cuisine'),
-                        'price_range': r.get('price_range'),
-                        'neighborhood': r.get('neighborhood'),
-                    }
-                    # Include available time slots
-                    times = r.get('available_times', [])
-                    if times:
-                        venue['available_times'] = [
-                            {'time': t['time'], 'type': t['type'], 'config_id': t['config_id']}
-                            for t in times
-                        ]
-                    formatted.append(venue)
+                formatted = _format_venue_results(results)
 
                 return {
                     'success': True,
@@ -672,54 +732,61 @@ IMPORTANT BEHAVIORS:
             'status': status
         })
 
-    def _schedule_sniper(self, tool_input: dict) -> dict:
-        """Schedule a sniper job, remotely via SSH if configured, otherwise locally."""
-        import shlex
-        import subprocess
-
+    def _sniper_job(self, tool_input: dict) -> dict:
+        """Normalize schedule_sniper tool input into sniper job parameters."""
         restaurant = tool_input["restaurant"]
         # If it looks like a human name (has spaces or uppercase), convert to slug
         if ' ' in restaurant or restaurant != restaurant.lower():
             venue_slug = normalize_slug(restaurant)
         else:
             venue_slug = restaurant
-        date = tool_input["date"]
-        preferred_time = tool_input["preferred_time"]
-        party_size = tool_input.get("party_size", Settings.DEFAULT_PARTY_SIZE)
-        drop_time = tool_input["drop_time"]
+        return {
+            'venue_slug': venue_slug,
+            'date': tool_input["date"],
+            'preferred_time': tool_input["preferred_time"],
+            'party_size': tool_input.get("party_size", Settings.DEFAULT_PARTY_SIZE),
+            'drop_time': tool_input["drop_time"],
+        }
+
+    def _record_remote_sniper(self, job: dict, remote_host: str, output: str) -> dict:
+        """Save a local record of a job scheduled on the remote host."""
+        job_id = self.store.add_sniper_job({
+            'venue_slug': job['venue_slug'],
+            'date': job['date'],
+            'preferred_times': [job['preferred_time']],
+            'party_size': job['party_size'],
+            'scheduled_at': job['drop_time'],
+            'auto_resolve_conflicts': True,
+            'notes': f'remote:{remote_host}',
+        })
+        return {
+            'success': True,
+            'job_id': job_id,
+            'message': f"Remote sniper scheduled on server: {output}",
+            'venue_slug': job['venue_slug'],
+            'remote': True,
+        }
+
+    def _schedule_sniper(self, tool_input: dict) -> dict:
+        """Schedule a sniper job, remotely via SSH if configured, otherwise locally."""
+        job = self._sniper_job(tool_input)
 
         remote_host = Settings.SNIPER_REMOTE_HOST
         if remote_host:
-            remote_dir = Settings.SNIPER_REMOTE_DIR
-            remote_cmd = (
-                f"cd {shlex.quote(remote_dir)} && python3 scripts/run_sniper.py "
-                f"{shlex.quote(venue_slug)} {shlex.quote(date)} {shlex.quote(preferred_time)} "
-                f"--party-size {shlex.quote(str(party_size))} --at {shlex.quote(drop_time)}"
-            )
-            cmd = [
-                "ssh", "-o", "StrictHostKeyChecking=accept-new", remote_host,
-                remote_cmd,
-            ]
+            remote_cmd = f"cd {shlex.quote(Settings.SNIPER_REMOTE_DIR)} && {_remote_sniper_command(job)}"
             try:
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
+                result = subprocess.run(
+                    _ssh_command(remote_host, remote_cmd),
+                    capture_output=True, text=True, timeout=_SSH_TIMEOUT_SECONDS,
+                )
                 output = result.stdout.strip()
                 if result.returncode == 0:
                     # Save a local record so we can track remote jobs
-                    job_id = self.store.add_sniper_job({
-                        'venue_slug': venue_slug,
-                        'date': date,
-                        'preferred_times': [preferred_time],
-                        'party_size': party_size,
-                        'scheduled_at': drop_time,
-                        'auto_resolve_conflicts': True,
-                        'notes': f'remote:{remote_host}',
-                    })
+                    return self._record_remote_sniper(job, remote_host, output)
+                elif result.returncode == _SSH_CONNECTION_ERROR:
                     return {
-                        'success': True,
-                        'job_id': job_id,
-                        'message': f"Remote sniper scheduled on server: {output}",
-                        'venue_slug': venue_slug,
-                        'remote': True,
+                        'success': False,
+                        'error': f"SSH connection failed: {result.stderr.strip()}",
                     }
                 else:
                     return {
@@ -737,25 +804,121 @@ IMPORTANT BEHAVIORS:
                 store=self.store,
             )
             job_id = sniper.create_job(
-                venue_slug=venue_slug,
-                date=date,
-                preferred_times=[preferred_time],
-                party_size=party_size,
-                scheduled_at=drop_time,
+                venue_slug=job['venue_slug'],
+                date=job['date'],
+                preferred_times=[job['preferred_time']],
+                party_size=job['party_size'],
+                scheduled_at=job['drop_time'],
                 auto_resolve_conflicts=True,
             )
             return {
                 'success': True,
                 'job_id': job_id,
-                'venue_slug': venue_slug,
+                'venue_slug': job['venue_slug'],
                 'message': (
-                    f"Sniper job #{job_id} scheduled for {venue_slug} "
-                    f"on {date} at {preferred_time}. "
-                    f"Will start polling at {drop_time}. "
+                    f"Sniper job #{job_id} scheduled for {job['venue_slug']} "
+                    f"on {job['date']} at {job['preferred_time']}. "
+                    f"Will start polling at {job['drop_time']}. "
                     f"Run `python3 scripts/run_sniper.py --cron` to execute when ready."
                 ),
             }
 
+    def _schedule_remote_snipers(self, tool_inputs: list) -> list:
+        """Schedule several remote sniper jobs in one SSH session.
+
+        Each job's output is followed by a marker line carrying its exit
+        status, so one failing job doesn't stop the rest and each gets its
+        own result. If the batch can't be built, nothing has run remotely and
+        each call falls back to its own SSH exec; once the exec has run, jobs
+        are never retried, since that would duplicate live remote snipers.
+
+        Args:
+            tool_inputs: schedule_sniper tool inputs, in order
+
+        Returns:
+            One schedule_sniper result dict per input, in the same order
+        """
+        remote_host = Settings.SNIPER_REMOTE_HOST
+        try:
+            jobs = [self._sniper_job(tool_input) for tool_input in tool_inputs]
+            script = " ".join(
+                f"{_remote_sniper_command(job)} 2>&1; echo {_SNIPER_BATCH_MARKER}$?;" for job in jobs
+            )
+            remote_cmd = f"cd {shlex.quote(Settings.SNIPER_REMOTE_DIR)} && {{ {script} }}"
+        except Exception as e:
+            logger.error("Batched sniper scheduling failed: %s", e)
+            return [self._schedule_sniper(tool_input) for tool_input in tool_inputs]
+        try:
+            result = subprocess.run(
+                _ssh_command(remote_host, remote_cmd),
+                capture_output=True, text=True, timeout=_SSH_TIMEOUT_SECONDS + len(jobs),
+            )
+        except subprocess.TimeoutExpired as e:
+            # Jobs that printed their marker before the timeout are live on
+            # the remote host; record them so they aren't retried
+            partial = e.stdout or ''
+            if isinstance(partial, bytes):
+                partial = partial.decode(errors='replace')
+            outputs = _split_batch_output(partial)
+            error = 'SSH connection timed out'
+        except Exception as e:
+            return [{'success': False, 'error': f'SSH failed: {e}'} for _ in jobs]
+        else:
+            outputs = _split_batch_output(result.stdout)
+            if result.returncode == _SSH_CONNECTION_ERROR and not outputs:
+                error = f"SSH connection failed: {result.stderr.strip()}"
+            else:
+                error = f"SSH command failed: {result.stderr.strip()}"
+
+        results = []
+        for i, job in enumerate(jobs):
+            if i >= len(outputs):
+                # The session ended before this job ran
+                results.append({'success': False, 'error': error})
+                continue
+            output, status = outputs[i]
+            if status == 0:
+                try:
+                    results.append(self._record_remote_sniper(job, remote_host, output))
+                except Exception as e:
+                    logger.error("Failed to record remote sniper for %s: %s", job['venue_slug'], e)
+                    results.append({
+                        'success': False,
+                        'error': f"Remote sniper scheduled on server but not recorded locally: {e}",
+                    })
+            else:
+                results.append({'success': False, 'error': f"SSH command failed: {output}"})
+        return results
+
+    def _batch_remote_snipers(self, content, emit=None) -> dict:
+        """Run a response's schedule_sniper calls together over SSH, ahead of the tool loop.
+
+        A tool_call event is emitted for each call before its batch runs,
+        since the tool loop only reports the prefetched result afterwards.
+
+        Returns results keyed by tool_use id; empty unless a remote host is
+        configured and there are at least two calls to batch.
+        """
+        if not Settings.SNIPER_REMOTE_HOST:
+            return {}
+        blocks = [
+            block for block in content
+            if block.type == "tool_use" and block.name == "schedule_sniper"
+        ]
+        if len(blocks) < 2:
+            return {}
+
+        results = {}
+        for start in range(0, len(blocks), _SNIPER_BATCH_MAX):
+            batch = blocks[start:start + _SNIPER_BATCH_MAX]
+            if emit:
+                for block in batch:
+                    emit("tool_call", {"tool": block.name, "input": block.input})
+            batch_results = self._schedule_remote_snipers([block.input for block in batch])
+            for block, result in zip(batch, batch_results):
+                results[block.id] = result
+        return results
+
     def _format_confirmation_email(self, result, booking_info):
         """Format a confirmation email in markdown."""
         return f"""# Reservation Confirmed! 🎉
@@ -849,7 +1012,7 @@ Your reservation has been successfully booked.
 
             # Call Claude with tool definitions and system prompt
             response = self.call_claude(
-                messages=self.conversation_history,
+                messages=list(self.conversation_history),
                 tools=self.define_tools(),
                 system=self.system_prompt
             )
@@ -860,7 +1023,8 @@ Your reservation has been successfully booked.
                 # Add Claude's response to history
                 self.add_to_history("assistant", response.content)
 
-                # Execute all tool calls
+                # Execute all tool calls; several remote snipers share one SSH session
+                prefetched = self._batch_remote_snipers(response.content, emit=emit)
                 tool_results = []
                 for content_block in response.content:
                     if content_block.type == "tool_use":
@@ -869,10 +1033,13 @@ Your reservation has been successfully booked.
                         tool_use_id = content_block.id
 
                         logger.info("Using tool: %s", tool_name)
-                        emit("tool_call", {"tool": tool_name, "input": tool_input})
 
-                        # Execute the tool
-                        result = self.execute_tool(tool_name, tool_input, emit=emit)
+                        # Execute the tool (batched calls already announced and ran)
+                        if tool_use_id in prefetched:
+                            result = prefetched[tool_use_id]
+                        else:
+                            emit("tool_call", {"tool": tool_name, "input": tool_input})
+                            result = self.execute_tool(tool_name, tool_input, emit=emit)
 
                         emit("tool_result", {"tool": tool_name, "result": result})
 
@@ -15,6 +15,9 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
 )
 
+# The chat endpoint drives the Claude-powered ReservationAgent
+Settings.require("ANTHROPIC_API_KEY")
+
 app = FastAPI(title="Reservation Agent API", version="1.0.0")
 
 # CORS — allow the frontend origin(s)
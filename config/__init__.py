@@ -3,6 +3,6 @@ Configuration Package
 Centralized configuration management.
 """
 
-from .settings import Settings
+from .settings import Settings, Capabilities, CAPABILITIES
 
-__all__ = ['Settings']
+__all__ = ['Settings', 'Capabilities', 'CAPABILITIES']
@@ -4,6 +4,7 @@ Loads and validates environment variables.
 """
 
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -69,18 +70,35 @@ class Settings:
     # Model Configuration
     DEFAULT_MODEL = "claude-haiku-4-5-20251001"
     MAX_TOKENS = 1024
+    HISTORY_MAX = int(os.environ.get("HISTORY_MAX", "64"))  # messages kept per agent
 
     # Paths
     NEWS_FOLDER = "news"
+    NEWS_CACHE_PATH = os.environ.get("NEWS_CACHE_PATH", "data/news_cache.db")
     LOGS_FOLDER = "logs"
 
     @classmethod
     def validate(cls):
-        """Validate required settings."""
+        """Validate settings required by the Claude-powered agents."""
         if not cls.ANTHROPIC_API_KEY:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
         return True
 
+    @classmethod
+    def require(cls, *keys):
+        """Validate that each named setting is present.
+
+        Entry points declare only the keys they use, e.g.
+        ``Settings.require("ANTHROPIC_API_KEY", "BRAVE_API_KEY")``.
+
+        Raises:
+            ValueError: If any of the settings are unset or empty
+        """
+        missing = [key for key in keys if not getattr(cls, key, None)]
+        if missing:
+            raise ValueError(f"{', '.join(missing)} not found in environment variables")
+        return True
+
     @classmethod
     def has_anthropic_configured(cls):
         """Check if Anthropic API is configured."""
@@ -123,5 +141,33 @@ class Settings:
         return bool(cls.RESY_EMAIL and cls.RESY_PASSWORD)
 
 
-# Validate on import
-Settings.validate()
+@dataclass(frozen=True)
+class Capabilities:
+    """Snapshot of which optional integrations are configured.
+
+    Built once at import so long-running loops can read a plain attribute
+    instead of re-evaluating the ``Settings.has_*_configured()`` checks.
+    """
+    anthropic: bool
+    email: bool
+    search: bool
+    resy: bool
+    resy_browser: bool
+    opentable: bool
+    proxy: bool
+
+    @classmethod
+    def from_settings(cls, settings=Settings) -> 'Capabilities':
+        """Evaluate every ``has_*_configured()`` check on ``settings`` once."""
+        return cls(
+            anthropic=settings.has_anthropic_configured(),
+            email=settings.has_email_configured(),
+            search=settings.has_search_configured(),
+            resy=settings.has_resy_configured(),
+            resy_browser=settings.has_resy_browser_configured(),
+            opentable=settings.has_opentable_configured(),
+            proxy=settings.has_proxy_configured(),
+        )
+
+
+CAPABILITIES = Capabilities.from_settings()
@@ -0,0 +1,4 @@
+"""
+Scripts Package
+Executable entry points for agents and the reservation sniper.
+"""
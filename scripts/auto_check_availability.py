@@ -4,16 +4,26 @@ Automated Availability Checker
 Checks restaurant availability and sends email notifications.
 """
 
+import argparse
+import logging
 import sys
 import os
 from datetime import datetime, timedelta
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import requests
+
+# Add project root to path when run as a file (the installed package doesn't need it)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.resy_client_factory import ResyClientFactory
 from utils.email_sender import EmailSender
-from config.settings import Settings
+from config.settings import Settings, CAPABILITIES
+
+logger = logging.getLogger(__name__)
+
+# Network blips and Resy 429/5xx responses — retried on the next run
+TRANSIENT_ERRORS = (requests.exceptions.RequestException, ConnectionError, TimeoutError)
 
 
 def check_availability(restaurant_slug, date, party_size=2, location='ny'):
@@ -52,7 +62,7 @@ def check_availability(restaurant_slug, date, party_size=2, location='ny'):
             print(f"✓ Found {len(slots)} available slots!")
 
             # Send email notification
-            if Settings.has_email_configured():
+            if CAPABILITIES.email:
                 email_sender = EmailSender()
 
                 # Format slots list
@@ -90,16 +100,26 @@ def check_availability(restaurant_slug, date, party_size=2, location='ny'):
 
         return slots
 
+    except TRANSIENT_ERRORS as e:
+        logger.warning("Transient error checking %s: %s", restaurant_slug, e)
+        return []
     except Exception as e:
         print(f"✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.debug("Availability check traceback", exc_info=True)
         return []
 
 
 def main():
     """Check availability for configured restaurants."""
-
+    parser = argparse.ArgumentParser(description="Check availability and email when found")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Verbose logging (includes tracebacks)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
     # Define restaurants to check
     # Format: (slug, date, party_size, location)
     restaurants_to_check = [
@@ -17,8 +17,9 @@ import json
 import sys
 import os
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path when run as a file (the installed package doesn't need it)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Redirect stdout to stderr so browser client print() statements
 # don't pollute the JSON output. We write JSON to the original stdout at the end.
@@ -7,19 +7,73 @@ Continuously monitors for availability and auto-books when found.
 Use with caution and only for restaurants you genuinely want to book.
 """
 
+import argparse
+import logging
 import sys
 import os
+import string
 import time
 from datetime import datetime, timedelta
-import json
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path when run as a file (the installed package doesn't need it)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.resy_client_factory import ResyClientFactory
 from utils.reservation_store import ReservationStore
 from utils.email_sender import EmailSender
-from config.settings import Settings
+from config.settings import Settings, CAPABILITIES
+
+logger = logging.getLogger(__name__)
+
+# orjson is optional — fall back to stdlib json when it isn't installed
+try:
+    import orjson
+
+    def _loads(text):
+        return orjson.loads(text)
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    import json
+
+    def _loads(text):
+        return json.loads(text)
+
+    def _dumps(obj):
+        return json.dumps(obj, indent=2)
+
+# Email bodies, parsed once and filled in per send
+BOOKED_TEMPLATE = string.Template("""# 🎉 Reservation Auto-Booked!
+
+**Restaurant:** $restaurant
+**Date:** $date
+**Time:** $time
+**Party Size:** $party_size
+**Confirmation:** $confirmation
+
+---
+*Booked by Reservation Sniper at $when*
+""")
+
+AVAILABILITY_SECTION_TEMPLATE = string.Template("""## $restaurant
+
+**Date:** $date
+**Available Slots:** $slot_count
+
+Times: $times
+""")
+
+AVAILABILITY_TEMPLATE = string.Template("""# 🔔 Availability Alert
+
+$sections
+---
+*Found by Reservation Sniper at $when*
+*auto_book is disabled for these targets*
+""")
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %I:%M %p'
 
 
 class ReservationSniper:
@@ -35,7 +89,7 @@ class ReservationSniper:
         self.config_file = config_file
         self.client = None
         self.store = ReservationStore()
-        self.email_sender = EmailSender() if Settings.has_email_configured() else None
+        self.email_sender = EmailSender() if CAPABILITIES.email else None
         self.already_booked = set()  # Track what we've already booked
 
     def load_config(self):
@@ -86,13 +140,13 @@ class ReservationSniper:
             }
 
             with open(config_path, 'w') as f:
-                json.dump(default_config, f, indent=2)
+                f.write(_dumps(default_config))
 
             print(f"Created default config at: {config_path}")
             print("Edit this file to configure your target reservations")
 
         with open(config_path, 'r') as f:
-            return json.load(f)
+            return _loads(f.read())
 
     def check_target(self, target):
         """
@@ -110,20 +164,20 @@ class ReservationSniper:
         party_size = target['party_size']
         preferred_times = target.get('preferred_times', [])
 
-        print(f"\n  Checking: {restaurant} on {date} for {party_size}")
+        logger.debug("Checking: %s on %s for %d", restaurant, date, party_size)
 
         try:
             # Get venue
             venue = self.client.get_venue_by_slug(restaurant, location)
             if not venue:
-                print(f"    ✗ Could not find restaurant")
+                print(f"\n  ✗ {restaurant}: could not find restaurant")
                 return []
 
             # Check availability
             slots = self.client.get_availability(venue['id'], date, party_size)
 
             if not slots:
-                print(f"    ✗ No availability")
+                print(f"\n  ✗ {restaurant}: no availability")
                 return []
 
             # Filter by preferred times if specified
@@ -138,19 +192,19 @@ class ReservationSniper:
                             break
 
                 if matching_slots:
-                    print(f"    ✓ Found {len(matching_slots)} matching slot(s)!")
+                    print(f"\n  ✓ {restaurant}: found {len(matching_slots)} matching slot(s)!")
                     for slot in matching_slots:
-                        print(f"      • {slot['time']}")
+                        logger.debug("  • %s", slot['time'])
                 else:
-                    print(f"    ⚠️  Found {len(slots)} slots but none match preferred times")
+                    print(f"\n  ⚠️  {restaurant}: found {len(slots)} slots but none match preferred times")
 
                 return matching_slots
             else:
-                print(f"    ✓ Found {len(slots)} slot(s)")
+                print(f"\n  ✓ {restaurant}: found {len(slots)} slot(s)")
                 return slots
 
         except Exception as e:
-            print(f"    ✗ Error: {e}")
+            print(f"\n  ✗ {restaurant}: error: {e}")
             return []
 
     def book_slot(self, target, slot):
@@ -199,17 +253,14 @@ class ReservationSniper:
                     self.email_sender.send(
                         to_email=Settings.EMAIL_TO,
                         subject=f"🎉 AUTO-BOOKED: {restaurant} on {date}",
-                        content=f"""# 🎉 Reservation Auto-Booked!
-
-**Restaurant:** {restaurant}
-**Date:** {date}
-**Time:** {slot['time']}
-**Party Size:** {party_size}
-**Confirmation:** {result.get('reservation_id')}
-
----
-*Booked by Reservation Sniper at {datetime.now().strftime('%Y-%m-%d %I:%M %p')}*
-""",
+                        content=BOOKED_TEMPLATE.substitute(
+                            restaurant=restaurant,
+                            date=date,
+                            time=slot['time'],
+                            party_size=party_size,
+                            confirmation=result.get('reservation_id'),
+                            when=datetime.now().strftime(TIMESTAMP_FORMAT),
+                        ),
                         content_type="markdown"
                     )
 
@@ -222,6 +273,42 @@ class ReservationSniper:
             print(f"       ✗ Booking error: {e}")
             return False
 
+    def send_availability_summary(self, hits):
+        """
+        Send a single availability email covering every hit from one cycle.
+
+        Args:
+            hits: List of (target, slots) tuples found during the cycle
+        """
+        if not self.email_sender:
+            return
+
+        if len(hits) == 1:
+            subject = f"🔔 Availability Found: {hits[0][0]['restaurant']}"
+        else:
+            subject = f"🔔 Availability Found: {len(hits)} restaurants"
+
+        sections = "\n".join(
+            AVAILABILITY_SECTION_TEMPLATE.substitute(
+                restaurant=target['restaurant'],
+                date=target['date'],
+                slot_count=len(slots),
+                times=', '.join([s['time'] for s in slots[:5]]),
+            )
+            for target, slots in hits
+        )
+        content = AVAILABILITY_TEMPLATE.substitute(
+            sections=sections,
+            when=datetime.now().strftime(TIMESTAMP_FORMAT),
+        )
+
+        self.email_sender.send(
+            to_email=Settings.EMAIL_TO,
+            subject=subject,
+            content=content,
+            content_type="markdown"
+        )
+
     def run(self):
         """Run the sniper in continuous monitoring mode."""
         print("\n" + "="*60)
@@ -248,14 +335,21 @@ class ReservationSniper:
 
         check_count = 0
         found_count = 0
+        # Fixed-rate schedule: checks start every check_interval seconds,
+        # regardless of how long each cycle takes
+        next_tick = time.monotonic()
 
         try:
             while check_count < max_checks:
                 check_count += 1
+                next_tick += check_interval
                 print(f"\n{'='*60}")
-                print(f"CHECK #{check_count} - {datetime.now().strftime('%Y-%m-%d %I:%M %p')}")
+                print(f"CHECK #{check_count} - {datetime.now().strftime(TIMESTAMP_FORMAT)}")
                 print(f"{'='*60}")
 
+                pending_notifications = []  # (target, slots) hits for this cycle
+                booking_complete = False
+
                 for target in targets:
                     restaurant = target['restaurant']
                     date = target['date']
@@ -282,35 +376,31 @@ class ReservationSniper:
                                 self.already_booked.add(booking_key)
 
                                 if stop_when_found:
-                                    print(f"\n✓ Booking complete. Stopping as configured.")
-                                    return
+                                    booking_complete = True
+                                    break
                         else:
                             # Just notify, don't book
                             print(f"    💡 auto_book=false, skipping booking")
+                            pending_notifications.append((target, slots))
 
-                            if self.email_sender:
-                                self.email_sender.send(
-                                    to_email=Settings.EMAIL_TO,
-                                    subject=f"🔔 Availability Found: {restaurant}",
-                                    content=f"""# 🔔 Availability Alert
-
-**Restaurant:** {restaurant}
-**Date:** {date}
-**Available Slots:** {len(slots)}
+                # One email per cycle, no matter how many targets had hits
+                if pending_notifications:
+                    self.send_availability_summary(pending_notifications)
 
-Times: {', '.join([s['time'] for s in slots[:5]])}
+                if booking_complete:
+                    print(f"\n✓ Booking complete. Stopping as configured.")
+                    return
 
----
-*Found by Reservation Sniper at {datetime.now().strftime('%Y-%m-%d %I:%M %p')}*
-*auto_book is disabled for this target*
-""",
-                                    content_type="markdown"
-                                )
-
-                # Wait before next check
+                # Wait out the rest of this interval before the next check
                 if check_count < max_checks:
-                    print(f"\n⏳ Waiting {check_interval} seconds until next check...")
-                    time.sleep(check_interval)
+                    delay = next_tick - time.monotonic()
+                    if delay > 0:
+                        print(f"\n⏳ Waiting {delay:.0f} seconds until next check...")
+                        time.sleep(delay)
+                    else:
+                        # Cycle overran the interval — start the next check now
+                        # and re-anchor rather than bursting to catch up
+                        next_tick = time.monotonic()
 
             print(f"\n✓ Completed {check_count} checks. Found availability {found_count} times.")
 
@@ -324,6 +414,16 @@ Times: {', '.join([s['time'] for s in slots[:5]])}
 
 def main():
     """Run the reservation sniper."""
+    parser = argparse.ArgumentParser(description="Config-driven reservation sniper")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Verbose logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
     sniper = ReservationSniper()
     sniper.run()
 
@@ -8,10 +8,12 @@ import sys
 import os
 import logging
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path when run as a file (the installed package doesn't need it)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agents.news_digest_agent import NewsDigestAgent
+from config.settings import Settings
 
 
 def main():
@@ -23,7 +25,9 @@ Daily News Digest Agent
 Powered by Claude + Brave Search
 """)
 
+    agent = None
     try:
+        Settings.require("ANTHROPIC_API_KEY", "BRAVE_API_KEY")
         agent = NewsDigestAgent()
 
         # Check if topics provided as command-line arguments
@@ -52,6 +56,9 @@ Powered by Claude + Brave Search
 
     except Exception as e:
         logging.getLogger(__name__).error("Error: %s", e)
+    finally:
+        if agent:
+            agent.close()
 
 
 if __name__ == "__main__":
@@ -8,10 +8,12 @@ import sys
 import os
 import logging
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path when run as a file (the installed package doesn't need it)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agents.research_agent import ResearchAgent
+from config.settings import Settings
 
 
 def main():
@@ -29,6 +31,7 @@ This agent can:
 """)
 
     try:
+        Settings.require("ANTHROPIC_API_KEY")
         agent = ResearchAgent()
 
         # Choose mode
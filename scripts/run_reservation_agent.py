@@ -6,11 +6,17 @@ Entry point for the restaurant reservation agent.
 
 import sys
 import os
+import traceback
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import anthropic
+import requests
+
+# Add project root to path when run as a file (the installed package doesn't need it)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agents.reservation_agent import ReservationAgent
+from config.settings import Settings
 
 
 def main():
@@ -32,6 +38,7 @@ This agent can:
 """)
 
     try:
+        Settings.require("ANTHROPIC_API_KEY")
         agent = ReservationAgent()
 
         # Check if running with arguments (single query mode)
@@ -49,9 +56,13 @@ This agent can:
         print("  - RESY_AUTH_TOKEN")
         print("  - RESY_PAYMENT_METHOD_ID (needed for booking)")
         print("\nSee .env file for instructions on how to obtain these.")
+    except (anthropic.APIConnectionError, anthropic.RateLimitError,
+            requests.exceptions.RequestException, ConnectionError, TimeoutError) as e:
+        # Network/rate-limit failures: a one-line message is enough, retry later
+        print(f"\n❌ Network error: {e}")
+        print("This is usually transient — please try again in a moment.")
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
         traceback.print_exc()
 
 
@@ -9,9 +9,12 @@ Usage:
   # Schedule for later (saves job, exits):
   python3 scripts/run_sniper.py fish-cheeks 2026-03-01 "7:00 PM" --at "2026-02-22 09:00"
 
-  # Cron mode (process all due jobs):
+  # Cron mode (process all due jobs once):
   python3 scripts/run_sniper.py --cron
 
+  # Daemon mode (stay resident, process due jobs every SNIPER_WORKER_POLL_SECONDS):
+  python3 scripts/run_sniper.py --daemon
+
   # List all jobs:
   python3 scripts/run_sniper.py --list
 
@@ -20,6 +23,9 @@ Usage:
 
 Cron setup (runs every minute, picks up due jobs):
   * * * * * cd /path/to/ai-agents && python3 scripts/run_sniper.py --cron >> logs/sniper.log 2>&1
+
+Daemon mode avoids paying interpreter startup, imports and DB opens on every
+tick. Prefer it (or the systemd unit in deploy/sniper.service) over cron.
 """
 
 import argparse
@@ -27,12 +33,12 @@ import logging
 import os
 import sys
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path when run as a file (the installed package doesn't need it)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pathlib import Path
 from config.settings import Settings
-from utils.reservation_sniper import ReservationSniper
 from utils.reservation_store import ReservationStore
 
 
@@ -64,6 +70,8 @@ def _clear_session_for_proxy():
 
 def cmd_create_and_run(args):
     """Create a sniper job and optionally run it immediately."""
+    from utils.reservation_sniper import ReservationSniper
+
     _clear_session_for_proxy()
     with ReservationSniper() as sniper:
         preferred_times = args.times if args.times else []
@@ -95,6 +103,8 @@ def cmd_create_and_run(args):
 
 def cmd_cron(args):
     """Process all due scheduled jobs."""
+    from utils.reservation_sniper import ReservationSniper
+
     _clear_session_for_proxy()
     with ReservationSniper() as sniper:
         result = sniper.run_scheduled_jobs()
@@ -107,24 +117,43 @@ def cmd_cron(args):
                 print(f"  Job #{job_id}: {outcome['outcome']}")
 
 
+def cmd_daemon(args):
+    """Stay resident and process due jobs on an interval (same loop as sniper_worker)."""
+    from scripts import sniper_worker
+    sniper_worker.main()
+
+
+# Columns shown by --list, in table order
+LIST_COLUMNS = [
+    'id', 'status', 'venue_slug', 'date', 'preferred_times',
+    'scheduled_at', 'poll_count', 'max_attempts',
+]
+
+
 def cmd_list(args):
     """List all sniper jobs."""
-    with ReservationStore() as store:
-        jobs = store.get_all_sniper_jobs()
+    with ReservationStore(readonly=True) as store:
+        columns = store.get_sniper_job_columns(LIST_COLUMNS)
 
-    if not jobs:
+    if not columns['id']:
         print("No sniper jobs found.")
         return
 
-    print(f"{'ID':>4}  {'Status':<10}  {'Venue':<20}  {'Date':<12}  {'Times':<20}  {'Scheduled At':<20}  {'Polls'}")
-    print("-" * 100)
-    for job in jobs:
-        times = ", ".join(job['preferred_times']) if job['preferred_times'] else "(any)"
-        print(
-            f"{job['id']:>4}  {job['status']:<10}  {job['venue_slug']:<20}  "
-            f"{job['date']:<12}  {times:<20}  {job['scheduled_at']:<20}  "
-            f"{job['poll_count']}/{job['max_attempts']}"
+    # Build the table in memory and write it once
+    out = [
+        f"{'ID':>4}  {'Status':<10}  {'Venue':<20}  {'Date':<12}  {'Times':<20}  {'Scheduled At':<20}  {'Polls'}\n",
+        "-" * 100 + "\n",
+    ]
+    for job_id, status, venue_slug, date, preferred_times, scheduled_at, poll_count, max_attempts in zip(
+        *(columns[c] for c in LIST_COLUMNS)
+    ):
+        times = ", ".join(preferred_times) if preferred_times else "(any)"
+        out.append(
+            f"{job_id:>4}  {status:<10}  {venue_slug:<20}  "
+            f"{date:<12}  {times:<20}  {scheduled_at:<20}  "
+            f"{poll_count}/{max_attempts}\n"
         )
+    sys.stdout.write("".join(out))
 
 
 def cmd_cancel(args):
@@ -144,6 +173,15 @@ def cmd_cancel(args):
         print(f"Job #{args.cancel} cancelled.")
 
 
+# Mode flag -> handler, checked in priority order
+MODE_COMMANDS = {
+    'cron': cmd_cron,
+    'daemon': cmd_daemon,
+    'list': cmd_list,
+    'cancel': cmd_cancel,
+}
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Reservation Sniper — auto-book tables at drop time",
@@ -153,6 +191,7 @@ def main():
 
     # Mode flags (mutually exclusive with positional args)
     parser.add_argument("--cron", action="store_true", help="Process all due scheduled jobs")
+    parser.add_argument("--daemon", action="store_true", help="Stay resident and process due jobs continuously")
     parser.add_argument("--list", action="store_true", help="List all sniper jobs")
     parser.add_argument("--cancel", type=int, metavar="JOB_ID", help="Cancel a sniper job")
 
@@ -171,18 +210,16 @@ def main():
     args = parser.parse_args()
     setup_logging(args.verbose)
 
-    if args.cron:
-        cmd_cron(args)
-    elif args.list:
-        cmd_list(args)
-    elif args.cancel:
-        cmd_cancel(args)
-    elif args.venue_slug and args.date:
-        cmd_create_and_run(args)
-    else:
+    handler = next((cmd for flag, cmd in MODE_COMMANDS.items() if getattr(args, flag)), None)
+    if handler is None and args.venue_slug and args.date:
+        handler = cmd_create_and_run
+
+    if handler is None:
         parser.print_help()
         sys.exit(1)
 
+    handler(args)
+
 
 if __name__ == "__main__":
     main()
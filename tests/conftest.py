@@ -7,3 +7,41 @@ from pathlib import Path
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+# Durability is irrelevant for throwaway test databases. journal_mode and
+# locking_mode are left alone: stores keep WAL so their read-only pool
+# connections can still open the file.
+TEST_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+@pytest.fixture(scope="session")
+def fast_pragmas():
+    """Return a function that switches a ReservationStore to no-fsync test PRAGMAs."""
+    def apply(store):
+        for pragma in TEST_PRAGMAS:
+            store.conn.execute(pragma)
+        return store
+    return apply
+
+
+# Tables a ReservationStore owns, emptied between tests that share one store
+STORE_TABLES = ("sniper_jobs", "reservations", "sqlite_sequence")
+
+
+@pytest.fixture(scope="session")
+def reset_store():
+    """Return a function that empties a shared ReservationStore in one transaction.
+
+    Reusing one connection keeps its prepared-statement cache warm across
+    tests; the deletes run as a single transaction so the reset is one commit.
+    """
+    def reset(store):
+        conn = store.conn
+        conn.rollback()
+        with conn:
+            for table in STORE_TABLES:
+                conn.execute(f"DELETE FROM {table}")
+    return reset
@@ -1,6 +1,9 @@
 """Unit tests for availability_filter module."""
 
 import pytest
+from unittest.mock import patch
+
+import utils.availability_filter as availability_filter
 from utils.availability_filter import parse_time, filter_slots_by_time, pick_best_slot
 
 
@@ -34,6 +37,14 @@ class TestParseTime:
         assert parse_time("") is None
         assert parse_time("25:00 PM") is None
 
+    def test_parse_is_memoized(self):
+        """Repeated parses of the same string hit the cache."""
+        parse_time.cache_clear()
+        first = parse_time("8:15 PM")
+        second = parse_time("8:15 PM")
+        assert first is second
+        assert parse_time.cache_info().hits == 1
+
 
 class TestFilterSlotsByTime:
     """Test slot filtering and sorting."""
@@ -111,6 +122,20 @@ class TestPickBestSlot:
         result = pick_best_slot(sample_slots, ["7:00 PM", "8:00 PM"])
         assert result['time'] == '7:00 PM'  # First preferred, exact match
 
+    def test_tie_keeps_earliest_slot(self, sample_slots):
+        result = pick_best_slot(sample_slots, ["7:15 PM"])
+        assert result['config_id'] == 'b'
+
+    def test_single_pass_without_filter(self, sample_slots):
+        with patch('utils.availability_filter.filter_slots_by_time') as mock_filter:
+            result = pick_best_slot(sample_slots, ["7:30 PM"])
+        mock_filter.assert_not_called()
+        assert result['config_id'] == 'c'
+
+    def test_unparseable_slots_fall_back_to_first(self):
+        slots = [{'time': 'soon'}, {'time': 'later'}]
+        assert pick_best_slot(slots, ["7:00 PM"]) == slots[0]
+
 
 class TestEdgeCases:
     """Test edge cases in filtering."""
@@ -133,3 +158,54 @@ class TestEdgeCases:
         ]
         result = filter_slots_by_time(slots, ["bad", "also_bad"], window_minutes=60)
         assert len(result) == 2
+
+
+class TestVectorizedFilter:
+    """Test the optional NumPy scoring path for large slot lists."""
+
+    @staticmethod
+    def _many_slots():
+        """Every 15 minutes from 5 PM to 10:45 PM, twice (to exercise ties)."""
+        times = [f"{h}:{m:02d} PM" for h in range(5, 11) for m in (0, 15, 30, 45)]
+        return [{'time': t, 'config_id': f'{i}'} for i, t in enumerate(times * 2)]
+
+    def test_vectorized_matches_scalar(self):
+        """NumPy and scalar paths return identical, identically-ordered results."""
+        pytest.importorskip("numpy")
+        slots = self._many_slots()
+        prefs = ["6:00 PM", "7:30 PM", "9:00 PM", "10:00 PM", "bad"] * 20
+
+        with patch.object(availability_filter, '_VECTORIZE_MIN_PAIRS', 0):
+            vectorized = filter_slots_by_time(slots, prefs, window_minutes=20)
+        with patch.object(availability_filter, 'np', None):
+            scalar = filter_slots_by_time(slots, prefs, window_minutes=20)
+
+        assert vectorized == scalar
+
+    def test_large_list_without_numpy(self):
+        """Large inputs fall back to the scalar loop when numpy is missing."""
+        slots = self._many_slots()
+        prefs = ["7:00 PM"] * 10
+
+        with patch.object(availability_filter, 'np', None):
+            result = filter_slots_by_time(slots, prefs, window_minutes=0)
+
+        assert [s['time'] for s in result] == ['7:00 PM', '7:00 PM']
+        assert int(result[0]['config_id']) < int(result[1]['config_id'])
+
+    @pytest.mark.parametrize('prefs', [
+        pytest.param(["7:30 PM", "bad"] * 20, id='exact_match'),
+        pytest.param(["7:40 PM", "11:55 PM"] * 20, id='closest_tie'),
+        pytest.param(["bad"] * 2 + ["4:00 AM"] * 20, id='outside_window'),
+    ])
+    def test_pick_vectorized_matches_scalar(self, prefs):
+        """NumPy and scalar pick_best_slot choose the same slot, ties included."""
+        pytest.importorskip("numpy")
+        slots = self._many_slots()
+
+        with patch.object(availability_filter, '_VECTORIZE_MIN_PAIRS', 0):
+            vectorized = pick_best_slot(slots, prefs)
+        with patch.object(availability_filter, 'np', None):
+            scalar = pick_best_slot(slots, prefs)
+
+        assert vectorized is scalar
@@ -1,6 +1,7 @@
 """Unit tests for BaseAgent."""
 
 import pytest
+from collections import deque
 from unittest.mock import MagicMock, patch
 
 from agents.base_agent import BaseAgent
@@ -20,7 +21,7 @@ class TestBaseAgent:
 
         assert agent.api_key == 'test-key'
         assert agent.model == 'claude-sonnet-4-20250514'
-        assert agent.conversation_history == []
+        assert list(agent.conversation_history) == []
         mock_anthropic.assert_called_once_with(api_key='test-key')
 
     @patch('agents.base_agent.Settings')
@@ -70,7 +71,67 @@ class TestBaseAgent:
         assert len(agent.conversation_history) == 1
 
         agent.clear_history()
-        assert agent.conversation_history == []
+        assert list(agent.conversation_history) == []
+
+    @patch('agents.base_agent.Settings')
+    @patch('agents.base_agent.anthropic.Anthropic')
+    def test_history_is_bounded(self, mock_anthropic, mock_settings):
+        """Test that old messages are evicted once the history is full."""
+        mock_settings.ANTHROPIC_API_KEY = 'test-key'
+        mock_settings.DEFAULT_MODEL = 'test-model'
+
+        agent = BaseAgent()
+        agent.conversation_history = deque(maxlen=4)
+        for i in range(3):
+            agent.add_to_history("user", f"question {i}")
+            agent.add_to_history("assistant", f"answer {i}")
+
+        assert list(agent.conversation_history) == [
+            {"role": "user", "content": "question 1"},
+            {"role": "assistant", "content": "answer 1"},
+            {"role": "user", "content": "question 2"},
+            {"role": "assistant", "content": "answer 2"},
+        ]
+
+    @patch('agents.base_agent.Settings')
+    @patch('agents.base_agent.anthropic.Anthropic')
+    def test_eviction_skips_orphaned_tool_results(self, mock_anthropic, mock_settings):
+        """Test that eviction never leaves a tool_result at the start of history."""
+        mock_settings.ANTHROPIC_API_KEY = 'test-key'
+        mock_settings.DEFAULT_MODEL = 'test-model'
+
+        agent = BaseAgent()
+        agent.conversation_history = deque(maxlen=4)
+        tool_result = [{"type": "tool_result", "tool_use_id": "t1", "content": "{}"}]
+        agent.add_to_history("user", "question 0")
+        agent.add_to_history("assistant", [{"type": "tool_use", "id": "t1"}])
+        agent.add_to_history("user", tool_result)
+        agent.add_to_history("assistant", "answer 0")
+        agent.add_to_history("user", "question 1")
+
+        history = list(agent.conversation_history)
+        assert history == [{"role": "user", "content": "question 1"}]
+
+    @patch('agents.base_agent.Settings')
+    @patch('agents.base_agent.anthropic.Anthropic')
+    def test_turn_longer_than_history_keeps_its_prompt(self, mock_anthropic, mock_settings):
+        """Test a tool loop longer than history_max keeps the prompt and valid tool pairs."""
+        mock_settings.ANTHROPIC_API_KEY = 'test-key'
+        mock_settings.DEFAULT_MODEL = 'test-model'
+
+        agent = BaseAgent()
+        agent.history_max = 4
+        agent.clear_history()
+        agent.add_to_history("user", "question 0")
+        for i in range(3):
+            agent.add_to_history("assistant", [{"type": "tool_use", "id": f"t{i}"}])
+            agent.add_to_history("user", [{"type": "tool_result", "tool_use_id": f"t{i}", "content": "{}"}])
+
+        assert list(agent.conversation_history) == [
+            {"role": "user", "content": "question 0"},
+            {"role": "assistant", "content": [{"type": "tool_use", "id": "t2"}]},
+            {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "t2", "content": "{}"}]},
+        ]
 
     @patch('agents.base_agent.Settings')
     @patch('agents.base_agent.anthropic.Anthropic')
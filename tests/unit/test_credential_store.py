@@ -2,7 +2,6 @@
 
 import os
 import sqlite3
-import tempfile
 
 import pytest
 
@@ -10,10 +9,9 @@ from utils.credential_store import CredentialStore
 
 
 @pytest.fixture
-def store(tmp_path):
-    """Create a CredentialStore backed by a temp database."""
-    db_path = str(tmp_path / "test_creds.db")
-    with CredentialStore(db_path=db_path, secret="test-secret") as s:
+def store():
+    """Create a CredentialStore backed by an in-memory database (nothing to clean up)."""
+    with CredentialStore(db_path=":memory:", secret="test-secret") as s:
         yield s
 
 
@@ -0,0 +1,87 @@
+"""Unit tests for NewsCache."""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from utils.news_cache import NewsCache
+
+ARTICLES = [{"title": "AI News", "snippet": "Latest", "url": "http://example.com/ai", "age": "2h"}]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache backed by a temporary database file."""
+    cache = NewsCache(db_path=str(tmp_path / "news_cache.db"))
+    yield cache
+    cache.close()
+
+
+class TestNewsCache:
+    """Test hour-bucketed get/put."""
+
+    def test_miss_returns_none(self, cache):
+        """Test an unknown topic is a cache miss."""
+        assert cache.get("AI", 5, 7200.0) is None
+
+    def test_put_then_get_same_hour(self, cache):
+        """Test results are returned for any time in the same hour."""
+        cache.put("AI", 5, 7200.0, ARTICLES)
+
+        assert cache.get("AI", 5, 7200.0 + 3599) == ARTICLES
+
+    def test_next_hour_misses(self, cache):
+        """Test results expire at the next hour boundary."""
+        cache.put("AI", 5, 7200.0, ARTICLES)
+
+        assert cache.get("AI", 5, 7200.0 + 3600) is None
+
+    def test_put_overwrites_bucket(self, cache):
+        """Test a second put in the same hour replaces the entry."""
+        cache.put("AI", 5, 7200.0, ARTICLES)
+        cache.put("AI", 5, 7300.0, [])
+
+        assert cache.get("AI", 5, 7200.0) == []
+
+    def test_smaller_earlier_fetch_misses(self, cache):
+        """Test an entry fetched for fewer results doesn't satisfy a larger request."""
+        cache.put("AI", 1, 7200.0, ARTICLES)
+
+        assert cache.get("AI", 5, 7200.0) is None
+        assert cache.get("AI", 1, 7200.0) == ARTICLES
+
+    def test_larger_earlier_fetch_is_trimmed(self, cache):
+        """Test a larger cached entry is trimmed to the requested count."""
+        cache.put("AI", 5, 7200.0, ARTICLES * 3)
+
+        assert cache.get("AI", 2, 7200.0) == ARTICLES * 2
+
+    def test_prune_removes_old_buckets(self, cache):
+        """Test prune drops entries from earlier hours only."""
+        cache.put("AI", 5, 0.0, ARTICLES)
+        cache.put("AI", 5, 7200.0, ARTICLES)
+
+        assert cache.prune(7200.0) == 1
+        assert cache.get("AI", 5, 0.0) is None
+        assert cache.get("AI", 5, 7200.0) == ARTICLES
+
+    def test_uses_wal(self, cache):
+        """Test the cache database runs in WAL mode."""
+        assert cache.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_old_schema_is_recreated(self, tmp_path):
+        """Test a cache file from before the requested column is dropped and rebuilt."""
+        path = str(tmp_path / "old.db")
+        with closing(sqlite3.connect(path)) as conn:
+            conn.execute("CREATE TABLE news_cache (topic TEXT, bucket INTEGER, payload BLOB, UNIQUE(topic, bucket))")
+            conn.execute("INSERT INTO news_cache VALUES ('AI', 2, '[]')")
+            conn.commit()
+
+        cache = NewsCache(db_path=path)
+        try:
+            assert cache.get("AI", 5, 7200.0) is None
+            cache.put("AI", 5, 7200.0, ARTICLES)
+            assert cache.get("AI", 5, 7200.0) == ARTICLES
+        finally:
+            cache.close()
@@ -1,8 +1,15 @@
 """Unit tests for NewsDigestAgent."""
 
+import sqlite3
+import threading
+
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 
+from agents.base_agent import BaseAgent
+from agents.news_digest_agent import NewsDigestAgent
+from utils.news_cache import NewsCache
+
 
 class TestNewsDigestAgent:
     """Test NewsDigestAgent functionality."""
@@ -10,7 +17,8 @@ class TestNewsDigestAgent:
     @patch('agents.base_agent.Settings')
     @patch('agents.base_agent.anthropic.Anthropic')
     @patch('agents.news_digest_agent.Settings')
-    def _create_agent(self, mock_nda_settings, mock_anthropic, mock_base_settings):
+    def _create_agent(self, mock_nda_settings, mock_anthropic, mock_base_settings,
+                      cache_factory=lambda: NewsCache(':memory:')):
         """Helper to create a NewsDigestAgent with mocked dependencies."""
         mock_base_settings.ANTHROPIC_API_KEY = 'test-key'
         mock_base_settings.DEFAULT_MODEL = 'claude-sonnet-4-20250514'
@@ -23,12 +31,11 @@ class TestNewsDigestAgent:
         mock_nda_settings.NEWS_FOLDER = 'news'
         mock_nda_settings.has_search_configured.return_value = True
 
-        from agents.news_digest_agent import NewsDigestAgent
-        return NewsDigestAgent()
+        with patch('agents.news_digest_agent.NewsCache', side_effect=cache_factory):
+            return NewsDigestAgent()
 
     def test_init_inherits_from_base_agent(self):
         """Test that NewsDigestAgent inherits from BaseAgent."""
-        from agents.base_agent import BaseAgent
         agent = self._create_agent()
         assert isinstance(agent, BaseAgent)
 
@@ -38,7 +45,6 @@ class TestNewsDigestAgent:
         """Test that missing Brave API key raises ValueError."""
         mock_nda_settings.has_search_configured.return_value = False
 
-        from agents.news_digest_agent import NewsDigestAgent
         with pytest.raises(ValueError, match="BRAVE_API_KEY"):
             NewsDigestAgent()
 
@@ -46,7 +52,7 @@ class TestNewsDigestAgent:
         """Test search_news with successful API call."""
         agent = self._create_agent()
 
-        with patch('requests.get') as mock_get:
+        with patch.object(agent._http, 'get') as mock_get:
             mock_response = MagicMock()
             mock_response.json.return_value = {
                 "web": {
@@ -63,18 +69,136 @@ class TestNewsDigestAgent:
             assert len(articles) == 1
             assert articles[0]["title"] == "AI News"
             assert articles[0]["age"] == "2h"
+            assert mock_get.call_args.kwargs['timeout'] == 15
+
+    def test_search_news_reuses_session(self):
+        """Test that searches share one HTTP session with the Brave token set."""
+        agent = self._create_agent()
+
+        assert agent._http.headers["X-Subscription-Token"] == 'brave-test-key'
+        with patch.object(agent._http, 'get') as mock_get:
+            mock_get.return_value.json.return_value = {"web": {"results": []}}
+
+            agent.search_news("AI")
+            agent.search_news("Science")
+
+            assert mock_get.call_count == 2
 
     def test_search_news_error_returns_empty(self):
         """Test search_news returns empty list on error."""
         agent = self._create_agent()
 
-        with patch('requests.get') as mock_get:
+        with patch.object(agent._http, 'get') as mock_get:
             mock_get.side_effect = Exception("Network error")
 
             articles = agent.search_news("AI")
 
             assert articles == []
 
+    def test_search_news_uses_cache(self):
+        """Test a repeat search in the same hour skips the HTTP request."""
+        agent = self._create_agent()
+
+        with patch.object(agent._http, 'get') as mock_get:
+            mock_get.return_value.json.return_value = {
+                "web": {"results": [{"title": "AI News", "description": "", "url": "http://example.com"}]}
+            }
+
+            first = agent.search_news("AI")
+            second = agent.search_news("AI")
+
+            assert mock_get.call_count == 1
+            assert second == first
+
+    def test_search_news_cache_hit_needs_enough_results(self):
+        """Test a smaller earlier search in the same hour doesn't short-change a larger one."""
+        agent = self._create_agent()
+
+        with patch.object(agent._http, 'get') as mock_get:
+            mock_get.return_value.json.return_value = {
+                "web": {"results": [{"title": f"AI {i}", "description": "", "url": "http://example.com"}
+                                    for i in range(5)]}
+            }
+
+            agent.search_news("AI", num_results=1)
+            articles = agent.search_news("AI", num_results=5)
+
+            assert mock_get.call_count == 2
+            assert len(articles) == 5
+
+    def test_search_news_cache_error_is_a_miss(self):
+        """Test a broken cache database falls back to searching instead of raising."""
+        agent = self._create_agent()
+        agent._cache.close()
+
+        with patch.object(agent._http, 'get') as mock_get:
+            mock_get.return_value.json.return_value = {
+                "web": {"results": [{"title": "AI News", "description": "", "url": "http://example.com"}]}
+            }
+
+            articles = agent.search_news("AI")
+
+        assert [a["title"] for a in articles] == ["AI News"]
+
+    def test_unavailable_cache_still_builds_and_searches(self):
+        """Test an unopenable cache database leaves the agent working without a cache."""
+        def broken_cache():
+            raise sqlite3.OperationalError("unable to open database file")
+
+        agent = self._create_agent(cache_factory=broken_cache)
+
+        with patch.object(agent._http, 'get') as mock_get:
+            mock_get.return_value.json.return_value = {
+                "web": {"results": [{"title": "AI News", "description": "", "url": "http://example.com"}]}
+            }
+
+            articles = agent.search_news("AI")
+
+        assert agent._cache is None
+        assert [a["title"] for a in articles] == ["AI News"]
+        agent.close()
+
+    def test_search_news_does_not_cache_errors(self):
+        """Test failed searches are retried on the next call."""
+        agent = self._create_agent()
+
+        with patch.object(agent._http, 'get', side_effect=Exception("Network error")) as mock_get:
+            agent.search_news("AI")
+            agent.search_news("AI")
+
+            assert mock_get.call_count == 2
+
+    def test_search_news_many_preserves_topic_order(self):
+        """Test concurrent search returns results keyed by topic in input order."""
+        agent = self._create_agent()
+        topics = ["AI", "Science", "SpaceX"]
+
+        with patch.object(agent, 'search_news', side_effect=lambda t, num_results: [{"title": t}]) as mock_search:
+            results = agent.search_news_many(topics, num_results=3)
+
+        assert list(results) == topics
+        assert results["SpaceX"] == [{"title": "SpaceX"}]
+        assert mock_search.call_count == 3
+
+    def test_search_news_many_gives_each_worker_its_own_session(self):
+        """Test concurrent searches never share a requests.Session."""
+        agent = self._create_agent()
+        both_in_flight = threading.Barrier(2, timeout=5)
+        sessions = []
+
+        def fake_get(session, url, **kwargs):
+            sessions.append(session)
+            both_in_flight.wait()
+            response = MagicMock()
+            response.json.return_value = {"web": {"results": []}}
+            return response
+
+        with patch('requests.Session.get', fake_get):
+            agent.search_news_many(["AI", "Science"])
+
+        assert len(set(map(id, sessions))) == 2
+        agent.close()
+
     def test_generate_digest(self):
         """Test digest generation with mocked Claude."""
         agent = self._create_agent()
@@ -116,6 +240,18 @@ class TestNewsDigestAgent:
         assert "<strong>bold</strong>" in result
         assert '<a href="http://example.com">link</a>' in result
 
+    def test_markdown_to_html_nested_inline(self):
+        """Test bold and links are converted inside headers and each other."""
+        agent = self._create_agent()
+
+        result = agent._markdown_to_html("### **AI** update\n- [**Read**](http://example.com)\n# Top")
+
+        assert result == (
+            '<h3><strong>AI</strong> update</h3><br>'
+            '- <a href="http://example.com"><strong>Read</strong></a><br>'
+            '<h1>Top</h1>'
+        )
+
     def test_send_email_not_configured(self):
         """Test send_email skips when not configured."""
         agent = self._create_agent()
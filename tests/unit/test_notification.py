@@ -1,9 +1,26 @@
 """Unit tests for SniperNotifier."""
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import Mock
+from types import MappingProxyType
+from utils.email_sender import EmailSender
 from utils.notification import SniperNotifier, _format_success, _format_failure
 
+# Shared, read-only inputs; MappingProxyType makes accidental mutation raise
+SAMPLE_JOB = MappingProxyType({
+    'venue_slug': 'fish-cheeks',
+    'date': '2026-03-01',
+    'preferred_times': ('7:00 PM', '7:30 PM'),
+    'party_size': 2,
+    'poll_count': 5,
+    'max_attempts': 60,
+})
+
+SAMPLE_RESERVATION = MappingProxyType({
+    'time_slot': '7:00 PM',
+    'reservation_id': 'RES123',
+})
+
 
 class TestSniperNotifier:
     """Test SniperNotifier email notifications."""
@@ -11,7 +28,7 @@ class TestSniperNotifier:
     @pytest.fixture
     def mock_sender(self):
         """Create a mock EmailSender."""
-        sender = MagicMock()
+        sender = Mock(spec=EmailSender)
         sender.send.return_value = True
         return sender
 
@@ -22,24 +39,6 @@ class TestSniperNotifier:
         n._to_email = "test@example.com"
         return n
 
-    @pytest.fixture
-    def sample_job(self):
-        return {
-            'venue_slug': 'fish-cheeks',
-            'date': '2026-03-01',
-            'preferred_times': ['7:00 PM', '7:30 PM'],
-            'party_size': 2,
-            'poll_count': 5,
-            'max_attempts': 60,
-        }
-
-    @pytest.fixture
-    def sample_reservation(self):
-        return {
-            'time_slot': '7:00 PM',
-            'reservation_id': 'RES123',
-        }
-
     def test_is_configured(self, notifier):
         assert notifier.is_configured is True
 
@@ -55,34 +54,35 @@ class TestSniperNotifier:
         n._to_email = None
         assert n.is_configured is False
 
-    def test_notify_success_sends_email(self, notifier, mock_sender, sample_job, sample_reservation):
-        result = notifier.notify_success(sample_job, sample_reservation)
+    def test_notify_success_sends_email(self, notifier, mock_sender):
+        result = notifier.notify_success(SAMPLE_JOB, SAMPLE_RESERVATION)
 
         assert result is True
         mock_sender.send.assert_called_once()
-        call_args = mock_sender.send.call_args
-        assert "fish-cheeks" in call_args[0][1]  # subject
-        assert "2026-03-01" in call_args[0][1]
+        subject = mock_sender.send.call_args[0][1]
+        # Explicit messages keep failures readable under --assert=plain
+        assert "fish-cheeks" in subject, f"venue missing from subject: {subject!r}"
+        assert "2026-03-01" in subject, f"date missing from subject: {subject!r}"
 
-    def test_notify_success_unconfigured_returns_false(self, sample_job, sample_reservation):
+    def test_notify_success_unconfigured_returns_false(self):
         n = SniperNotifier.__new__(SniperNotifier)
         n._sender = None
         n._to_email = None
-        assert n.notify_success(sample_job, sample_reservation) is False
+        assert n.notify_success(SAMPLE_JOB, SAMPLE_RESERVATION) is False
 
-    def test_notify_failure_sends_email(self, notifier, mock_sender, sample_job):
-        result = notifier.notify_failure(sample_job, "Max attempts reached")
+    def test_notify_failure_sends_email(self, notifier, mock_sender):
+        result = notifier.notify_failure(SAMPLE_JOB, "Max attempts reached")
 
         assert result is True
         mock_sender.send.assert_called_once()
-        call_args = mock_sender.send.call_args
-        assert "Failed" in call_args[0][1]
+        subject = mock_sender.send.call_args[0][1]
+        assert "Failed" in subject, f"unexpected failure subject: {subject!r}"
 
-    def test_notify_failure_unconfigured_returns_false(self, sample_job):
+    def test_notify_failure_unconfigured_returns_false(self):
         n = SniperNotifier.__new__(SniperNotifier)
         n._sender = None
         n._to_email = None
-        assert n.notify_failure(sample_job, "No slots") is False
+        assert n.notify_failure(SAMPLE_JOB, "No slots") is False
 
 
 class TestFormatting:
@@ -137,33 +137,22 @@ class TestNotificationSendFailures:
 
     @pytest.fixture
     def failing_sender(self):
-        sender = MagicMock()
+        sender = Mock(spec=EmailSender)
         sender.send.return_value = False
         return sender
 
-    @pytest.fixture
-    def sample_job(self):
-        return {
-            'venue_slug': 'fish-cheeks',
-            'date': '2026-03-01',
-            'preferred_times': ['7:00 PM'],
-            'party_size': 2,
-            'poll_count': 5,
-            'max_attempts': 60,
-        }
-
-    def test_notify_success_send_fails(self, failing_sender, sample_job):
+    def test_notify_success_send_fails(self, failing_sender):
         """Test notify_success returns False when send fails."""
         n = SniperNotifier(email_sender=failing_sender)
         n._to_email = "test@example.com"
 
-        result = n.notify_success(sample_job, {'time_slot': '7:00 PM', 'reservation_id': 'R1'})
+        result = n.notify_success(SAMPLE_JOB, {'time_slot': '7:00 PM', 'reservation_id': 'R1'})
         assert result is False
 
-    def test_notify_failure_send_fails(self, failing_sender, sample_job):
+    def test_notify_failure_send_fails(self, failing_sender):
         """Test notify_failure returns False when send fails."""
         n = SniperNotifier(email_sender=failing_sender)
         n._to_email = "test@example.com"
 
-        result = n.notify_failure(sample_job, "Max attempts reached")
+        result = n.notify_failure(SAMPLE_JOB, "Max attempts reached")
         assert result is False
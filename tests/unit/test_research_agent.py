@@ -1,35 +1,57 @@
 """Unit tests for ResearchAgent."""
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+from agents.base_agent import BaseAgent
+from agents.research_agent import ResearchAgent
+
+
+def _resp(stop_reason, *blocks):
+    """Build a Claude messages.create response."""
+    return SimpleNamespace(stop_reason=stop_reason, content=list(blocks))
+
+
+def _text(text):
+    """Build a text content block."""
+    return SimpleNamespace(type="text", text=text)
+
+
+def _tool(name, tool_input, tool_use_id):
+    """Build a tool_use content block."""
+    return SimpleNamespace(type="tool_use", name=name, input=tool_input, id=tool_use_id)
+
 
 class TestResearchAgent:
     """Test ResearchAgent functionality."""
 
-    @patch('agents.base_agent.Settings')
-    @patch('agents.base_agent.anthropic.Anthropic')
-    def _create_agent(self, mock_anthropic, mock_settings):
-        """Helper to create a ResearchAgent with mocked dependencies."""
-        mock_settings.ANTHROPIC_API_KEY = 'test-key'
-        mock_settings.DEFAULT_MODEL = 'claude-sonnet-4-20250514'
-        mock_settings.MAX_TOKENS = 4096
-        mock_settings.BRAVE_API_KEY = None
-
-        from agents.research_agent import ResearchAgent
+    @pytest.fixture(scope="class")
+    @classmethod
+    def _patched_anthropic(cls):
+        """Patch BaseAgent's Settings and Anthropic client once for the class."""
+        with patch('agents.base_agent.Settings') as mock_settings, \
+             patch('agents.base_agent.anthropic.Anthropic') as mock_anthropic:
+            mock_settings.ANTHROPIC_API_KEY = 'test-key'
+            mock_settings.DEFAULT_MODEL = 'claude-sonnet-4-20250514'
+            mock_settings.MAX_TOKENS = 4096
+            mock_settings.BRAVE_API_KEY = None
+            yield mock_anthropic
+
+    @pytest.fixture
+    def agent(self, _patched_anthropic):
+        """Create a ResearchAgent with its own mock Anthropic client."""
+        _patched_anthropic.return_value = MagicMock()
         return ResearchAgent()
 
-    def test_init_inherits_from_base_agent(self):
+    def test_init_inherits_from_base_agent(self, agent):
         """Test that ResearchAgent inherits from BaseAgent."""
-        from agents.base_agent import BaseAgent
-        agent = self._create_agent()
         assert isinstance(agent, BaseAgent)
 
     @patch('agents.research_agent.Settings')
-    def test_search_web_mock_results(self, mock_settings):
+    def test_search_web_mock_results(self, mock_settings, agent):
         """Test search_web returns mock results when no Brave API key."""
         mock_settings.BRAVE_API_KEY = None
-        agent = self._create_agent()
 
         result = agent.search_web("test query")
 
@@ -38,9 +60,8 @@ class TestResearchAgent:
         assert "note" in result
 
     @patch('agents.research_agent.Settings')
-    def test_search_web_with_brave_api(self, mock_settings):
+    def test_search_web_with_brave_api(self, mock_settings, agent):
         """Test search_web uses Brave API when key is available."""
-        agent = self._create_agent()
         mock_settings.BRAVE_API_KEY = 'brave-test-key'
 
         with patch('requests.get') as mock_get:
@@ -61,90 +82,46 @@ class TestResearchAgent:
             assert result["source"] == "Brave Search API"
             assert len(result["results"]) == 2
 
-    def test_execute_tool_web_search(self):
+    def test_execute_tool_web_search(self, agent):
         """Test execute_tool dispatches web_search correctly."""
-        agent = self._create_agent()
-
         result = agent.execute_tool("web_search", {"query": "test"})
 
         assert "query" in result
         assert result["query"] == "test"
 
-    def test_execute_tool_unknown(self):
+    def test_execute_tool_unknown(self, agent):
         """Test execute_tool returns error for unknown tools."""
-        agent = self._create_agent()
-
         result = agent.execute_tool("unknown_tool", {})
 
         assert "error" in result
 
-    def test_run_end_turn(self):
+    def test_run_end_turn(self, agent):
         """Test run method when Claude responds with end_turn."""
-        agent = self._create_agent()
-
-        # Mock Claude response with end_turn
-        mock_content = MagicMock()
-        mock_content.type = "text"
-        mock_content.text = "Here is my answer."
-
-        mock_response = MagicMock()
-        mock_response.stop_reason = "end_turn"
-        mock_response.content = [mock_content]
-
-        agent.client.messages.create.return_value = mock_response
+        agent.client.messages.create.return_value = _resp("end_turn", _text("Here is my answer."))
 
         result = agent.run("What is AI?")
 
         assert result == "Here is my answer."
         assert len(agent.conversation_history) == 2  # user + assistant
 
-    def test_run_tool_use_then_end_turn(self):
+    def test_run_tool_use_then_end_turn(self, agent):
         """Test run method with tool use followed by end turn."""
-        agent = self._create_agent()
-
-        # First response: tool_use
-        mock_tool_block = MagicMock()
-        mock_tool_block.type = "tool_use"
-        mock_tool_block.name = "web_search"
-        mock_tool_block.input = {"query": "test"}
-        mock_tool_block.id = "tool_123"
-
-        mock_response_1 = MagicMock()
-        mock_response_1.stop_reason = "tool_use"
-        mock_response_1.content = [mock_tool_block]
-
-        # Second response: end_turn
-        mock_text_block = MagicMock()
-        mock_text_block.type = "text"
-        mock_text_block.text = "Based on my search, here is the answer."
-
-        mock_response_2 = MagicMock()
-        mock_response_2.stop_reason = "end_turn"
-        mock_response_2.content = [mock_text_block]
-
-        agent.client.messages.create.side_effect = [mock_response_1, mock_response_2]
+        agent.client.messages.create.side_effect = [
+            _resp("tool_use", _tool("web_search", {"query": "test"}, "tool_123")),
+            _resp("end_turn", _text("Based on my search, here is the answer.")),
+        ]
 
         result = agent.run("Search for test")
 
         assert result == "Based on my search, here is the answer."
         assert agent.client.messages.create.call_count == 2
 
-    def test_run_max_iterations(self):
+    def test_run_max_iterations(self, agent):
         """Test run method hits max iterations."""
-        agent = self._create_agent()
-
         # Always return tool_use to exhaust iterations
-        mock_tool_block = MagicMock()
-        mock_tool_block.type = "tool_use"
-        mock_tool_block.name = "web_search"
-        mock_tool_block.input = {"query": "test"}
-        mock_tool_block.id = "tool_123"
-
-        mock_response = MagicMock()
-        mock_response.stop_reason = "tool_use"
-        mock_response.content = [mock_tool_block]
-
-        agent.client.messages.create.return_value = mock_response
+        agent.client.messages.create.return_value = _resp(
+            "tool_use", _tool("web_search", {"query": "test"}, "tool_123")
+        )
 
         result = agent.run("Search forever", max_iterations=2)
 
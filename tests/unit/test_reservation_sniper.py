@@ -1,35 +1,102 @@
 """Unit tests for ReservationSniper."""
 
 import pytest
-import os
-import tempfile
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock
+from utils.notification import SniperNotifier
 from utils.reservation_sniper import ReservationSniper
 from utils.reservation_store import ReservationStore
+from utils.resy_client import ResyClient
+
+
+@pytest.fixture(scope="module")
+def shared_store(tmp_path_factory, fast_pragmas):
+    """One on-disk ReservationStore for the whole module (schema created once)."""
+    store = fast_pragmas(ReservationStore(db_path=str(tmp_path_factory.mktemp("sniper") / "sniper.db")))
+    yield store
+    store.close()
+
+
+def _slot(time_str):
+    """Build an availability slot for venue 'test' on 2026-03-01."""
+    return {'time': time_str, 'config_id': f'test|||2026-03-01|||{time_str}'}
+
+
+CONFLICT = {'success': False, 'status': 'conflict'}
+
+# (availability, booking, resolve, auto_resolve, expected) for the _poll_once
+# outcome matrix. availability/booking may be exceptions, raised by the mock.
+POLL_ONCE_CASES = [
+    pytest.param(
+        [], None, None, True,
+        {'booked': False, 'error': 'No slots'},
+        id='no_availability',
+    ),
+    pytest.param(
+        Exception("Connection timeout"), None, None, True,
+        {'booked': False, 'error': 'Connection timeout'},
+        id='availability_exception',
+    ),
+    pytest.param(
+        [_slot('6:00 PM'), _slot('7:30 PM'), _slot('9:00 PM')],
+        {'success': True, 'reservation_id': 'RES456'}, None, True,
+        {'booked': True, 'time': '7:30 PM'},  # Closest to 7:00 PM
+        id='falls_back_to_closest',
+    ),
+    pytest.param(
+        [_slot('7:00 PM')], {'success': False, 'error': 'Slot taken'}, None, True,
+        {'booked': False, 'error': 'Slot taken'},
+        id='booking_fails',
+    ),
+    pytest.param(
+        [_slot('7:00 PM')], Exception("Network error"), None, True,
+        {'booked': False, 'error': 'Network error'},
+        id='booking_exception',
+    ),
+    pytest.param(
+        # modal_opened is neither success nor conflict, so the sniper keeps polling
+        [_slot('7:00 PM')],
+        {'success': False, 'status': 'modal_opened',
+         'message': 'Booking modal opened but could not click Reserve Now button'},
+        None, True,
+        {'booked': False},
+        id='retries_on_modal_opened',
+    ),
+    pytest.param(
+        [_slot('7:00 PM')], CONFLICT, {'success': True, 'reservation_id': 'RES789'}, True,
+        {'booked': True, 'reservation_id': 'RES789', 'resolved': True},
+        id='conflict_auto_resolves',
+    ),
+    pytest.param(
+        [_slot('7:00 PM')], CONFLICT, None, False,
+        {'booked': False, 'resolved': False},
+        id='conflict_no_auto_resolve',
+    ),
+]
 
 
 class TestReservationSniper:
     """Test ReservationSniper core functionality."""
 
+    @pytest.fixture(autouse=True)
+    def _no_sleep(self, monkeypatch):
+        """Make the sniper's poll/retry sleeps no-ops for every test."""
+        monkeypatch.setattr('utils.reservation_sniper.time.sleep', lambda *_a, **_kw: None)
+
     @pytest.fixture
-    def store(self):
-        """Create a temporary ReservationStore."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-        store = ReservationStore(db_path=db_path)
-        yield store
-        store.close()
-        os.unlink(db_path)
+    def store(self, shared_store, reset_store):
+        """Yield the shared store, emptying it after each test."""
+        yield shared_store
+        reset_store(shared_store)
 
     @pytest.fixture
     def mock_client(self):
-        """Create a mock Resy client."""
-        return MagicMock()
+        """Create a mock Resy client limited to ResyClient's interface."""
+        return Mock(spec=ResyClient)
 
     @pytest.fixture
     def mock_notifier(self):
         """Create a mock SniperNotifier."""
-        notifier = MagicMock()
+        notifier = Mock(spec=SniperNotifier)
         notifier.notify_success.return_value = True
         notifier.notify_failure.return_value = True
         return notifier
@@ -74,23 +141,37 @@ class TestReservationSniper:
         assert job['max_attempts'] == 60
         assert job['auto_resolve_conflicts'] is True
 
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_poll_once_no_availability(self, mock_sleep, sniper, store, mock_client):
-        """Test _poll_once when no slots are available."""
-        mock_client.get_availability.return_value = []
+    @pytest.mark.parametrize("availability, booking, resolve, auto_resolve, expected", POLL_ONCE_CASES)
+    def test_poll_once_outcomes(self, sniper, store, mock_client,
+                                availability, booking, resolve, auto_resolve, expected):
+        """Test _poll_once across availability, booking and conflict outcomes."""
+        if isinstance(availability, Exception):
+            mock_client.get_availability.side_effect = availability
+        else:
+            mock_client.get_availability.return_value = availability
+        if isinstance(booking, Exception):
+            mock_client.make_reservation.side_effect = booking
+        else:
+            mock_client.make_reservation.return_value = booking
+        mock_client.resolve_reservation_conflict.return_value = resolve
 
         job_id = sniper.create_job(
             venue_slug='test', date='2026-03-01', preferred_times=['7:00 PM'],
-            scheduled_at='2020-01-01T00:00:00',
+            auto_resolve_conflicts=auto_resolve, scheduled_at='2020-01-01T00:00:00',
         )
-        job = store.get_sniper_job(job_id)
-        result = sniper._poll_once(job)
-
-        assert result['booked'] is False
-        assert 'No slots' in result['error']
-
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_poll_once_books_preferred_time(self, mock_sleep, sniper, store, mock_client):
+        result = sniper._poll_once(store.get_sniper_job(job_id))
+
+        assert result['booked'] is expected['booked']
+        if 'error' in expected:
+            assert expected['error'] in result['error']
+        if 'time' in expected:
+            assert result['time'] == expected['time']
+        if 'reservation_id' in expected:
+            assert result['reservation_id'] == expected['reservation_id']
+        if 'resolved' in expected:
+            assert mock_client.resolve_reservation_conflict.called is expected['resolved']
+
+    def test_poll_once_books_preferred_time(self, sniper, store, mock_client):
         """Test _poll_once books the preferred time when available."""
         mock_client.get_availability.return_value = [
             {'time': '6:00 PM', 'config_id': 'test|||2026-03-01|||6:00 PM'},
@@ -119,79 +200,7 @@ class TestReservationSniper:
             party_size=2,
         )
 
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_poll_once_falls_back_to_closest(self, mock_sleep, sniper, store, mock_client):
-        """Test _poll_once falls back to closest slot when preferred is unavailable."""
-        mock_client.get_availability.return_value = [
-            {'time': '6:00 PM', 'config_id': 'test|||2026-03-01|||6:00 PM'},
-            {'time': '7:30 PM', 'config_id': 'test|||2026-03-01|||7:30 PM'},
-            {'time': '9:00 PM', 'config_id': 'test|||2026-03-01|||9:00 PM'},
-        ]
-        mock_client.make_reservation.return_value = {
-            'success': True,
-            'reservation_id': 'RES456',
-        }
-
-        job_id = sniper.create_job(
-            venue_slug='test', date='2026-03-01', preferred_times=['7:00 PM'],
-            scheduled_at='2020-01-01T00:00:00',
-        )
-        job = store.get_sniper_job(job_id)
-        result = sniper._poll_once(job)
-
-        assert result['booked'] is True
-        assert result['time'] == '7:30 PM'  # Closest to 7:00 PM
-
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_poll_once_conflict_auto_resolves(self, mock_sleep, sniper, store, mock_client):
-        """Test _poll_once resolves conflicts when auto_resolve is enabled."""
-        mock_client.get_availability.return_value = [
-            {'time': '7:00 PM', 'config_id': 'test|||2026-03-01|||7:00 PM'},
-        ]
-        # First booking returns conflict, then resolve succeeds
-        mock_client.make_reservation.return_value = {
-            'success': False,
-            'status': 'conflict',
-        }
-        mock_client.resolve_reservation_conflict.return_value = {
-            'success': True,
-            'reservation_id': 'RES789',
-        }
-
-        job_id = sniper.create_job(
-            venue_slug='test', date='2026-03-01', preferred_times=['7:00 PM'],
-            auto_resolve_conflicts=True, scheduled_at='2020-01-01T00:00:00',
-        )
-        job = store.get_sniper_job(job_id)
-        result = sniper._poll_once(job)
-
-        assert result['booked'] is True
-        assert result['reservation_id'] == 'RES789'
-        mock_client.resolve_reservation_conflict.assert_called_once()
-
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_poll_once_booking_fails(self, mock_sleep, sniper, store, mock_client):
-        """Test _poll_once when booking fails (non-conflict)."""
-        mock_client.get_availability.return_value = [
-            {'time': '7:00 PM', 'config_id': 'test|||2026-03-01|||7:00 PM'},
-        ]
-        mock_client.make_reservation.return_value = {
-            'success': False,
-            'error': 'Slot taken',
-        }
-
-        job_id = sniper.create_job(
-            venue_slug='test', date='2026-03-01', preferred_times=['7:00 PM'],
-            scheduled_at='2020-01-01T00:00:00',
-        )
-        job = store.get_sniper_job(job_id)
-        result = sniper._poll_once(job)
-
-        assert result['booked'] is False
-        assert 'Slot taken' in result['error']
-
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_run_job_max_attempts(self, mock_sleep, sniper, store, mock_client, mock_notifier):
+    def test_run_job_max_attempts(self, sniper, store, mock_client, mock_notifier):
         """Test run_job stops after max attempts and notifies failure."""
         mock_client.get_availability.return_value = []
 
@@ -209,8 +218,7 @@ class TestReservationSniper:
         job = store.get_sniper_job(job_id)
         assert job['status'] == 'failed'
 
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_run_job_success_notifies(self, mock_sleep, sniper, store, mock_client, mock_notifier):
+    def test_run_job_success_notifies(self, sniper, store, mock_client, mock_notifier):
         """Test run_job sends success notification on booking."""
         mock_client.get_availability.return_value = [
             {'time': '7:00 PM', 'config_id': 'test|||2026-03-01|||7:00 PM'},
@@ -235,15 +243,13 @@ class TestReservationSniper:
         assert job['status'] == 'completed'
         assert job['reservation_id'] is not None
 
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_run_job_not_found(self, mock_sleep, sniper):
+    def test_run_job_not_found(self, sniper):
         """Test run_job with invalid job ID."""
         result = sniper.run_job(999)
         assert result['outcome'] == 'failed'
         assert 'not found' in result['reason']
 
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_run_scheduled_jobs_picks_up_due_jobs(self, mock_sleep, sniper, store, mock_client, mock_notifier):
+    def test_run_scheduled_jobs_picks_up_due_jobs(self, sniper, store, mock_client, mock_notifier):
         """Test run_scheduled_jobs only runs jobs past scheduled_at."""
         mock_client.get_availability.return_value = [
             {'time': '7:00 PM', 'config_id': 'test|||2026-03-01|||7:00 PM'},
@@ -271,47 +277,36 @@ class TestReservationSniper:
         future_jobs = [j for j in store.get_all_sniper_jobs() if j['venue_slug'] == 'test-future']
         assert future_jobs[0]['status'] == 'pending'
 
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_run_scheduled_jobs_no_pending(self, mock_sleep, sniper):
-        """Test run_scheduled_jobs with no pending jobs."""
-        result = sniper.run_scheduled_jobs()
-        assert result['jobs_run'] == 0
-
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_poll_once_availability_exception(self, mock_sleep, sniper, store, mock_client):
-        """Test _poll_once handles exceptions from get_availability."""
-        mock_client.get_availability.side_effect = Exception("Connection timeout")
-
-        job_id = sniper.create_job(
-            venue_slug='test', date='2026-03-01', preferred_times=['7:00 PM'],
-            scheduled_at='2020-01-01T00:00:00',
-        )
-        job = store.get_sniper_job(job_id)
-        result = sniper._poll_once(job)
-
-        assert result['booked'] is False
-        assert 'Connection timeout' in result['error']
-
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_poll_once_booking_exception(self, mock_sleep, sniper, store, mock_client):
-        """Test _poll_once handles exceptions from make_reservation."""
+    def test_run_scheduled_jobs_skips_sibling_cancelled_mid_batch(self, sniper, store, mock_client):
+        """A due job cancelled by an earlier booking in the same batch is not run."""
         mock_client.get_availability.return_value = [
             {'time': '7:00 PM', 'config_id': 'test|||2026-03-01|||7:00 PM'},
         ]
-        mock_client.make_reservation.side_effect = Exception("Network error")
+        mock_client.make_reservation.return_value = {
+            'success': True,
+            'reservation_id': 'RES100',
+        }
 
-        job_id = sniper.create_job(
+        first = sniper.create_job(
             venue_slug='test', date='2026-03-01', preferred_times=['7:00 PM'],
             scheduled_at='2020-01-01T00:00:00',
         )
-        job = store.get_sniper_job(job_id)
-        result = sniper._poll_once(job)
+        second = sniper.create_job(
+            venue_slug='test', date='2026-03-01', preferred_times=['7:30 PM'],
+            scheduled_at='2020-01-01T00:01:00',
+        )
+
+        result = sniper.run_scheduled_jobs()
 
-        assert result['booked'] is False
-        assert 'Network error' in result['error']
+        assert list(result['results']) == [first]
+        assert store.get_sniper_job(second)['status'] == 'cancelled'
 
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_shutdown_pauses_job(self, mock_sleep, sniper, store, mock_client):
+    def test_run_scheduled_jobs_no_pending(self, sniper):
+        """Test run_scheduled_jobs with no pending jobs."""
+        result = sniper.run_scheduled_jobs()
+        assert result['jobs_run'] == 0
+
+    def test_shutdown_pauses_job(self, sniper, store, mock_client):
         """Test run_job returns 'shutdown' and reverts status when shutdown is set."""
         mock_client.get_availability.return_value = []
 
@@ -366,29 +361,7 @@ class TestReservationSniper:
                 scheduled_at='not-a-date',
             )
 
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_poll_once_conflict_no_auto_resolve(self, mock_sleep, sniper, store, mock_client):
-        """Test _poll_once returns error on conflict when auto_resolve is off."""
-        mock_client.get_availability.return_value = [
-            {'time': '7:00 PM', 'config_id': 'test|||2026-03-01|||7:00 PM'},
-        ]
-        mock_client.make_reservation.return_value = {
-            'success': False,
-            'status': 'conflict',
-        }
-
-        job_id = sniper.create_job(
-            venue_slug='test', date='2026-03-01', preferred_times=['7:00 PM'],
-            auto_resolve_conflicts=False, scheduled_at='2020-01-01T00:00:00',
-        )
-        job = store.get_sniper_job(job_id)
-        result = sniper._poll_once(job)
-
-        assert result['booked'] is False
-        mock_client.resolve_reservation_conflict.assert_not_called()
-
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_poll_once_conflict_resolve_parse_failure(self, mock_sleep, sniper, store, mock_client):
+    def test_poll_once_conflict_resolve_parse_failure(self, sniper, store, mock_client):
         """Test conflict resolution falls back to job venue_slug when config_id parse fails."""
         mock_client.get_availability.return_value = [
             {'time': '7:00 PM', 'config_id': 'bad-config-id'},
@@ -413,26 +386,3 @@ class TestReservationSniper:
         # Verify fallback used job's venue_slug
         call_kwargs = mock_client.resolve_reservation_conflict.call_args[1]
         assert call_kwargs['venue_slug'] == 'test-venue'
-
-    @patch('utils.reservation_sniper.time.sleep')
-    def test_poll_once_retries_on_modal_opened(self, mock_sleep, sniper, store, mock_client):
-        """Sniper treats modal_opened as failure and continues polling."""
-        mock_client.get_availability.return_value = [
-            {'time': '7:00 PM', 'config_id': 'test|||2026-03-01|||7:00 PM'},
-        ]
-        # modal_opened returns success: False, so sniper should treat as failure
-        mock_client.make_reservation.return_value = {
-            'success': False,
-            'status': 'modal_opened',
-            'message': 'Booking modal opened but could not click Reserve Now button',
-        }
-
-        job_id = sniper.create_job(
-            venue_slug='test', date='2026-03-01', preferred_times=['7:00 PM'],
-            scheduled_at='2020-01-01T00:00:00',
-        )
-        job = store.get_sniper_job(job_id)
-        result = sniper._poll_once(job)
-
-        # modal_opened is not success and not conflict, so returns booked=False
-        assert result['booked'] is False
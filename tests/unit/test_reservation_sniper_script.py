@@ -0,0 +1,156 @@
+"""Unit tests for the config-driven scripts/reservation_sniper.py monitor."""
+
+import pytest
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+import scripts.reservation_sniper as legacy
+
+
+def _target(restaurant, auto_book=False):
+    """Build a sniper config target."""
+    return {
+        'restaurant': restaurant,
+        'location': 'ny',
+        'date': '2026-02-25',
+        'party_size': 2,
+        'preferred_times': [],
+        'auto_book': auto_book,
+    }
+
+
+class TestReservationSniperScript:
+    """Test the polling loop and notification batching."""
+
+    @pytest.fixture
+    def sniper(self):
+        """Create a sniper with store, email and client mocked out."""
+        with patch.object(legacy, 'ReservationStore'), \
+             patch.object(legacy, 'CAPABILITIES', replace(legacy.CAPABILITIES, email=False)):
+            sniper = legacy.ReservationSniper()
+        sniper.email_sender = MagicMock()
+        return sniper
+
+    def _run(self, sniper, targets, slots_by_restaurant, max_checks=1):
+        """Run the sniper loop against a fixed config."""
+        config = {
+            'targets': targets,
+            'check_interval_seconds': 0,
+            'max_checks_per_session': max_checks,
+            'stop_when_found': True,
+        }
+        sniper.load_config = MagicMock(return_value=config)
+        sniper.check_target = MagicMock(
+            side_effect=lambda t: slots_by_restaurant.get(t['restaurant'], [])
+        )
+        with patch.object(legacy.ResyClientFactory, 'create_client'), \
+             patch.object(legacy.time, 'sleep'):
+            sniper.run()
+
+    def test_run_batches_notifications_per_cycle(self, sniper):
+        """Multiple notify-only hits in one cycle produce a single email."""
+        slots = {
+            'temple-court': [{'time': '18:00'}],
+            'carbone': [{'time': '19:00'}, {'time': '19:30'}],
+        }
+        self._run(sniper, [_target('temple-court'), _target('carbone')], slots)
+
+        sniper.email_sender.send.assert_called_once()
+        kwargs = sniper.email_sender.send.call_args.kwargs
+        assert '2 restaurants' in kwargs['subject']
+        assert '## temple-court' in kwargs['content']
+        assert '## carbone' in kwargs['content']
+        assert '19:00, 19:30' in kwargs['content']
+
+    def test_run_no_email_when_nothing_found(self, sniper):
+        """No email is sent for a cycle without hits."""
+        self._run(sniper, [_target('temple-court')], {})
+
+        sniper.email_sender.send.assert_not_called()
+
+    def test_run_sends_one_email_per_cycle_with_hits(self, sniper):
+        """Each cycle with hits sends exactly one email."""
+        slots = {'temple-court': [{'time': '18:00'}]}
+        self._run(sniper, [_target('temple-court')], slots, max_checks=3)
+
+        assert sniper.email_sender.send.call_count == 3
+        subject = sniper.email_sender.send.call_args.kwargs['subject']
+        assert subject == '🔔 Availability Found: temple-court'
+
+    def test_run_flushes_notifications_before_stopping(self, sniper):
+        """Hits collected before a successful auto-book are still emailed."""
+        slots = {
+            'temple-court': [{'time': '18:00'}],
+            'carbone': [{'time': '19:00', 'config_id': 'abc'}],
+        }
+        sniper.book_slot = MagicMock(return_value=True)
+        self._run(
+            sniper,
+            [_target('temple-court'), _target('carbone', auto_book=True)],
+            slots,
+            max_checks=5,
+        )
+
+        sniper.book_slot.assert_called_once()
+        sniper.email_sender.send.assert_called_once()
+
+    def test_run_sleeps_remaining_interval(self, sniper):
+        """Sleep accounts for time already spent on the cycle."""
+        config = {
+            'targets': [_target('temple-court')],
+            'check_interval_seconds': 10,
+            'max_checks_per_session': 3,
+        }
+        sniper.load_config = MagicMock(return_value=config)
+        sniper.check_target = MagicMock(return_value=[])
+        # start, end of cycle 1 (4s of work), end of cycle 2 (overran), re-anchor
+        clock = iter([100.0, 104.0, 125.0, 125.0])
+
+        with patch.object(legacy.ResyClientFactory, 'create_client'), \
+             patch.object(legacy.time, 'monotonic', side_effect=lambda: next(clock)), \
+             patch.object(legacy.time, 'sleep') as mock_sleep:
+            sniper.run()
+
+        mock_sleep.assert_called_once_with(6.0)
+
+    def test_book_slot_emails_confirmation(self, sniper):
+        """Successful booking sends the auto-booked email."""
+        sniper.client = MagicMock()
+        sniper.client.make_reservation.return_value = {
+            'success': True,
+            'reservation_id': 'RES-123',
+        }
+
+        assert sniper.book_slot(_target('temple-court'), {'time': '18:00', 'config_id': 'abc'})
+
+        kwargs = sniper.email_sender.send.call_args.kwargs
+        assert kwargs['subject'] == '🎉 AUTO-BOOKED: temple-court on 2026-02-25'
+        assert '**Time:** 18:00' in kwargs['content']
+        assert '**Confirmation:** RES-123' in kwargs['content']
+
+    def test_send_availability_summary_without_email(self, sniper):
+        """Summary is a no-op when email is not configured."""
+        sender = sniper.email_sender
+        sniper.email_sender = None
+
+        with patch.object(legacy, 'EmailSender') as mock_email_cls:
+            result = sniper.send_availability_summary([(_target('temple-court'), [{'time': '18:00'}])])
+
+        assert result is None
+        sender.send.assert_not_called()
+        mock_email_cls.assert_not_called()
+
+
+class TestConfigSerialization:
+    """Test the config (de)serialization helpers."""
+
+    def test_dumps_loads_round_trip(self):
+        """Config survives a dump/load round trip."""
+        config = {'targets': [_target('temple-court')], 'check_interval_seconds': 300}
+        assert legacy._loads(legacy._dumps(config)) == config
+
+    def test_dumps_is_indented_text(self):
+        """Dumped config is a human-editable, indented string."""
+        dumped = legacy._dumps({'stop_when_found': True})
+        assert isinstance(dumped, str)
+        assert '\n  "stop_when_found": true' in dumped
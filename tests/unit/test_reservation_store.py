@@ -1,40 +1,92 @@
 """Unit tests for ReservationStore."""
 
 import pytest
-import os
-import tempfile
+import sqlite3
+from contextlib import closing
+from unittest.mock import patch
 from datetime import datetime, timedelta
-from utils.reservation_store import ReservationStore
+from utils.reservation_store import ReservationStore, _SCHEMA_VERSION
+
+SAMPLE_RESERVATION = {
+    'platform': 'resy',
+    'restaurant_name': 'Test Restaurant',
+    'date': '2026-03-01',
+    'time': '7:00 PM',
+    'party_size': 2,
+    'confirmation_number': 'CONF123',
+    'confirmation_token': 'TOKEN456',
+    'status': 'confirmed',
+}
+
+SAMPLE_JOB = {
+    'venue_slug': 'fish-cheeks',
+    'date': '2026-03-01',
+    'preferred_times': ['7:00 PM', '7:30 PM'],
+    'party_size': 2,
+    'time_window_minutes': 60,
+    'max_attempts': 60,
+    'scheduled_at': '2026-02-22T09:00:00',
+    'auto_resolve_conflicts': True,
+    'notes': 'Test sniper job',
+}
+
+
+@pytest.fixture(scope="session")
+def template_db(tmp_path_factory):
+    """A database initialized once per session; tests copy it instead of re-running DDL."""
+    path = str(tmp_path_factory.mktemp('template') / 'template.db')
+    ReservationStore(db_path=path).close()
+    return path
+
+
+@pytest.fixture(scope="session")
+def _store_session(fast_pragmas):
+    """One in-memory ReservationStore for the whole session (schema created once)."""
+    store = fast_pragmas(ReservationStore(db_path=':memory:'))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def store(_store_session, reset_store):
+    """Yield the shared store, emptying every table after the test.
+
+    Store methods commit (and claim_next_sniper_job opens BEGIN IMMEDIATE),
+    so a SAVEPOINT around the test can't be rolled back; deleting the rows
+    is the equivalent reset and is cheap in memory.
+    """
+    yield _store_session
+    reset_store(_store_session)
+
+
+@pytest.fixture
+def sample_reservation():
+    """Sample reservation data (a fresh copy per test)."""
+    return SAMPLE_RESERVATION.copy()
+
+
+@pytest.fixture
+def sample_job():
+    """Sample sniper job data (a fresh copy per test)."""
+    return SAMPLE_JOB.copy()
+
+
+@pytest.mark.parametrize('op, args, expected', [
+    ('get_reservation_by_id', (), None),
+    ('update_reservation_status', ('cancelled',), False),
+    ('delete_reservation', (), False),
+    ('get_sniper_job', (), None),
+    ('update_sniper_job', ({'status': 'active'},), False),
+    ('increment_poll_count', (), False),
+])
+def test_missing_id(store, op, args, expected):
+    """Test lookups and updates on a non-existent id return None/False."""
+    assert getattr(store, op)(999, *args) is expected
 
 
 class TestReservationStore:
     """Test ReservationStore CRUD operations."""
 
-    @pytest.fixture
-    def store(self):
-        """Create a temporary ReservationStore."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-
-        store = ReservationStore(db_path=db_path)
-        yield store
-        store.close()
-        os.unlink(db_path)
-
-    @pytest.fixture
-    def sample_reservation(self):
-        """Sample reservation data."""
-        return {
-            'platform': 'resy',
-            'restaurant_name': 'Test Restaurant',
-            'date': '2026-03-01',
-            'time': '7:00 PM',
-            'party_size': 2,
-            'confirmation_number': 'CONF123',
-            'confirmation_token': 'TOKEN456',
-            'status': 'confirmed',
-        }
-
     def test_add_reservation(self, store, sample_reservation):
         """Test adding a reservation."""
         res_id = store.add_reservation(sample_reservation)
@@ -42,6 +94,21 @@ class TestReservationStore:
         assert res_id is not None
         assert res_id > 0
 
+    def test_add_reservations(self, store, sample_reservation):
+        """Test bulk-adding reservations in one transaction."""
+        count = store.add_reservations([sample_reservation] * 3)
+
+        assert count == 3
+        assert len(store.get_reservations()) == 3
+        assert not store.conn.in_transaction
+
+    def test_add_reservations_rolls_back_on_error(self, store, sample_reservation):
+        """Test a failing row leaves none of the batch behind."""
+        with pytest.raises(sqlite3.IntegrityError):
+            store.add_reservations([sample_reservation, sample_reservation | {'platform': None}])
+
+        assert store.get_reservations() == []
+
     def test_get_reservation_by_id(self, store, sample_reservation):
         """Test retrieving a reservation by ID."""
         res_id = store.add_reservation(sample_reservation)
@@ -54,15 +121,12 @@ class TestReservationStore:
         assert result['party_size'] == 2
         assert result['confirmation_number'] == 'CONF123'
 
-    def test_get_reservation_not_found(self, store):
-        """Test retrieving a non-existent reservation."""
-        result = store.get_reservation_by_id(999)
-        assert result is None
-
     def test_get_reservations_no_filter(self, store, sample_reservation):
         """Test getting all reservations."""
-        store.add_reservation(sample_reservation)
-        store.add_reservation({**sample_reservation, 'restaurant_name': 'Another Restaurant'})
+        store.add_reservations([
+            sample_reservation,
+            sample_reservation | {'restaurant_name': 'Another Restaurant'},
+        ])
 
         results = store.get_reservations()
 
@@ -70,8 +134,7 @@ class TestReservationStore:
 
     def test_get_reservations_with_platform_filter(self, store, sample_reservation):
         """Test filtering reservations by platform."""
-        store.add_reservation(sample_reservation)
-        store.add_reservation({**sample_reservation, 'platform': 'opentable'})
+        store.add_reservations([sample_reservation, sample_reservation | {'platform': 'opentable'}])
 
         results = store.get_reservations({'platform': 'resy'})
 
@@ -80,8 +143,7 @@ class TestReservationStore:
 
     def test_get_reservations_with_status_filter(self, store, sample_reservation):
         """Test filtering reservations by status."""
-        store.add_reservation(sample_reservation)
-        store.add_reservation({**sample_reservation, 'status': 'cancelled'})
+        store.add_reservations([sample_reservation, sample_reservation | {'status': 'cancelled'}])
 
         results = store.get_reservations({'status': 'confirmed'})
 
@@ -109,11 +171,6 @@ class TestReservationStore:
         assert result['status'] == 'cancelled'
         assert result['notes'] == 'Changed plans'
 
-    def test_update_nonexistent_reservation(self, store):
-        """Test updating a non-existent reservation returns False."""
-        success = store.update_reservation_status(999, 'cancelled')
-        assert success is False
-
     def test_delete_reservation(self, store, sample_reservation):
         """Test deleting a reservation."""
         res_id = store.add_reservation(sample_reservation)
@@ -124,30 +181,6 @@ class TestReservationStore:
         result = store.get_reservation_by_id(res_id)
         assert result is None
 
-    def test_delete_nonexistent_reservation(self, store):
-        """Test deleting a non-existent reservation returns False."""
-        success = store.delete_reservation(999)
-        assert success is False
-
-    def test_context_manager(self, sample_reservation):
-        """Test context manager usage."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-
-        try:
-            with ReservationStore(db_path=db_path) as store:
-                res_id = store.add_reservation(sample_reservation)
-                assert res_id > 0
-
-            # Verify connection was closed (store.conn should be closed)
-            # Re-open to verify data persisted
-            store2 = ReservationStore(db_path=db_path)
-            result = store2.get_reservation_by_id(res_id)
-            assert result is not None
-            store2.close()
-        finally:
-            os.unlink(db_path)
-
     def test_timestamps_set(self, store, sample_reservation):
         """Test that created_at and updated_at are set."""
         res_id = store.add_reservation(sample_reservation)
@@ -158,34 +191,154 @@ class TestReservationStore:
         assert result['updated_at'] is not None
 
 
-class TestSniperJobs:
-    """Test sniper_jobs table operations."""
+class TestPersistence:
+    """Test behavior that needs an on-disk database; everything else runs in memory."""
 
     @pytest.fixture
-    def store(self):
-        """Create a temporary ReservationStore."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
+    def db_path(self, tmp_path):
+        """Path for a database file created on first connect."""
+        return str(tmp_path / 'res.db')
+
+    def test_context_manager(self, db_path, sample_reservation):
+        """Test context manager usage."""
+        with ReservationStore(db_path=db_path) as store:
+            res_id = store.add_reservation(sample_reservation)
+            assert res_id > 0
+
+        # Verify connection was closed (store.conn should be closed)
+        # Re-open to verify data persisted
+        store2 = ReservationStore(db_path=db_path)
+        result = store2.get_reservation_by_id(res_id)
+        assert result is not None
+        store2.close()
 
-        store = ReservationStore(db_path=db_path)
-        yield store
-        store.close()
-        os.unlink(db_path)
+
+class TestConnectionModes:
+    """Test connection PRAGMAs and read-only mode."""
 
     @pytest.fixture
-    def sample_job(self):
-        """Sample sniper job data."""
-        return {
-            'venue_slug': 'fish-cheeks',
-            'date': '2026-03-01',
-            'preferred_times': ['7:00 PM', '7:30 PM'],
-            'party_size': 2,
-            'time_window_minutes': 60,
-            'max_attempts': 60,
-            'scheduled_at': '2026-02-22T09:00:00',
-            'auto_resolve_conflicts': True,
-            'notes': 'Test sniper job',
-        }
+    def db_path(self, tmp_path, template_db):
+        """Path to a fresh copy of the initialized template database."""
+        path = str(tmp_path / 'reservations.db')
+        with closing(sqlite3.connect(template_db)) as src, closing(sqlite3.connect(path)) as dst:
+            src.backup(dst)
+        return path
+
+    def test_schema_version_recorded(self, db_path):
+        """Initialized databases carry the schema version sentinel."""
+        with ReservationStore(db_path=db_path) as store:
+            version = store.conn.execute("PRAGMA user_version").fetchone()[0]
+
+        assert version == _SCHEMA_VERSION
+
+    def test_current_schema_skips_ddl(self, db_path):
+        """Reopening an up-to-date database runs no CREATE TABLE."""
+        statements = []
+        real_connect = sqlite3.connect
+
+        def tracing_connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        with patch('utils.reservation_store.sqlite3.connect', side_effect=tracing_connect):
+            ReservationStore(db_path=db_path).close()
+
+        assert not [sql for sql in statements if 'CREATE TABLE' in sql]
+
+    def test_legacy_database_is_stamped(self, tmp_path):
+        """A database from before the sentinel gets its tables checked and stamped."""
+        path = str(tmp_path / 'legacy.db')
+        with ReservationStore(db_path=path) as store:
+            store.conn.execute("PRAGMA user_version = 0")
+            store.conn.commit()
+
+        with ReservationStore(db_path=path) as store:
+            version = store.conn.execute("PRAGMA user_version").fetchone()[0]
+
+        assert version == _SCHEMA_VERSION
+
+    def test_writer_uses_wal(self, db_path):
+        """Writer connections switch the database to WAL journaling."""
+        with ReservationStore(db_path=db_path) as store:
+            mode = store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+            busy_timeout = store.conn.execute("PRAGMA busy_timeout").fetchone()[0]
+
+        assert mode == 'wal'
+        assert busy_timeout == 5000
+
+    def test_connection_disables_cache_spill(self, db_path):
+        """Hot-path PRAGMAs are applied to writer and reader connections."""
+        with ReservationStore(db_path=db_path) as store:
+            with store._reader() as reader:
+                assert reader.execute("PRAGMA cache_spill").fetchone()[0] == 0
+            assert store.conn.execute("PRAGMA cache_spill").fetchone()[0] == 0
+
+    def test_connection_enables_mmap(self, db_path):
+        """Writer and reader connections read through a memory map."""
+        with ReservationStore(db_path=db_path) as store:
+            with store._reader() as reader:
+                assert reader.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+            assert store.conn.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+
+    def test_readonly_reads_existing_rows(self, db_path, sample_reservation):
+        """Read-only store sees rows written by a writer."""
+        with ReservationStore(db_path=db_path) as writer:
+            res_id = writer.add_reservation(sample_reservation)
+
+        with ReservationStore(db_path=db_path, readonly=True) as reader:
+            assert reader.readonly is True
+            assert reader.get_reservation_by_id(res_id)['restaurant_name'] == 'Test Restaurant'
+
+    def test_readonly_rejects_writes(self, db_path, sample_reservation):
+        """Read-only store cannot modify the database."""
+        with ReservationStore(db_path=db_path, readonly=True) as reader:
+            with pytest.raises(sqlite3.OperationalError):
+                reader.add_reservation(sample_reservation)
+
+    def test_reads_use_pooled_reader(self, db_path, sample_reservation):
+        """Reads go through a reused read-only connection, not the writer."""
+        with ReservationStore(db_path=db_path) as store:
+            res_id = store.add_reservation(sample_reservation)
+
+            with store._reader() as first:
+                assert first is not store.conn
+            assert store.get_reservation_by_id(res_id) is not None
+            with store._reader() as second:
+                assert second is first
+
+    def test_concurrent_readers_get_separate_connections(self, db_path):
+        """Nested borrows open an extra reader instead of sharing one."""
+        with ReservationStore(db_path=db_path) as store:
+            with store._reader() as outer, store._reader() as inner:
+                assert outer is not inner
+
+    def test_reader_sees_committed_writes(self, db_path, sample_reservation):
+        """Pooled reader observes rows committed after it was opened."""
+        with ReservationStore(db_path=db_path) as store:
+            assert store.get_reservations() == []
+            store.add_reservation(sample_reservation)
+            assert len(store.get_reservations()) == 1
+
+    def test_memory_db_reads_use_writer(self, sample_reservation):
+        """In-memory stores read through the single writer connection."""
+        with ReservationStore(db_path=':memory:') as store:
+            res_id = store.add_reservation(sample_reservation)
+            with store._reader() as conn:
+                assert conn is store.conn
+            assert store.get_reservation_by_id(res_id) is not None
+
+    def test_readonly_missing_db_falls_back_to_writer(self, tmp_path):
+        """Read-only request on a missing database creates the schema instead."""
+        path = str(tmp_path / 'new.db')
+
+        with ReservationStore(db_path=path, readonly=True) as store:
+            assert store.readonly is False
+            assert store.get_all_sniper_jobs() == []
+
+
+class TestSniperJobs:
+    """Test sniper_jobs table operations."""
 
     def test_add_sniper_job(self, store, sample_job):
         """Test creating a sniper job."""
@@ -194,6 +347,15 @@ class TestSniperJobs:
         assert job_id is not None
         assert job_id > 0
 
+    def test_add_sniper_jobs(self, store, sample_job):
+        """Test bulk-adding sniper jobs in one transaction."""
+        count = store.add_sniper_jobs([sample_job, sample_job | {'venue_slug': 'temple-court'}])
+
+        assert count == 2
+        assert [j['preferred_times'] for j in store.get_all_sniper_jobs()] == [
+            sample_job['preferred_times']
+        ] * 2
+
     def test_get_sniper_job(self, store, sample_job):
         """Test retrieving a sniper job by ID."""
         job_id = store.add_sniper_job(sample_job)
@@ -209,18 +371,14 @@ class TestSniperJobs:
         assert job['auto_resolve_conflicts'] is True
         assert job['notes'] == 'Test sniper job'
 
-    def test_get_sniper_job_not_found(self, store):
-        """Test retrieving a non-existent sniper job."""
-        assert store.get_sniper_job(999) is None
-
     def test_get_pending_sniper_jobs(self, store, sample_job):
         """Test getting pending jobs whose scheduled_at has passed."""
         # Past job — should be returned
-        past_job = {**sample_job, 'scheduled_at': '2020-01-01T09:00:00'}
+        past_job = sample_job | {'scheduled_at': '2020-01-01T09:00:00'}
         past_id = store.add_sniper_job(past_job)
 
         # Future job — should NOT be returned
-        future_job = {**sample_job, 'scheduled_at': '2099-01-01T09:00:00'}
+        future_job = sample_job | {'scheduled_at': '2099-01-01T09:00:00'}
         store.add_sniper_job(future_job)
 
         pending = store.get_pending_sniper_jobs()
@@ -229,7 +387,7 @@ class TestSniperJobs:
 
     def test_get_pending_excludes_non_pending(self, store, sample_job):
         """Test that completed/failed jobs are excluded."""
-        past_job = {**sample_job, 'scheduled_at': '2020-01-01T09:00:00'}
+        past_job = sample_job | {'scheduled_at': '2020-01-01T09:00:00'}
         job_id = store.add_sniper_job(past_job)
         store.update_sniper_job(job_id, {'status': 'completed'})
 
@@ -247,10 +405,6 @@ class TestSniperJobs:
         assert job['status'] == 'active'
         assert job['notes'] == 'Running'
 
-    def test_update_sniper_job_not_found(self, store):
-        """Test updating a non-existent job returns False."""
-        assert store.update_sniper_job(999, {'status': 'active'}) is False
-
     def test_update_sniper_job_empty_updates(self, store, sample_job):
         """Test updating with empty dict returns False."""
         job_id = store.add_sniper_job(sample_job)
@@ -269,12 +423,33 @@ class TestSniperJobs:
 
     def test_get_all_sniper_jobs(self, store, sample_job):
         """Test listing all sniper jobs."""
-        store.add_sniper_job(sample_job)
-        store.add_sniper_job({**sample_job, 'venue_slug': 'temple-court'})
+        store.add_sniper_jobs([sample_job, sample_job | {'venue_slug': 'temple-court'}])
 
         jobs = store.get_all_sniper_jobs()
         assert len(jobs) == 2
 
+    def test_get_sniper_job_columns(self, store, sample_job):
+        """Test column-oriented listing matches the row-oriented one."""
+        store.add_sniper_job(sample_job)
+        store.add_sniper_job(sample_job | {'venue_slug': 'temple-court'})
+
+        columns = store.get_sniper_job_columns(['id', 'venue_slug', 'preferred_times', 'auto_resolve_conflicts'])
+        jobs = store.get_all_sniper_jobs()
+
+        assert columns['id'] == [job['id'] for job in jobs]
+        assert columns['venue_slug'] == [job['venue_slug'] for job in jobs]
+        assert columns['preferred_times'] == [job['preferred_times'] for job in jobs]
+        assert columns['auto_resolve_conflicts'] == [job['auto_resolve_conflicts'] for job in jobs]
+
+    def test_get_sniper_job_columns_empty(self, store):
+        """Test every requested column is present even with no jobs."""
+        assert store.get_sniper_job_columns(['id', 'status']) == {'id': [], 'status': []}
+
+    def test_get_sniper_job_columns_rejects_unknown(self, store):
+        """Test column names are validated before building SQL."""
+        with pytest.raises(ValueError, match="Unknown sniper_jobs columns"):
+            store.get_sniper_job_columns(['id', 'status; DROP TABLE sniper_jobs'])
+
     def test_sniper_job_reservation_link(self, store, sample_job):
         """Test linking a sniper job to a reservation."""
         job_id = store.add_sniper_job(sample_job)
@@ -298,7 +473,7 @@ class TestSniperJobs:
 
     def test_claim_next_sniper_job_returns_due_job(self, store, sample_job):
         """Test claiming a pending job whose scheduled_at has passed."""
-        past_job = {**sample_job, 'scheduled_at': '2020-01-01T09:00:00'}
+        past_job = sample_job | {'scheduled_at': '2020-01-01T09:00:00'}
         job_id = store.add_sniper_job(past_job)
 
         claimed = store.claim_next_sniper_job()
@@ -309,7 +484,7 @@ class TestSniperJobs:
 
     def test_claim_next_sniper_job_skips_future(self, store, sample_job):
         """Test that future jobs are not claimed."""
-        future_job = {**sample_job, 'scheduled_at': '2099-01-01T09:00:00'}
+        future_job = sample_job | {'scheduled_at': '2099-01-01T09:00:00'}
         store.add_sniper_job(future_job)
 
         claimed = store.claim_next_sniper_job()
@@ -317,14 +492,47 @@ class TestSniperJobs:
 
     def test_claim_next_sniper_job_skips_already_active(self, store, sample_job):
         """Test that already-active jobs are not claimed."""
-        past_job = {**sample_job, 'scheduled_at': '2020-01-01T09:00:00'}
+        past_job = sample_job | {'scheduled_at': '2020-01-01T09:00:00'}
         job_id = store.add_sniper_job(past_job)
         store.update_sniper_job(job_id, {'status': 'active'})
 
         claimed = store.claim_next_sniper_job()
         assert claimed is None
 
-    def test_increment_poll_count_nonexistent(self, store):
-        """Test incrementing poll count for a nonexistent job returns False."""
-        result = store.increment_poll_count(99999)
-        assert result is False
+    def test_claim_next_sniper_job_leaves_no_open_transaction(self, store, sample_job):
+        """Claiming commits (or rolls back) its BEGIN IMMEDIATE transaction."""
+        store.add_sniper_job(sample_job | {'scheduled_at': '2020-01-01T09:00:00'})
+
+        assert store.claim_next_sniper_job() is not None
+        assert store.conn.in_transaction is False
+        assert store.claim_next_sniper_job() is None
+        assert store.conn.in_transaction is False
+
+    def test_fetch_due_sniper_jobs(self, store, sample_job):
+        """Due pending jobs come back in one ordered batch, capped by limit."""
+        later = store.add_sniper_job(sample_job | {'scheduled_at': '2020-01-02T09:00:00'})
+        earlier = store.add_sniper_job(sample_job | {'scheduled_at': '2020-01-01T09:00:00'})
+        store.add_sniper_job(sample_job | {'scheduled_at': '2099-01-01T09:00:00'})
+
+        due = store.fetch_due_sniper_jobs()
+        assert [j['id'] for j in due] == [earlier, later]
+        assert due[0]['preferred_times'] == ['7:00 PM', '7:30 PM']
+
+        assert len(store.fetch_due_sniper_jobs(limit=1)) == 1
+        assert store.fetch_due_sniper_jobs(now='2019-01-01T00:00:00') == []
+
+    def test_claim_sniper_job(self, store, sample_job):
+        """A pending job can be claimed exactly once."""
+        job_id = store.add_sniper_job(sample_job | {'scheduled_at': '2020-01-01T09:00:00'})
+
+        claimed = store.claim_sniper_job(job_id)
+
+        assert claimed['status'] == 'active'
+        assert store.claim_sniper_job(job_id) is None
+
+    def test_claim_sniper_job_skips_cancelled(self, store, sample_job):
+        """Jobs cancelled after being fetched are not claimed."""
+        job_id = store.add_sniper_job(sample_job | {'scheduled_at': '2020-01-01T09:00:00'})
+        store.update_sniper_job(job_id, {'status': 'cancelled'})
+
+        assert store.claim_sniper_job(job_id) is None
@@ -1,173 +1,326 @@
 """Tests for Resy browser client and cuisine/neighborhood search functionality."""
 
+import copy
 import pytest
-import time
+from functools import partial
 from pathlib import Path
-from unittest.mock import MagicMock, patch, PropertyMock, call
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
+from playwright.sync_api import Locator
 
-def _make_browser_client(**overrides):
-    """Create a ResyBrowserClient with mocked browser and page.
+from agents.reservation_agent import _format_venue_results
+from utils.resy_browser_client import (
+    PlaywrightTimeoutError,
+    ResyBrowserClient,
+    _build_search_url,
+    _extract_venue_slug,
+    resolve_location,
+)
+from utils.resy_client import ResyClient
+from utils.slug_utils import normalize_slug
 
-    Skips __init__ side effects. Returns (client, mock_settings).
+# Pure mock manipulation, no real I/O: safe to shard across xdist workers
+pytestmark = pytest.mark.unit
+
+TEST_EMAIL = 'test@example.com'
+TEST_PASSWORD = 'password'
+DEFAULT_COOKIE_FILE = Path('/tmp/test_cookies.json')
+DEFAULT_STORAGE_STATE_FILE = Path('/tmp/test_storage_state.json')
+
+# Booking date and config ids (slug|||date|||time) shared by the booking tests
+TEST_DATE = '2026-02-21'
+CONFIG_ID = 'temple-court|||2026-02-21|||7:00 PM'
+TEST_CONFIG_ID = 'test|||2026-02-21|||7:00 PM'
+
+# What a stubbed _check_booking_confirmation reports for a completed booking
+BOOKED = {'success': True, 'reservation_id': 'resy-test-2026-02-21'}
+
+
+@pytest.fixture(scope="session")
+def browser_settings():
+    """Settings values the browser client reads, built once per session."""
+    return SimpleNamespace(
+        RESY_EMAIL=TEST_EMAIL,
+        RESY_PASSWORD=TEST_PASSWORD,
+        RESY_BROWSER_HEADLESS=True,
+        RESY_RATE_LIMIT_MIN_SECONDS=3,
+        RESY_RATE_LIMIT_JITTER_MIN=0.5,
+        RESY_RATE_LIMIT_JITTER_MAX=1.5,
+        RESY_DEFAULT_LOCATION='ny',
+        RESY_BROWSER_TIMEOUT_MS=30000,
+        RESY_PROXY_SERVER=None,
+        RESY_PROXY_USERNAME=None,
+        RESY_PROXY_PASSWORD=None,
+    )
+
+
+@pytest.fixture(scope="session")
+def locator_mock_factory():
+    """Return a factory for MagicMocks restricted to Playwright's Locator interface."""
+    return partial(MagicMock, spec=Locator)
+
+
+def _noop(*args, **kwargs):
+    """Stand-in for client helpers a test neither drives nor asserts on."""
+    return None
+
+
+class FakeTime:
+    """Virtual clock for the client's _now/_sleep: sleeping records and advances now."""
+
+    __slots__ = ('now', 'sleeps')
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _confirm_booked(*args, **kwargs):
+    """Stand-in for _check_booking_confirmation that always reports BOOKED."""
+    return BOOKED
+
+
+def make_button(text='', disabled=False, css_class=None):
+    """Build a stand-in button for tests that never assert on its calls.
+
+    Tests that check click() was called use a MagicMock instead.
     """
-    with patch('utils.resy_browser_client.Settings') as mock_settings:
-        mock_settings.RESY_EMAIL = 'test@example.com'
-        mock_settings.RESY_PASSWORD = 'password'
-        mock_settings.RESY_BROWSER_HEADLESS = True
-        mock_settings.RESY_RATE_LIMIT_MIN_SECONDS = 3
-        mock_settings.RESY_RATE_LIMIT_JITTER_MIN = 0.5
-        mock_settings.RESY_RATE_LIMIT_JITTER_MAX = 1.5
-        mock_settings.RESY_DEFAULT_LOCATION = 'ny'
-
-        from utils.resy_browser_client import ResyBrowserClient
-        client = ResyBrowserClient.__new__(ResyBrowserClient)
-        client.last_request_time = 0
-        client.min_delay_seconds = 3
-        client.email = 'test@example.com'
-        client.password = 'password'
-        client.headless = True
-        client.playwright = None
-        client.browser = None
-        client.context = MagicMock()
-        client.page = MagicMock()
-        client.is_authenticated = True
-        client.cookie_file = Path('/tmp/test_cookies.json')
-        client.storage_state_file = Path('/tmp/test_storage_state.json')
+    return SimpleNamespace(
+        inner_text=lambda: text,
+        is_disabled=lambda: disabled,
+        is_visible=lambda: True,
+        get_attribute=lambda name: css_class,
+        click=_noop,
+        scroll_into_view_if_needed=_noop,
+    )
 
-        for key, val in overrides.items():
-            setattr(client, key, val)
 
-        return client, mock_settings
+class LocatorStub:
+    """Locator stand-in over a fixed list of elements, for page.locator returns."""
 
+    __slots__ = ('_items',)
 
-class TestSearchUrlConstruction:
-    """Test search URL construction in ResyBrowserClient.search_by_cuisine()."""
+    def __init__(self, items=()):
+        self._items = list(items)
 
-    def _build_search_url(self, cuisine=None, neighborhood=None, location='ny',
-                          date='2026-02-21', party_size=2):
-        """Helper to build expected search URL (mirrors the logic in search_by_cuisine).
+    def all(self):
+        return self._items
 
-        Note: neighborhood is accepted but not added to the URL — Resy's
-        facet=neighborhood is unreliable (doesn't work for boroughs).
-        """
-        from utils.resy_browser_client import resolve_location
-        full_location = resolve_location(location)
-        url = f"https://resy.com/cities/{full_location}/search?seats={party_size}&date={date}"
-        if cuisine:
-            url += f"&facet=cuisine:{cuisine}"
-        return url
-
-    def test_cuisine_only(self):
-        url = self._build_search_url(cuisine='Italian')
-        assert url == 'https://resy.com/cities/new-york-ny/search?seats=2&date=2026-02-21&facet=cuisine:Italian'
-
-    def test_neighborhood_only(self):
-        """Neighborhood alone doesn't add any facet to the URL."""
-        url = self._build_search_url(neighborhood='Soho')
-        assert url == 'https://resy.com/cities/new-york-ny/search?seats=2&date=2026-02-21'
-        assert 'facet=neighborhood' not in url
-
-    def test_cuisine_and_neighborhood(self):
-        """Neighborhood is ignored in URL; only cuisine facet is added."""
-        url = self._build_search_url(cuisine='Japanese', neighborhood='West Village')
-        assert url == 'https://resy.com/cities/new-york-ny/search?seats=2&date=2026-02-21&facet=cuisine:Japanese'
-        assert 'facet=neighborhood' not in url
-
-    def test_borough_not_in_url(self):
-        """Boroughs like Manhattan should not appear as facets in the URL."""
-        url = self._build_search_url(cuisine='Japanese', neighborhood='Manhattan')
-        assert url == 'https://resy.com/cities/new-york-ny/search?seats=2&date=2026-02-21&facet=cuisine:Japanese'
-        assert 'Manhattan' not in url
-
-    def test_no_facets(self):
-        url = self._build_search_url()
-        assert url == 'https://resy.com/cities/new-york-ny/search?seats=2&date=2026-02-21'
-
-    def test_custom_date_and_party_size(self):
-        url = self._build_search_url(cuisine='Chinese', date='2026-03-15', party_size=4)
-        assert url == 'https://resy.com/cities/new-york-ny/search?seats=4&date=2026-03-15&facet=cuisine:Chinese'
-
-    def test_sf_location(self):
-        url = self._build_search_url(cuisine='Mexican', location='sf')
-        assert url == 'https://resy.com/cities/san-francisco-ca/search?seats=2&date=2026-02-21&facet=cuisine:Mexican'
-
-    def test_la_location(self):
-        url = self._build_search_url(cuisine='Korean', location='la')
-        assert url == 'https://resy.com/cities/los-angeles-ca/search?seats=2&date=2026-02-21&facet=cuisine:Korean'
+    def count(self):
+        return len(self._items)
 
+    @property
+    def first(self):
+        return self._items[0] if self._items else None
 
-class TestSlugExtraction:
-    """Test slug extraction from venue card href patterns."""
 
-    def _extract_slug(self, href):
-        """Mirror the slug extraction logic from search_by_cuisine."""
-        if '/venues/' in href:
-            return href.split('/venues/')[-1].split('?')[0].strip('/')
-        return None
+def install_page_buttons(client, buttons=()):
+    """Make every client.page.locator(...) call return a LocatorStub over buttons."""
+    client.page.locator = lambda selector: LocatorStub(buttons)
 
-    def test_standard_href(self):
-        assert self._extract_slug('/cities/new-york-ny/venues/peking-duck-house') == 'peking-duck-house'
 
-    def test_href_with_query_params(self):
-        assert self._extract_slug('/cities/new-york-ny/venues/carbone?date=2026-02-21&seats=2') == 'carbone'
+def make_selector_router(rules, default=None):
+    """Return a page.locator side_effect that routes selectors to mocks.
 
-    def test_full_url(self):
-        assert self._extract_slug('https://resy.com/cities/new-york-ny/venues/lartusi') == 'lartusi'
+    rules maps a selector substring to MagicMock configure kwargs; the first
+    matching rule wins, otherwise default (count() == 0) applies. Mocks are
+    cached per selector, so repeated locator(sel) calls return the same one.
+    """
+    default = default or {'count.return_value': 0}
+    cache = {}
 
-    def test_trailing_slash(self):
-        assert self._extract_slug('/cities/new-york-ny/venues/don-angie/') == 'don-angie'
+    def side_effect(sel):
+        if sel not in cache:
+            config = next((cfg for key, cfg in rules.items() if key in sel), default)
+            cache[sel] = MagicMock(**config)
+        return cache[sel]
 
-    def test_no_venues_path(self):
-        assert self._extract_slug('/cities/new-york-ny/search') is None
+    return side_effect
 
 
-class TestResolveLocation:
-    """Test location code resolution."""
+@pytest.fixture(scope="module", autouse=True)
+def patched_settings(browser_settings):
+    """Patch the client's Settings once for the whole module.
 
-    def test_ny(self):
-        from utils.resy_browser_client import resolve_location
-        assert resolve_location('ny') == 'new-york-ny'
+    Tests that need other values (the __init__ tests) patch over it locally.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('utils.resy_browser_client.Settings', browser_settings)
+        yield browser_settings
 
-    def test_nyc(self):
-        from utils.resy_browser_client import resolve_location
-        assert resolve_location('nyc') == 'new-york-ny'
 
-    def test_sf(self):
-        from utils.resy_browser_client import resolve_location
-        assert resolve_location('sf') == 'san-francisco-ca'
+@pytest.fixture
+def stub_find_element(monkeypatch):
+    """Return a function that replaces the client's SelectorHelper.find_element.
+
+    Successive lookups return the given results in order; a single result is
+    returned for every lookup.
+    """
+    def install(*results):
+        if len(results) == 1:
+            find = lambda *args, **kwargs: results[0]
+        else:
+            remaining = iter(results)
+            find = lambda *args, **kwargs: next(remaining)
+        monkeypatch.setattr('utils.resy_browser_client.SelectorHelper',
+                            SimpleNamespace(find_element=find))
+
+    return install
 
-    def test_la(self):
-        from utils.resy_browser_client import resolve_location
-        assert resolve_location('la') == 'los-angeles-ca'
 
-    def test_unknown_passthrough(self):
-        from utils.resy_browser_client import resolve_location
-        assert resolve_location('chicago-il') == 'chicago-il'
+@pytest.fixture(scope="module")
+def client_prototype():
+    """A ResyBrowserClient with no browser attached, built once per module.
+
+    Skips __init__ side effects; every attribute is immutable or None, so
+    shallow copies share nothing a test can mutate.
+    """
+    client = ResyBrowserClient.__new__(ResyBrowserClient)
+    client.last_request_time = 0
+    client.min_delay_seconds = 3
+    client.email = TEST_EMAIL
+    client.password = TEST_PASSWORD
+    client.headless = True
+    client.playwright = None
+    client.browser = None
+    client.context = None
+    client.page = None
+    client.is_authenticated = True
+    client.cookie_file = DEFAULT_COOKIE_FILE
+    client.storage_state_file = DEFAULT_STORAGE_STATE_FILE
+    return client
+
+
+@pytest.fixture
+def make_browser_client(client_prototype, browser_settings):
+    """Return a factory for ResyBrowserClients copied from the prototype.
+
+    The factory returns (client, settings). context and page default to
+    None; tests that drive the page pass page=MagicMock(). Each client runs
+    on its own FakeTime, so waits and deadlines elapse instantly; tests
+    that check timing pass their own FakeTime's sleep/time as _sleep/_now.
+    """
+    def make(**overrides):
+        client = copy.copy(client_prototype)
+        clock = FakeTime()
+        client._sleep = clock.sleep
+        client._now = clock.time
+
+        for key, val in overrides.items():
+            setattr(client, key, val)
+
+        return client, browser_settings
+
+    return make
+
+
+class TestSearchUrlConstruction:
+    """Test search URL construction used by ResyBrowserClient.search_by_cuisine()."""
+
+    DEFAULTS = {'location': 'ny', 'date': TEST_DATE, 'party_size': 2}
+
+    @pytest.mark.parametrize('kwargs, expected', [
+        pytest.param(
+            {'cuisine': 'Italian'},
+            'https://resy.com/cities/new-york-ny/search?seats=2&date=2026-02-21&facet=cuisine:Italian',
+            id='cuisine_only',
+        ),
+        pytest.param(
+            {},
+            'https://resy.com/cities/new-york-ny/search?seats=2&date=2026-02-21',
+            id='no_facets',
+        ),
+        pytest.param(
+            {'cuisine': 'Chinese', 'date': '2026-03-15', 'party_size': 4},
+            'https://resy.com/cities/new-york-ny/search?seats=4&date=2026-03-15&facet=cuisine:Chinese',
+            id='custom_date_and_party_size',
+        ),
+        pytest.param(
+            {'cuisine': 'Mexican', 'location': 'sf'},
+            'https://resy.com/cities/san-francisco-ca/search?seats=2&date=2026-02-21&facet=cuisine:Mexican',
+            id='sf_location',
+        ),
+        pytest.param(
+            {'cuisine': 'Korean', 'location': 'la'},
+            'https://resy.com/cities/los-angeles-ca/search?seats=2&date=2026-02-21&facet=cuisine:Korean',
+            id='la_location',
+        ),
+    ])
+    def test_build_search_url(self, kwargs, expected):
+        assert _build_search_url(**(self.DEFAULTS | kwargs)) == expected
+
+
+class TestSlugExtraction:
+    """Test slug extraction from venue card href patterns."""
+
+    @pytest.mark.parametrize('href, expected', [
+        pytest.param('/cities/new-york-ny/venues/peking-duck-house', 'peking-duck-house', id='standard_href'),
+        pytest.param('/cities/new-york-ny/venues/carbone?date=2026-02-21&seats=2', 'carbone', id='query_params'),
+        pytest.param('https://resy.com/cities/new-york-ny/venues/lartusi', 'lartusi', id='full_url'),
+        pytest.param('/cities/new-york-ny/venues/don-angie/', 'don-angie', id='trailing_slash'),
+        pytest.param('/cities/new-york-ny/venues/via-carota#menu', 'via-carota', id='fragment'),
+        pytest.param('/cities/new-york-ny/search', None, id='no_venues_path'),
+    ])
+    def test_extract_slug(self, href, expected):
+        assert _extract_venue_slug(href) == expected
+
+
+class TestResolveLocation:
+    """Test location code resolution."""
+
+    @pytest.mark.parametrize('code, expected', [
+        ('ny', 'new-york-ny'),
+        ('nyc', 'new-york-ny'),
+        ('sf', 'san-francisco-ca'),
+        ('la', 'los-angeles-ca'),
+        pytest.param('chicago-il', 'chicago-il', id='unknown_passthrough'),
+    ])
+    def test_resolve_location(self, code, expected):
+        assert resolve_location(code) == expected
+
+    def test_repeated_lookups_hit_cache(self):
+        resolve_location.cache_clear()
+        resolve_location('ny')
+        resolve_location('ny')
+        assert resolve_location.cache_info().hits == 1
 
 
 class TestCuisineSearchHandler:
     """Test the search_resy_by_cuisine handler in ReservationAgent."""
 
-    def test_fallback_when_no_browser_client(self):
-        """API client doesn't have search_by_cuisine, should return helpful error."""
-        # Mock a client without search_by_cuisine (like ResyClient API)
-        mock_client = MagicMock(spec=['search_venues', 'get_availability'])
-
-        # Simulate what execute_tool does
-        has_method = hasattr(mock_client, 'search_by_cuisine')
-        assert has_method is False
-
-    def test_browser_client_has_method(self):
-        """Browser client should have search_by_cuisine method."""
-        # Mock a browser client with search_by_cuisine
-        mock_client = MagicMock(spec=['search_venues', 'get_availability', 'search_by_cuisine'])
-        assert hasattr(mock_client, 'search_by_cuisine') is True
-
-    def test_format_results_with_time_slots(self):
-        """Test formatting of search results with available time slots."""
-        raw_results = [
-            {
+    @pytest.mark.parametrize('client_cls, expected', [
+        # The API client falls back to the browser subprocess in execute_tool
+        (ResyClient, False),
+        (ResyBrowserClient, True),
+    ])
+    def test_client_has_search_by_cuisine(self, client_cls, expected):
+        assert hasattr(client_cls, 'search_by_cuisine') is expected
+
+    @pytest.mark.parametrize('raw, expected', [
+        pytest.param(
+            [{
+                'name': 'Test Restaurant',
+                'slug': 'test-restaurant',
+                'rating': 4.5,
+                'review_count': 120,
+                'cuisine': 'Italian',
+                'price_range': '$$',
+                'neighborhood': 'Soho',
+                'available_times': [
+                    {'time': '5:15 PM', 'type': 'Dining Room', 'config_id': 'test-restaurant|||2026-02-21|||5:15 PM',
+                     'table_name': 'Dining Room'},
+                    {'time': '7:30 PM', 'type': 'Bar', 'config_id': 'test-restaurant|||2026-02-21|||7:30 PM'},
+                ],
+            }],
+            [{
                 'name': 'Test Restaurant',
                 'slug': 'test-restaurant',
                 'rating': 4.5,
@@ -178,42 +331,13 @@ class TestCuisineSearchHandler:
                 'available_times': [
                     {'time': '5:15 PM', 'type': 'Dining Room', 'config_id': 'test-restaurant|||2026-02-21|||5:15 PM'},
                     {'time': '7:30 PM', 'type': 'Bar', 'config_id': 'test-restaurant|||2026-02-21|||7:30 PM'},
-                ]
-            }
-        ]
-
-        # Simulate the formatting logic from execute_tool
-        formatted = []
-        for r in raw_results:
-            venue = {
-                'name': r.get('name'),
-                'slug': r.get('slug'),
-                'rating': r.get('rating'),
-                'review_count': r.get('review_count'),
-                'cuisine': r.get('cuisine'),
-                'price_range': r.get('price_range'),
-                'neighborhood': r.get('neighborhood'),
-            }
-            times = r.get('available_times', [])
-            if times:
-                venue['available_times'] = [
-                    {'time': t['time'], 'type': t['type'], 'config_id': t['config_id']}
-                    for t in times
-                ]
-            formatted.append(venue)
-
-        assert len(formatted) == 1
-        assert formatted[0]['name'] == 'Test Restaurant'
-        assert formatted[0]['slug'] == 'test-restaurant'
-        assert formatted[0]['available_times'] == [
-            {'time': '5:15 PM', 'type': 'Dining Room', 'config_id': 'test-restaurant|||2026-02-21|||5:15 PM'},
-            {'time': '7:30 PM', 'type': 'Bar', 'config_id': 'test-restaurant|||2026-02-21|||7:30 PM'},
-        ]
-
-    def test_format_results_without_time_slots(self):
-        """Test formatting when no time slots are available."""
-        raw_results = [
-            {
+                ],
+            }],
+            id='with_time_slots',
+        ),
+        # No time slots: the key is omitted rather than sent as an empty list
+        pytest.param(
+            [{
                 'name': 'Busy Place',
                 'slug': 'busy-place',
                 'rating': None,
@@ -221,118 +345,79 @@ class TestCuisineSearchHandler:
                 'cuisine': 'French',
                 'price_range': '$$$',
                 'neighborhood': 'West Village',
-                'available_times': []
-            }
-        ]
-
-        formatted = []
-        for r in raw_results:
-            venue = {
-                'name': r.get('name'),
-                'slug': r.get('slug'),
-                'rating': r.get('rating'),
-                'review_count': r.get('review_count'),
-                'cuisine': r.get('cuisine'),
-                'price_range': r.get('price_range'),
-                'neighborhood': r.get('neighborhood'),
-            }
-            times = r.get('available_times', [])
-            if times:
-                venue['available_times'] = [
-                    {'time': t['time'], 'type': t['type'], 'config_id': t['config_id']}
-                    for t in times
-                ]
-            formatted.append(venue)
-
-        assert len(formatted) == 1
-        assert 'available_times' not in formatted[0]
+                'available_times': [],
+            }],
+            [{
+                'name': 'Busy Place',
+                'slug': 'busy-place',
+                'rating': None,
+                'review_count': None,
+                'cuisine': 'French',
+                'price_range': '$$$',
+                'neighborhood': 'West Village',
+            }],
+            id='without_time_slots',
+        ),
+    ])
+    def test_format_venue_results(self, raw, expected):
+        assert _format_venue_results(raw) == expected
 
 
 class TestRateLimit:
     """Test the tiered _rate_limit() behavior in ResyBrowserClient."""
 
-    @patch('utils.resy_browser_client.time')
-    def test_navigation_rate_limit_sleeps_when_under_min_delay(self, mock_time):
-        """Navigation mode should sleep for min_delay + jitter when called too soon."""
-        client, mock_settings = _make_browser_client(is_authenticated=False, context=None, page=None)
-        mock_time.time.return_value = 1.0  # 1s since epoch, last_request at 0 => 1s elapsed < 3s min
-        mock_time.sleep = MagicMock()
-
-        with patch('utils.resy_browser_client.random') as mock_random:
-            mock_random.uniform.return_value = 0.8  # fixed jitter
-            client._rate_limit(navigation=True)
-
-        # Should sleep for (3 - 1) + 0.8 = 2.8s
-        mock_time.sleep.assert_called_once_with(2.8)
-
-    @patch('utils.resy_browser_client.time')
-    def test_navigation_small_jitter_when_past_min_delay(self, mock_time):
-        """Navigation mode should use small jitter (0.3-0.8) when enough time has passed."""
-        client, _ = _make_browser_client(is_authenticated=False, context=None, page=None)
-        mock_time.time.return_value = 10.0  # 10s elapsed > 3s min
-        mock_time.sleep = MagicMock()
-
-        with patch('utils.resy_browser_client.random') as mock_random:
-            mock_random.uniform.return_value = 0.5
-            client._rate_limit(navigation=True)
-
-        # Should sleep for small jitter only
-        mock_time.sleep.assert_called_once_with(0.5)
-        mock_random.uniform.assert_called_with(0.3, 0.8)
-
-    @patch('utils.resy_browser_client.time')
-    def test_non_navigation_uses_lighter_delay(self, mock_time):
-        """Non-navigation mode should use 1s min delay with 0.2-0.5 jitter."""
-        client, _ = _make_browser_client(is_authenticated=False, context=None, page=None)
-        mock_time.time.return_value = 0.5  # 0.5s elapsed < 1s min
-        mock_time.sleep = MagicMock()
-
-        with patch('utils.resy_browser_client.random') as mock_random:
-            mock_random.uniform.return_value = 0.3  # fixed jitter
-            client._rate_limit(navigation=False)
-
-        # Should sleep for (1.0 - 0.5) + 0.3 = 0.8s
-        mock_time.sleep.assert_called_once_with(0.8)
-        mock_random.uniform.assert_called_with(0.2, 0.5)
-
-    @patch('utils.resy_browser_client.time')
-    def test_non_navigation_no_sleep_when_past_min(self, mock_time):
-        """Non-navigation mode should not sleep when enough time has passed."""
-        client, _ = _make_browser_client(is_authenticated=False, context=None, page=None)
-        mock_time.time.return_value = 10.0  # well past 1s min
-        mock_time.sleep = MagicMock()
-
-        client._rate_limit(navigation=False)
-
-        mock_time.sleep.assert_not_called()
-
-    @patch('utils.resy_browser_client.time')
-    def test_force_false_skips_when_recent(self, mock_time):
-        """force=False should skip rate limiting when last request was < 2s ago."""
-        client, _ = _make_browser_client(is_authenticated=False, context=None, page=None)
-        client.last_request_time = 9.5
-        mock_time.time.return_value = 10.0  # 0.5s since last request < 2s threshold
-        mock_time.sleep = MagicMock()
-
-        client._rate_limit(force=False)
-
-        mock_time.sleep.assert_not_called()
-
-
-class TestNormalizeSlugInSearchVenues:
-    """Test that search_venues uses normalize_slug for proper slug conversion."""
-
-    def test_apostrophe_handling(self):
-        from utils.slug_utils import normalize_slug
-        assert normalize_slug("L'Artusi") == 'lartusi'
-
-    def test_ampersand_handling(self):
-        from utils.slug_utils import normalize_slug
-        assert normalize_slug("ABC & Co") == 'abc-and-co'
-
-    def test_simple_name(self):
-        from utils.slug_utils import normalize_slug
-        assert normalize_slug("Temple Court") == 'temple-court'
+    # Jitter returned by random.uniform in every test
+    JITTER = 0.3
+
+    @pytest.fixture(autouse=True)
+    def clock(self, mocker):
+        """Provide a FakeTime and patch random with a fixed jitter for every test."""
+        fake_time = FakeTime()
+        mock_random = mocker.patch('utils.resy_browser_client.random')
+        mock_random.uniform.return_value = self.JITTER
+        return fake_time, mock_random
+
+    @pytest.mark.parametrize('kwargs, last, now, expected_sleeps, jitter_range', [
+        # Navigation too soon: sleep (3 - 1) + jitter with the configured jitter range
+        pytest.param({'navigation': True}, 0, 1.0, [2.0 + JITTER], (0.5, 1.5), id='nav_sleeps'),
+        # Navigation past the min delay: small 0.3-0.8 jitter only
+        pytest.param({'navigation': True}, 0, 10.0, [JITTER], (0.3, 0.8), id='nav_small_jitter'),
+        # In-page action too soon: 1s min delay plus 0.2-0.5 jitter, (1.0 - 0.5) + jitter
+        pytest.param({'navigation': False}, 0, 0.5, [0.5 + JITTER], (0.2, 0.5), id='in_page_sleeps'),
+        pytest.param({'navigation': False}, 0, 10.0, [], None, id='in_page_no_sleep'),
+        # force=False skips rate limiting when the last request was < 2s ago
+        pytest.param({'force': False}, 9.5, 10.0, [], None, id='force_false_skips'),
+    ])
+    def test_rate_limit(self, clock, make_browser_client, kwargs, last, now,
+                        expected_sleeps, jitter_range):
+        fake_time, mock_random = clock
+        client, _ = make_browser_client(is_authenticated=False, last_request_time=last,
+                                        _sleep=fake_time.sleep, _now=fake_time.time)
+        fake_time.now = now
+
+        client._rate_limit(**kwargs)
+
+        assert fake_time.sleeps == pytest.approx(expected_sleeps)
+        if jitter_range:
+            mock_random.uniform.assert_called_with(*jitter_range)
+
+
+@pytest.mark.parametrize('name, slug', [
+    ("L'Artusi", 'lartusi'),
+    ('ABC & Co', 'abc-and-co'),
+    ('Temple Court', 'temple-court'),
+])
+def test_normalize_slug(name, slug):
+    assert normalize_slug(name) == slug
+
+
+def test_search_venues_slugifies_name(make_browser_client):
+    """search_venues looks the venue up by the normalized slug."""
+    client, _ = make_browser_client()
+    client.get_venue_by_slug = MagicMock(return_value={'id': 'lartusi'})
+
+    assert client.search_venues("L'Artusi", 'NY') == [{'id': 'lartusi'}]
+    client.get_venue_by_slug.assert_called_once_with('lartusi', 'ny')
 
 
 # ---------------------------------------------------------------------------
@@ -342,36 +427,34 @@ class TestNormalizeSlugInSearchVenues:
 class TestResyBrowserClientInit:
     """Test the __init__() constructor."""
 
-    @patch('utils.resy_browser_client.Settings')
-    def test_init_missing_email_raises(self, mock_settings):
-        mock_settings.RESY_EMAIL = None
-        mock_settings.RESY_PASSWORD = 'password'
-        mock_settings.RESY_BROWSER_HEADLESS = True
-        mock_settings.RESY_RATE_LIMIT_MIN_SECONDS = 3
+    @pytest.fixture
+    def settings(self, monkeypatch, patched_settings):
+        """Return a setter that overrides Settings values for one test."""
+        def override(**values):
+            for name, value in values.items():
+                monkeypatch.setattr(patched_settings, name, value)
+        return override
+
+    def test_init_missing_email_raises(self, settings):
+        settings(RESY_EMAIL=None)
 
-        from utils.resy_browser_client import ResyBrowserClient
         with pytest.raises(ValueError, match="email and password are required"):
             ResyBrowserClient()
 
-    @patch('utils.resy_browser_client.Settings')
-    def test_init_missing_password_raises(self, mock_settings):
-        mock_settings.RESY_EMAIL = 'test@example.com'
-        mock_settings.RESY_PASSWORD = None
-        mock_settings.RESY_BROWSER_HEADLESS = True
-        mock_settings.RESY_RATE_LIMIT_MIN_SECONDS = 3
+    def test_init_missing_password_raises(self, settings):
+        settings(RESY_PASSWORD=None)
 
-        from utils.resy_browser_client import ResyBrowserClient
         with pytest.raises(ValueError, match="email and password are required"):
             ResyBrowserClient()
 
-    @patch('utils.resy_browser_client.Settings')
-    def test_init_with_defaults(self, mock_settings):
-        mock_settings.RESY_EMAIL = 'default@example.com'
-        mock_settings.RESY_PASSWORD = 'defaultpass'
-        mock_settings.RESY_BROWSER_HEADLESS = False
-        mock_settings.RESY_RATE_LIMIT_MIN_SECONDS = 6
+    def test_init_with_defaults(self, settings):
+        settings(
+            RESY_EMAIL='default@example.com',
+            RESY_PASSWORD='defaultpass',
+            RESY_BROWSER_HEADLESS=False,
+            RESY_RATE_LIMIT_MIN_SECONDS=6,
+        )
 
-        from utils.resy_browser_client import ResyBrowserClient
         client = ResyBrowserClient()
 
         assert client.email == 'default@example.com'
@@ -381,14 +464,13 @@ class TestResyBrowserClientInit:
         assert client.is_authenticated is False
         assert client.page is None
 
-    @patch('utils.resy_browser_client.Settings')
-    def test_init_with_custom_params(self, mock_settings):
-        mock_settings.RESY_EMAIL = 'default@example.com'
-        mock_settings.RESY_PASSWORD = 'defaultpass'
-        mock_settings.RESY_BROWSER_HEADLESS = False
-        mock_settings.RESY_RATE_LIMIT_MIN_SECONDS = 6
+    def test_init_with_custom_params(self, settings):
+        settings(
+            RESY_EMAIL='default@example.com',
+            RESY_PASSWORD='defaultpass',
+            RESY_BROWSER_HEADLESS=False,
+        )
 
-        from utils.resy_browser_client import ResyBrowserClient
         client = ResyBrowserClient(
             email='custom@example.com',
             password='custompass',
@@ -403,74 +485,54 @@ class TestResyBrowserClientInit:
 class TestEnsureAuthenticated:
     """Test _ensure_authenticated() flow."""
 
-    def test_skip_if_already_authenticated(self):
-        client, _ = _make_browser_client(is_authenticated=True)
-        client._load_cookies = MagicMock()
-        client._login = MagicMock()
+    @pytest.mark.parametrize(
+        'is_auth, has_page, cookies_ok, session_ok, load_called, login_called, launch_called',
+        [
+            (True, True, None, None, False, False, False),
+            (False, True, True, True, True, False, False),
+            (False, True, True, False, True, True, False),
+            (False, True, False, None, True, True, False),
+            (False, False, True, True, True, False, True),
+        ],
+        ids=[
+            'skip_if_authed',
+            'cookies_ok',
+            'relogin_when_session_expired',
+            'login_when_no_cookies',
+            'launch_if_no_page',
+        ],
+    )
+    def test_ensure_authenticated(self, make_browser_client, is_auth, has_page, cookies_ok,
+                                  session_ok, load_called, login_called, launch_called):
+        client, _ = make_browser_client(
+            page=MagicMock() if has_page else None,
+            is_authenticated=is_auth,
+        )
         client._launch_browser = MagicMock()
-
-        client._ensure_authenticated()
-
-        client._load_cookies.assert_not_called()
-        client._login.assert_not_called()
-
-    def test_loads_cookies_and_sets_authenticated(self):
-        client, _ = _make_browser_client(is_authenticated=False)
         client._get_storage_state_path = MagicMock(return_value=None)
-        client._load_cookies = MagicMock(return_value=True)
-        client._is_session_valid = MagicMock(return_value=True)
-        client._login = MagicMock()
-
-        client._ensure_authenticated()
-
-        client._load_cookies.assert_called_once()
-        client._is_session_valid.assert_called_once()
-        client._login.assert_not_called()
-        assert client.is_authenticated is True
-
-    def test_relogins_when_stored_session_expired(self):
-        client, _ = _make_browser_client(is_authenticated=False)
-        client._get_storage_state_path = MagicMock(return_value=None)
-        client._load_cookies = MagicMock(return_value=True)
-        client._is_session_valid = MagicMock(return_value=False)
+        client._load_cookies = MagicMock(return_value=cookies_ok)
+        client._is_session_valid = MagicMock(return_value=session_ok)
         client._login = MagicMock()
         client._save_session = MagicMock()
 
         client._ensure_authenticated()
 
-        client._is_session_valid.assert_called_once()
-        client._login.assert_called_once()
-
-    def test_calls_login_when_no_cookies(self):
-        client, _ = _make_browser_client(is_authenticated=False)
-        client._get_storage_state_path = MagicMock(return_value=None)
-        client._load_cookies = MagicMock(return_value=False)
-        client._login = MagicMock()
-        client._save_session = MagicMock()
-
-        client._ensure_authenticated()
-
-        client._login.assert_called_once()
-
-    def test_launches_browser_if_no_page(self):
-        client, _ = _make_browser_client(is_authenticated=False, page=None)
-        client._launch_browser = MagicMock()
-        client._get_storage_state_path = MagicMock(return_value=None)
-        client._load_cookies = MagicMock(return_value=True)
-        client._is_session_valid = MagicMock(return_value=True)
-
-        client._ensure_authenticated()
-
-        client._launch_browser.assert_called_once()
+        assert client._load_cookies.called is load_called
+        assert client._login.called is login_called
+        assert client._launch_browser.called is launch_called
+        if cookies_ok:
+            client._is_session_valid.assert_called_once()
+        if session_ok:
+            assert client.is_authenticated is True
 
 
 class TestAddHumanBehavior:
     """Test _add_human_behavior() randomized delays and scrolls."""
 
-    @patch('utils.resy_browser_client.random')
-    @patch('utils.resy_browser_client.time')
-    def test_always_sleeps(self, mock_time, mock_random):
-        client, _ = _make_browser_client()
+    def test_always_sleeps(self, mocker, make_browser_client):
+        fake_time = FakeTime()
+        mock_random = mocker.patch('utils.resy_browser_client.random')
+        client, _ = make_browser_client(_sleep=fake_time.sleep)
         mock_random.uniform.return_value = 0.25
         mock_random.random.return_value = 0.9  # > 0.7 so scroll triggers
         mock_random.randint.return_value = 100
@@ -478,12 +540,11 @@ class TestAddHumanBehavior:
         page = MagicMock()
         client._add_human_behavior(page)
 
-        mock_time.sleep.assert_called_once_with(0.25)
+        assert fake_time.sleeps == [0.25]
 
-    @patch('utils.resy_browser_client.random')
-    @patch('utils.resy_browser_client.time')
-    def test_scrolls_when_random_high(self, mock_time, mock_random):
-        client, _ = _make_browser_client()
+    def test_scrolls_when_random_high(self, mocker, make_browser_client):
+        mock_random = mocker.patch('utils.resy_browser_client.random')
+        client, _ = make_browser_client()
         mock_random.uniform.return_value = 0.2
         mock_random.random.return_value = 0.8  # > 0.7
         mock_random.randint.return_value = 150
@@ -493,10 +554,9 @@ class TestAddHumanBehavior:
 
         page.evaluate.assert_called_once_with('window.scrollBy(0, 150)')
 
-    @patch('utils.resy_browser_client.random')
-    @patch('utils.resy_browser_client.time')
-    def test_no_scroll_when_random_low(self, mock_time, mock_random):
-        client, _ = _make_browser_client()
+    def test_no_scroll_when_random_low(self, mocker, make_browser_client):
+        mock_random = mocker.patch('utils.resy_browser_client.random')
+        client, _ = make_browser_client()
         mock_random.uniform.return_value = 0.2
         mock_random.random.return_value = 0.5  # <= 0.7
 
@@ -509,15 +569,18 @@ class TestAddHumanBehavior:
 class TestFindInFrames:
     """Test _find_in_frames() selector search across page and iframes."""
 
-    def test_finds_in_main_page(self):
-        client, _ = _make_browser_client()
-        mock_locator = MagicMock()
+    @pytest.fixture
+    def client(self, make_browser_client):
+        """Client whose page has no iframes unless a test adds some."""
+        client, _ = make_browser_client(page=MagicMock())
+        client.page.frames = []
+        return client
+
+    def test_finds_in_main_page(self, client, locator_mock_factory):
+        mock_locator = locator_mock_factory()
         mock_locator.count.return_value = 1
-        mock_locator.first = MagicMock()
         mock_locator.first.is_visible.return_value = True
-
         client.page.locator.return_value = mock_locator
-        client.page.frames = []
 
         result = client._find_in_frames(['.my-selector'])
 
@@ -525,18 +588,16 @@ class TestFindInFrames:
         assert result[0] == mock_locator.first
         assert result[1] == client.page
 
-    def test_finds_in_iframe(self):
-        client, _ = _make_browser_client()
+    def test_finds_in_iframe(self, client, locator_mock_factory):
         # Main page: not found
-        main_locator = MagicMock()
+        main_locator = locator_mock_factory()
         main_locator.count.return_value = 0
         client.page.locator.return_value = main_locator
 
         # Iframe: found
         iframe = MagicMock()
-        iframe_locator = MagicMock()
+        iframe_locator = locator_mock_factory()
         iframe_locator.count.return_value = 1
-        iframe_locator.first = MagicMock()
         iframe_locator.first.is_visible.return_value = True
         iframe.locator.return_value = iframe_locator
         client.page.frames = [iframe]
@@ -547,24 +608,19 @@ class TestFindInFrames:
         assert result[0] == iframe_locator.first
         assert result[1] == iframe
 
-    def test_returns_none_when_not_found(self):
-        client, _ = _make_browser_client()
-        mock_locator = MagicMock()
+    def test_returns_none_when_not_found(self, client, locator_mock_factory):
+        mock_locator = locator_mock_factory()
         mock_locator.count.return_value = 0
         client.page.locator.return_value = mock_locator
-        client.page.frames = []
 
         result = client._find_in_frames(['.no-match'])
         assert result is None
 
-    def test_visible_only_skips_hidden(self):
-        client, _ = _make_browser_client()
-        mock_locator = MagicMock()
+    def test_visible_only_skips_hidden(self, client, locator_mock_factory):
+        mock_locator = locator_mock_factory()
         mock_locator.count.return_value = 1
-        mock_locator.first = MagicMock()
         mock_locator.first.is_visible.return_value = False
         client.page.locator.return_value = mock_locator
-        client.page.frames = []
 
         result = client._find_in_frames(['.hidden-elem'], visible_only=True)
         assert result is None
@@ -573,44 +629,28 @@ class TestFindInFrames:
 class TestIsSessionValid:
     """Test _is_session_valid() authentication detection."""
 
-    def test_valid_session_detected(self):
-        client, _ = _make_browser_client()
+    def test_valid_session_detected(self, make_browser_client):
+        client, _ = make_browser_client(page=MagicMock())
         client._screenshot = MagicMock()
 
         # Auth indicator found on first try
-        def locator_side_effect(sel):
-            mock = MagicMock()
-            if 'user-menu' in sel:
-                mock.count.return_value = 1
-            else:
-                mock.count.return_value = 0
-            return mock
-
-        client.page.locator.side_effect = locator_side_effect
+        client.page.locator.side_effect = make_selector_router({'user-menu': {'count.return_value': 1}})
 
         result = client._is_session_valid()
         assert result is True
 
-    def test_invalid_session_login_button(self):
-        client, _ = _make_browser_client()
+    def test_invalid_session_login_button(self, make_browser_client):
+        client, _ = make_browser_client(page=MagicMock())
         client._screenshot = MagicMock()
 
         # No auth indicators, but login button present
-        def locator_side_effect(sel):
-            mock = MagicMock()
-            if 'Log in' in sel:
-                mock.count.return_value = 1
-            else:
-                mock.count.return_value = 0
-            return mock
-
-        client.page.locator.side_effect = locator_side_effect
+        client.page.locator.side_effect = make_selector_router({'Log in': {'count.return_value': 1}})
 
         result = client._is_session_valid()
         assert result is False
 
-    def test_navigation_error_returns_none(self):
-        client, _ = _make_browser_client()
+    def test_navigation_error_returns_none(self, make_browser_client):
+        client, _ = make_browser_client(page=MagicMock())
         client.page.goto.side_effect = Exception("Network error")
 
         result = client._is_session_valid()
@@ -620,8 +660,8 @@ class TestIsSessionValid:
 class TestSearchVenues:
     """Test search_venues() slug conversion and delegation."""
 
-    def test_calls_get_venue_by_slug(self):
-        client, _ = _make_browser_client()
+    def test_calls_get_venue_by_slug(self, make_browser_client):
+        client, _ = make_browser_client()
         venue = {'id': 'temple-court', 'name': 'Temple Court'}
         client.get_venue_by_slug = MagicMock(return_value=venue)
 
@@ -630,211 +670,142 @@ class TestSearchVenues:
         client.get_venue_by_slug.assert_called_once_with('temple-court', 'ny')
         assert result == [venue]
 
-    def test_returns_empty_when_not_found(self):
-        client, _ = _make_browser_client()
+    def test_returns_empty_when_not_found(self, make_browser_client):
+        client, _ = make_browser_client()
         client.get_venue_by_slug = MagicMock(return_value=None)
 
         result = client.search_venues("Nonexistent Place")
         assert result == []
 
-    def test_custom_location(self):
-        client, _ = _make_browser_client()
+    def test_custom_location(self, make_browser_client):
+        client, _ = make_browser_client()
         client.get_venue_by_slug = MagicMock(return_value=None)
 
         client.search_venues("Some Restaurant", location='SF')
         client.get_venue_by_slug.assert_called_once_with('some-restaurant', 'sf')
 
 
-class TestGetVenueBySlug:
-    """Test get_venue_by_slug() page loading and venue extraction."""
-
-    def test_success_modern_url(self):
-        client, _ = _make_browser_client()
-        client._ensure_authenticated = MagicMock()
-        client._rate_limit = MagicMock()
-        client._add_human_behavior = MagicMock()
+NOT_FOUND_PAGE = '<html><body>page not found</body></html>'
 
-        # Page loads successfully (not 404)
-        client.page.content.return_value = '<html><body>Temple Court</body></html>'
-        client.page.title.return_value = 'Temple Court - Resy'
-
-        # h1 found
-        h1_locator = MagicMock()
-        h1_locator.inner_text.return_value = 'Temple Court'
-
-        def locator_side_effect(sel):
-            if sel == 'h1':
-                mock = MagicMock()
-                mock.first = h1_locator
-                return mock
-            mock = MagicMock()
-            mock.first.inner_text.side_effect = Exception("not found")
-            return mock
-
-        client.page.locator.side_effect = locator_side_effect
-
-        result = client.get_venue_by_slug('temple-court', 'ny')
-
-        assert result is not None
-        assert result['name'] == 'Temple Court'
-        assert result['id'] == 'temple-court'
-        assert result['url_slug'] == 'temple-court'
 
-    def test_404_fallback_to_old_url(self):
-        client, _ = _make_browser_client()
-        client._ensure_authenticated = MagicMock()
-        client._rate_limit = MagicMock()
-        client._add_human_behavior = MagicMock()
-
-        # content() is called once per URL check.
-        # title() is only called when "page not found" is NOT in content
-        # (Python short-circuit evaluation). For the first URL, "page not found"
-        # matches so title() is skipped. Only the second URL calls title().
-        content_responses = [
-            '<html><body>page not found</body></html>',  # modern URL → 404 via content
-            '<html><body>Some Restaurant</body></html>',  # old URL → success
-        ]
-        client.page.content.side_effect = content_responses
-        client.page.title.return_value = 'Some Restaurant - Resy'
-
-        h1_locator = MagicMock()
-        h1_locator.inner_text.return_value = 'Some Restaurant'
-
-        def locator_side_effect(sel):
-            if sel == 'h1':
-                mock = MagicMock()
-                mock.first = h1_locator
-                return mock
-            mock = MagicMock()
-            mock.first.inner_text.side_effect = Exception("not found")
-            return mock
-
-        client.page.locator.side_effect = locator_side_effect
-
-        result = client.get_venue_by_slug('some-restaurant', 'ny')
-
-        assert result is not None
-        assert result['name'] == 'Some Restaurant'
-        # Should have navigated twice
-        assert client.page.goto.call_count == 2
+class TestGetVenueBySlug:
+    """Test get_venue_by_slug() page loading and venue extraction."""
 
-    def test_both_urls_404(self):
-        client, _ = _make_browser_client()
+    @pytest.fixture
+    def client(self, make_browser_client):
+        """Client with auth, rate limiting and human behavior stubbed out."""
+        client, _ = make_browser_client(page=MagicMock())
         client._ensure_authenticated = MagicMock()
         client._rate_limit = MagicMock()
         client._add_human_behavior = MagicMock()
+        return client
+
+    # content() is called once per URL check. title() is only called when
+    # "page not found" is NOT in content (short-circuit), so a 404 via
+    # content skips it and only the URL that loads calls title().
+    @pytest.mark.parametrize('slug, contents, title, expected_name, goto_calls', [
+        pytest.param(
+            'temple-court', ['<html><body>Temple Court</body></html>'],
+            'Temple Court - Resy', 'Temple Court', 1, id='success_modern_url',
+        ),
+        pytest.param(
+            'some-restaurant', [NOT_FOUND_PAGE, '<html><body>Some Restaurant</body></html>'],
+            'Some Restaurant - Resy', 'Some Restaurant', 2, id='404_fallback_to_old_url',
+        ),
+        pytest.param(
+            'nonexistent', [NOT_FOUND_PAGE, NOT_FOUND_PAGE], '404', None, 2, id='both_urls_404',
+        ),
+    ])
+    def test_get_venue_by_slug(self, client, slug, contents, title, expected_name, goto_calls):
+        client.page.content.side_effect = contents
+        client.page.title.return_value = title
+        client.page.locator.side_effect = make_selector_router(
+            {'h1': {'first.inner_text.return_value': expected_name}},
+            default={'first.inner_text.side_effect': Exception("not found")},
+        )
 
-        client.page.content.return_value = '<html><body>page not found</body></html>'
-        client.page.title.return_value = '404'
+        result = client.get_venue_by_slug(slug, 'ny')
 
-        result = client.get_venue_by_slug('nonexistent', 'ny')
-        assert result is None
+        assert client.page.goto.call_count == goto_calls
+        if expected_name is None:
+            assert result is None
+        else:
+            assert result['name'] == expected_name
+            assert result['id'] == slug
+            assert result['url_slug'] == slug
 
 
 class TestGetAvailability:
     """Test get_availability() time slot parsing."""
 
-    def _setup_availability_client(self):
-        client, settings = _make_browser_client()
+    def _setup_availability_client(self, make_browser_client):
+        client, settings = make_browser_client(page=MagicMock())
         client._ensure_authenticated = MagicMock()
         client._rate_limit = MagicMock()
         return client, settings
 
-    def test_parses_time_slots(self):
-        client, settings = self._setup_availability_client()
-
-        # wait_for_function succeeds
-        client.page.wait_for_function = MagicMock()
-
-        # Create buttons that look like time slots
-        btn1 = MagicMock()
-        btn1.inner_text.return_value = '6:00 PM\nDining Room'
-        btn1.is_disabled.return_value = False
-        btn1.get_attribute.return_value = None
-
-        btn2 = MagicMock()
-        btn2.inner_text.return_value = '7:30 PM\nBar'
-        btn2.is_disabled.return_value = False
-        btn2.get_attribute.return_value = None
-
-        client.page.locator.return_value.all.return_value = [btn1, btn2]
-
-        result = client.get_availability('temple-court', '2026-02-21', 2)
-
-        assert len(result) == 2
-        assert result[0]['time'] == '6:00 PM'
-        assert result[0]['table_name'] == 'Dining Room'
-        assert '|||' in result[0]['config_id']
-        assert result[1]['time'] == '7:30 PM'
-        assert result[1]['table_name'] == 'Bar'
-
-    def test_skips_disabled_buttons(self):
-        client, settings = self._setup_availability_client()
+    @pytest.mark.parametrize('buttons, expected', [
+        pytest.param(
+            [('6:00 PM\nDining Room',), ('7:30 PM\nBar',)],
+            [('6:00 PM', 'Dining Room'), ('7:30 PM', 'Bar')],
+            id='parses_time_slots',
+        ),
+        pytest.param(
+            [('8:00 PM\nDining Room', True), ('9:00 PM\nDining Room',)],
+            [('9:00 PM', 'Dining Room')],
+            id='skips_disabled_buttons',
+        ),
+        # Navigation button with a city name next to a real time slot
+        pytest.param(
+            [('5:00 PM\nNew York', False, 'CitiesListButton'), ('5:00 PM\nDining Room',)],
+            [('5:00 PM', 'Dining Room')],
+            id='skips_navigation_buttons',
+        ),
+    ])
+    def test_parses_buttons(self, make_browser_client, stub_find_element, buttons, expected):
+        client, settings = self._setup_availability_client(make_browser_client)
         client.page.wait_for_function = MagicMock()
+        # Buttons are built per run so no mock state leaks between cases
+        install_page_buttons(client, [make_button(*b) for b in buttons])
 
-        btn_disabled = MagicMock()
-        btn_disabled.inner_text.return_value = '8:00 PM\nDining Room'
-        btn_disabled.is_disabled.return_value = True
-        btn_disabled.get_attribute.return_value = None
-
-        btn_enabled = MagicMock()
-        btn_enabled.inner_text.return_value = '9:00 PM\nDining Room'
-        btn_enabled.is_disabled.return_value = False
-        btn_enabled.get_attribute.return_value = None
+        # No "no availability" message on the page
+        stub_find_element(None)
+        result = client.get_availability('temple-court', TEST_DATE, 2)
 
-        client.page.locator.return_value.all.return_value = [btn_disabled, btn_enabled]
+        assert [(r['time'], r['table_name']) for r in result] == expected
+        assert all('|||' in r['config_id'] for r in result)
 
-        # Mock SelectorHelper.find_element for no-availability check
-        with patch('utils.resy_browser_client.SelectorHelper') as mock_sh:
-            mock_sh.find_element.return_value = None
-            result = client.get_availability('temple-court', '2026-02-21', 2)
+    def test_numeric_venue_id_rejected(self, make_browser_client):
+        client, settings = self._setup_availability_client(make_browser_client)
 
-        assert len(result) == 1
-        assert result[0]['time'] == '9:00 PM'
+        result = client.get_availability('12345', TEST_DATE, 2)
+        assert result == []
 
-    def test_skips_navigation_buttons(self):
-        client, settings = self._setup_availability_client()
+    def test_no_availability_message(self, make_browser_client, stub_find_element):
+        client, settings = self._setup_availability_client(make_browser_client)
         client.page.wait_for_function = MagicMock()
 
-        # Navigation button with city name
-        nav_btn = MagicMock()
-        nav_btn.inner_text.return_value = '5:00 PM\nNew York'
-        nav_btn.is_disabled.return_value = False
-        nav_btn.get_attribute.return_value = 'CitiesListButton'
-
-        # Real time slot
-        time_btn = MagicMock()
-        time_btn.inner_text.return_value = '5:00 PM\nDining Room'
-        time_btn.is_disabled.return_value = False
-        time_btn.get_attribute.return_value = None
+        # No time slot buttons
+        install_page_buttons(client, [make_button('Close')])
 
-        client.page.locator.return_value.all.return_value = [nav_btn, time_btn]
+        stub_find_element(object())  # "No availability" found
+        result = client.get_availability('temple-court', TEST_DATE, 2)
 
-        result = client.get_availability('temple-court', '2026-02-21', 2)
+        assert result == []
 
-        assert len(result) == 1
-        assert result[0]['table_name'] == 'Dining Room'
+    def test_timeout_returns_empty(self, make_browser_client):
+        client, settings = self._setup_availability_client(make_browser_client)
+        client.page.locator.return_value.all.side_effect = PlaywrightTimeoutError('Timeout 30000ms exceeded')
 
-    def test_numeric_venue_id_rejected(self):
-        client, settings = self._setup_availability_client()
+        result = client.get_availability('temple-court', TEST_DATE, 2)
 
-        result = client.get_availability('12345', '2026-02-21', 2)
         assert result == []
 
-    def test_no_availability_message(self):
-        client, settings = self._setup_availability_client()
-        client.page.wait_for_function = MagicMock()
+    def test_unexpected_error_returns_empty(self, make_browser_client):
+        client, settings = self._setup_availability_client(make_browser_client)
+        client.page.locator.return_value.all.side_effect = RuntimeError('page crashed')
 
-        # No time slot buttons
-        empty_btn = MagicMock()
-        empty_btn.inner_text.return_value = 'Close'
-        empty_btn.is_disabled.return_value = False
-        empty_btn.get_attribute.return_value = None
-        client.page.locator.return_value.all.return_value = [empty_btn]
-
-        with patch('utils.resy_browser_client.SelectorHelper') as mock_sh:
-            mock_sh.find_element.return_value = MagicMock()  # "No availability" found
-            result = client.get_availability('temple-court', '2026-02-21', 2)
+        result = client.get_availability('temple-court', TEST_DATE, 2)
 
         assert result == []
 
@@ -842,59 +813,52 @@ class TestGetAvailability:
 class TestMakeReservation:
     """Test make_reservation() booking flow."""
 
-    def _setup_reservation_client(self):
-        client, settings = _make_browser_client()
-        client._ensure_authenticated = MagicMock()
+    @pytest.fixture
+    def client(self, make_browser_client):
+        """Client with the booking flow's helpers stubbed out.
+
+        Stubs are plain functions; only _rate_limit, which tests assert on,
+        stays a MagicMock.
+        """
+        client, _ = make_browser_client(page=MagicMock())
+        client._ensure_authenticated = _noop
         client._rate_limit = MagicMock()
-        client._add_human_behavior = MagicMock()
-        client._screenshot = MagicMock(return_value=None)
-        client._find_in_frames = MagicMock(return_value=None)
-        client._check_booking_confirmation = MagicMock(return_value={
-            'success': True,
-            'reservation_id': 'resy-test-2026-02-21',
-        })
-        return client, settings
+        client._add_human_behavior = _noop
+        client._screenshot = _noop
+        client._find_in_frames = _noop
+        client._check_booking_confirmation = _confirm_booked
+        return client
 
-    def test_invalid_config_id_raises(self):
-        client, _ = self._setup_reservation_client()
+    def test_invalid_config_id_raises(self, client):
         client.page.url = ''
 
-        result = client.make_reservation('bad-id', '2026-02-21', 2)
+        result = client.make_reservation('bad-id', TEST_DATE, 2)
 
         assert result['success'] is False
         assert 'error' in result
 
-    def test_skips_navigation_when_already_on_page(self):
-        client, _ = self._setup_reservation_client()
-        config_id = 'temple-court|||2026-02-21|||7:00 PM'
+    def test_skips_navigation_when_already_on_page(self, client):
         client.page.url = 'https://resy.com/cities/new-york-ny/venues/temple-court?date=2026-02-21&seats=2'
 
         # Button found
-        btn = MagicMock()
-        btn.inner_text.return_value = '7:00 PM\nDining Room'
-        btn.is_disabled.return_value = False
-        client.page.locator.return_value.all.return_value = [btn]
+        client.page.locator.return_value.all.return_value = [make_button('7:00 PM\nDining Room')]
 
         # Modal appears
         client.page.wait_for_selector = MagicMock()
 
         # Reserve button in iframe
         frame = MagicMock()
-        frame_btn = MagicMock()
-        frame_btn.is_visible.return_value = True
-        frame_btn.is_disabled.return_value = False
+        frame_btn = make_button()
         frame.locator.return_value.count.return_value = 1
         frame.locator.return_value.first = frame_btn
         client.page.frames = [frame]
 
-        with patch('utils.resy_browser_client.time'):
-            result = client.make_reservation(config_id, '2026-02-21', 2)
+        result = client.make_reservation(CONFIG_ID, TEST_DATE, 2)
 
         # Should NOT have called page.goto since already on page
         client.page.goto.assert_not_called()
 
-    def test_time_button_not_found_raises(self):
-        client, _ = self._setup_reservation_client()
+    def test_time_button_not_found_raises(self, client):
         config_id = 'temple-court|||2026-02-21|||11:00 PM'
         client.page.url = ''
 
@@ -902,36 +866,23 @@ class TestMakeReservation:
         client.page.locator.return_value.all.return_value = []
         client.page.wait_for_function = MagicMock()
 
-        with patch('utils.resy_browser_client.time'):
-            result = client.make_reservation(config_id, '2026-02-21', 2)
+        result = client.make_reservation(config_id, TEST_DATE, 2)
 
         assert result['success'] is False
         assert 'error' in result
 
-    def test_conflict_modal_detected(self):
-        client, settings = _make_browser_client()
-        client._ensure_authenticated = MagicMock()
-        client._rate_limit = MagicMock()
-        client._add_human_behavior = MagicMock()
-        client._screenshot = MagicMock(return_value=None)
-
-        config_id = 'temple-court|||2026-02-21|||7:00 PM'
+    def test_conflict_modal_detected(self, client):
         client.page.url = ''
 
         # Time button found and clicked
-        btn = MagicMock()
-        btn.inner_text.return_value = '7:00 PM\nDining Room'
-        btn.is_disabled.return_value = False
-        client.page.locator.return_value.all.return_value = [btn]
+        client.page.locator.return_value.all.return_value = [make_button('7:00 PM\nDining Room')]
         client.page.locator.return_value.count.return_value = 0
         client.page.wait_for_selector = MagicMock()
         client.page.wait_for_function = MagicMock()
 
         # Reserve button in iframe
         frame = MagicMock()
-        frame_btn = MagicMock()
-        frame_btn.is_visible.return_value = True
-        frame_btn.is_disabled.return_value = False
+        frame_btn = make_button()
         frame.locator.return_value.count.return_value = 1
         frame.locator.return_value.first = frame_btn
         client.page.frames = [frame]
@@ -947,30 +898,23 @@ class TestMakeReservation:
         # mock it directly so we don't need to set up time.time() return values
         client._wait_for_in_frames = MagicMock(return_value=(frame_btn, frame))
 
-        with patch('utils.resy_browser_client.time'):
-            result = client.make_reservation(config_id, '2026-02-21', 2)
+        result = client.make_reservation(CONFIG_ID, TEST_DATE, 2)
 
         assert result['status'] == 'conflict'
         assert result['success'] is False
         assert 'options' in result
 
-    def test_uses_non_navigation_rate_limit(self):
-        client, _ = self._setup_reservation_client()
-        config_id = 'temple-court|||2026-02-21|||7:00 PM'
+    def test_uses_non_navigation_rate_limit(self, client):
         client.page.url = ''
 
         # Minimal setup to get past the button click
-        btn = MagicMock()
-        btn.inner_text.return_value = '7:00 PM\nDining Room'
-        btn.is_disabled.return_value = False
-        client.page.locator.return_value.all.return_value = [btn]
+        client.page.locator.return_value.all.return_value = [make_button('7:00 PM\nDining Room')]
         client.page.locator.return_value.count.return_value = 0
         client.page.wait_for_selector = MagicMock()
         client.page.wait_for_function = MagicMock()
         client.page.frames = []
 
-        with patch('utils.resy_browser_client.time'):
-            client.make_reservation(config_id, '2026-02-21', 2)
+        client.make_reservation(CONFIG_ID, TEST_DATE, 2)
 
         client._rate_limit.assert_called_once_with(navigation=False)
 
@@ -978,14 +922,11 @@ class TestMakeReservation:
 class TestCheckBookingConfirmation:
     """Test _check_booking_confirmation() confirmation detection."""
 
-    def test_confirmation_found(self):
-        client, _ = _make_browser_client()
+    def test_confirmation_found(self, make_browser_client):
+        client, _ = make_browser_client(page=MagicMock())
 
         # Confirm button found and clicked
-        confirm_btn = MagicMock()
-        confirm_btn.inner_text.return_value = 'Confirm'
-        confirm_btn.is_disabled.return_value = False
-        confirm_btn.scroll_into_view_if_needed = MagicMock()
+        confirm_btn = make_button('Confirm')
 
         # Final button on main page (none needed)
         main_locator = MagicMock()
@@ -994,32 +935,24 @@ class TestCheckBookingConfirmation:
         # Confirmation text found
         confirmation_locator = MagicMock()
 
-        call_count = [0]
-
-        def find_in_frames_side_effect(selectors, visible_only=False):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                # First call: looking for Confirm button
-                return (confirm_btn, MagicMock())
-            else:
-                # Second call: looking for confirmation text
-                return (confirmation_locator, MagicMock())
-
-        client._find_in_frames = MagicMock(side_effect=find_in_frames_side_effect)
+        # First lookup finds the Confirm button, the next the confirmation text
+        client._find_in_frames = MagicMock(side_effect=[
+            (confirm_btn, MagicMock()),
+            (confirmation_locator, MagicMock()),
+        ])
         client.page.locator.return_value.count.return_value = 0
 
-        with patch('utils.resy_browser_client.time'):
-            result = client._check_booking_confirmation(
-                'temple-court|||2026-02-21|||7:00 PM',
-                '2026-02-21', 2, 'temple-court', '7:00 PM'
-            )
+        result = client._check_booking_confirmation(
+            CONFIG_ID,
+            TEST_DATE, 2, 'temple-court', '7:00 PM'
+        )
 
         assert result['success'] is True
         assert result['reservation_id'] is not None
 
-    def test_no_confirmation_no_error(self):
-        client, _ = _make_browser_client()
-        client._screenshot = MagicMock()
+    def test_no_confirmation_no_error(self, make_browser_client):
+        client, _ = make_browser_client(page=MagicMock())
+        client._screenshot = _noop
 
         # No confirm button, no confirmation, no error
         client._find_in_frames = MagicMock(return_value=None)
@@ -1029,51 +962,42 @@ class TestCheckBookingConfirmation:
         client.page.locator.return_value = main_locator
         client.page.locator.return_value.all.return_value = []
 
-        with patch('utils.resy_browser_client.time'):
-            result = client._check_booking_confirmation(
-                'test|||2026-02-21|||7:00 PM',
-                '2026-02-21', 2, 'test', '7:00 PM'
-            )
+        result = client._check_booking_confirmation(
+            TEST_CONFIG_ID,
+            TEST_DATE, 2, 'test', '7:00 PM'
+        )
 
         assert result['success'] is True
         assert result['status'] == 'unconfirmed'
 
-    def test_error_message_raises(self):
-        client, _ = _make_browser_client()
-        client._screenshot = MagicMock()
+    def test_error_message_raises(self, make_browser_client):
+        client, _ = make_browser_client(page=MagicMock())
+        client._screenshot = _noop
 
         # No confirm button, no confirmation
         client._find_in_frames = MagicMock(return_value=None)
 
         # Error message found
-        error_locator = MagicMock()
-        error_locator.count.return_value = 0  # default
-
-        def locator_side_effect(sel):
-            mock = MagicMock()
-            if 'reservation failed' in sel:
-                mock.count.return_value = 1
-                mock.first.inner_text.return_value = 'reservation failed'
-            else:
-                mock.count.return_value = 0
-                mock.all.return_value = []
-            return mock
-
-        client.page.locator.side_effect = locator_side_effect
+        client.page.locator.side_effect = make_selector_router(
+            {'reservation failed': {
+                'count.return_value': 1,
+                'first.inner_text.return_value': 'reservation failed',
+            }},
+            default={'count.return_value': 0, 'all.return_value': []},
+        )
 
-        with patch('utils.resy_browser_client.time'):
-            with pytest.raises(Exception, match="Booking failed"):
-                client._check_booking_confirmation(
-                    'test|||2026-02-21|||7:00 PM',
-                    '2026-02-21', 2, 'test', '7:00 PM'
-                )
+        with pytest.raises(Exception, match="Booking failed"):
+            client._check_booking_confirmation(
+                TEST_CONFIG_ID,
+                TEST_DATE, 2, 'test', '7:00 PM'
+            )
 
 
 class TestResolveReservationConflict:
     """Test resolve_reservation_conflict() choice handling."""
 
-    def test_keep_existing(self):
-        client, _ = _make_browser_client()
+    def test_keep_existing(self, make_browser_client):
+        client, _ = make_browser_client()
         keep_btn = MagicMock()
         client._find_in_frames = MagicMock(return_value=(keep_btn, MagicMock()))
 
@@ -1083,31 +1007,27 @@ class TestResolveReservationConflict:
         assert result['status'] == 'kept_existing'
         keep_btn.click.assert_called_once()
 
-    def test_continue_booking(self):
-        client, _ = _make_browser_client()
+    def test_continue_booking(self, make_browser_client):
+        client, _ = make_browser_client()
         continue_btn = MagicMock()
         client._find_in_frames = MagicMock(return_value=(continue_btn, MagicMock()))
-        client._check_booking_confirmation = MagicMock(return_value={
-            'success': True,
-            'reservation_id': 'resy-test-2026-02-21',
-        })
-
-        with patch('utils.resy_browser_client.time'):
-            result = client.resolve_reservation_conflict(
-                'continue_booking',
-                config_id='test|||2026-02-21|||7:00 PM',
-                date='2026-02-21',
-                party_size=2,
-                venue_slug='test',
-                time_text='7:00 PM'
-            )
+        client._check_booking_confirmation = MagicMock(return_value=BOOKED)
+
+        result = client.resolve_reservation_conflict(
+            'continue_booking',
+            config_id=TEST_CONFIG_ID,
+            date=TEST_DATE,
+            party_size=2,
+            venue_slug='test',
+            time_text='7:00 PM'
+        )
 
         assert result['success'] is True
         continue_btn.click.assert_called_once()
         client._check_booking_confirmation.assert_called_once()
 
-    def test_invalid_choice(self):
-        client, _ = _make_browser_client()
+    def test_invalid_choice(self, make_browser_client):
+        client, _ = make_browser_client()
 
         result = client.resolve_reservation_conflict('invalid_choice')
 
@@ -1139,9 +1059,9 @@ class TestModalOpenedReturn:
 class TestClickFallbacks:
     """Test click fallback strategies in make_reservation booking flow."""
 
-    def test_click_fallback_to_force_click(self):
+    def test_click_fallback_to_force_click(self, make_browser_client):
         """When Playwright click fails, falls back to force click."""
-        client, _ = _make_browser_client()
+        client, _ = make_browser_client()
 
         # Simulate a button where normal click throws but force click works
         btn = MagicMock()
@@ -1188,32 +1108,26 @@ class TestClickFallbacks:
 class TestWaitForInFrames:
     """Test _wait_for_in_frames() polling helper."""
 
-    @patch('utils.resy_browser_client.time')
-    def test_wait_for_in_frames_timeout(self, mock_time):
+    def test_wait_for_in_frames_timeout(self, make_browser_client):
         """Polling loop returns None after timeout when element not found."""
-        client, _ = _make_browser_client()
-        client._find_in_frames = MagicMock(return_value=None)
-
         # Simulate time progression past deadline
-        mock_time.time.side_effect = [100.0, 100.5, 101.0, 111.0]
-        mock_time.sleep = MagicMock()
+        clock = iter([100.0, 100.5, 101.0, 111.0])
+        client, _ = make_browser_client(_now=lambda: next(clock))
+        client._find_in_frames = MagicMock(return_value=None)
 
         result = client._wait_for_in_frames(['.some-selector'], timeout=10)
 
         assert result is None
         assert client._find_in_frames.call_count >= 2
 
-    @patch('utils.resy_browser_client.time')
-    def test_wait_for_in_frames_found(self, mock_time):
+    def test_wait_for_in_frames_found(self, make_browser_client):
         """Polling loop returns element+frame when found."""
-        client, _ = _make_browser_client()
+        clock = iter([100.0, 100.5, 101.0])
+        client, _ = make_browser_client(_now=lambda: next(clock))
         expected = (MagicMock(), MagicMock())
         # Not found on first call, found on second
         client._find_in_frames = MagicMock(side_effect=[None, expected])
 
-        mock_time.time.side_effect = [100.0, 100.5, 101.0]
-        mock_time.sleep = MagicMock()
-
         result = client._wait_for_in_frames(['.some-selector'], timeout=10)
 
         assert result is expected
@@ -1223,16 +1137,13 @@ class TestWaitForInFrames:
 class TestNeighborhoodMapPanIntegration:
     """Test that search_by_cuisine calls _pan_map_to_neighborhood correctly."""
 
-    @patch('utils.resy_browser_client.time')
-    def test_calls_pan_map_for_neighborhood(self, mock_time):
+    def test_calls_pan_map_for_neighborhood(self, make_browser_client):
         """When neighborhood is specified, _pan_map_to_neighborhood should be called."""
-        mock_time.time.return_value = 0
-        mock_time.sleep = MagicMock()
-        client, _ = _make_browser_client()
+        client, _ = make_browser_client(page=MagicMock())
 
         client.page.goto = MagicMock()
         client.page.wait_for_function = MagicMock()
-        client.page.locator = MagicMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+        install_page_buttons(client)
         client._ensure_authenticated = MagicMock()
         client._rate_limit = MagicMock()
         client._add_human_behavior = MagicMock()
@@ -1241,17 +1152,18 @@ class TestNeighborhoodMapPanIntegration:
         client.search_by_cuisine(cuisine='Italian', neighborhood='Upper East Side', location='ny')
 
         client._pan_map_to_neighborhood.assert_called_once_with('Upper East Side', 'ny')
+        # Neighborhood is never added to the URL; only the cuisine facet is
+        url = client.page.goto.call_args.args[0]
+        assert url.endswith('&facet=cuisine:Italian')
+        assert 'neighborhood' not in url
 
-    @patch('utils.resy_browser_client.time')
-    def test_no_pan_map_without_neighborhood(self, mock_time):
+    def test_no_pan_map_without_neighborhood(self, make_browser_client):
         """Without neighborhood, _pan_map_to_neighborhood should NOT be called."""
-        mock_time.time.return_value = 0
-        mock_time.sleep = MagicMock()
-        client, _ = _make_browser_client()
+        client, _ = make_browser_client(page=MagicMock())
 
         client.page.goto = MagicMock()
         client.page.wait_for_function = MagicMock()
-        client.page.locator = MagicMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+        install_page_buttons(client)
         client._ensure_authenticated = MagicMock()
         client._rate_limit = MagicMock()
         client._add_human_behavior = MagicMock()
@@ -1265,9 +1177,9 @@ class TestNeighborhoodMapPanIntegration:
 class TestPanMapToNeighborhood:
     """Test map panning for neighborhood-targeted search."""
 
-    def test_pan_map_uses_js_evaluate(self):
+    def test_pan_map_uses_js_evaluate(self, make_browser_client, stub_find_element):
         """Map should be panned via page.evaluate (Google Maps JS API)."""
-        client, _ = _make_browser_client()
+        client, _ = make_browser_client(page=MagicMock())
 
         mock_map = MagicMock()
         mock_map.count.return_value = 1
@@ -1276,14 +1188,13 @@ class TestPanMapToNeighborhood:
         client.page.evaluate = MagicMock(return_value='react_state')
         mock_search_btn = MagicMock()
 
-        with patch('utils.resy_browser_client.SelectorHelper') as mock_helper:
-            mock_helper.find_element.side_effect = [
-                mock_map,        # MAP_CONTAINER
-                mock_search_btn, # SEARCH_HERE_BUTTON
-            ]
-            client.page.wait_for_function = MagicMock()
+        stub_find_element(
+            mock_map,        # MAP_CONTAINER
+            mock_search_btn, # SEARCH_HERE_BUTTON
+        )
+        client.page.wait_for_function = MagicMock()
 
-            result = client._pan_map_to_neighborhood('Upper East Side')
+        result = client._pan_map_to_neighborhood('Upper East Side')
 
         assert result is True
         # Verify JS evaluate was called: first for pan, second for re-firing events
@@ -1292,9 +1203,9 @@ class TestPanMapToNeighborhood:
         coords = call_args[0][1]  # second positional arg: [lat, lng]
         assert 40.76 < coords[0] < 40.79  # UES latitude
 
-    def test_pan_map_falls_back_to_drag(self):
+    def test_pan_map_falls_back_to_drag(self, make_browser_client, stub_find_element):
         """When JS pan returns None, should fall back to mouse drag."""
-        client, _ = _make_browser_client()
+        client, _ = make_browser_client(page=MagicMock())
 
         mock_map = MagicMock()
         mock_map.count.return_value = 1
@@ -1306,49 +1217,46 @@ class TestPanMapToNeighborhood:
         client.page.evaluate = MagicMock(return_value=None)
         mock_search_btn = MagicMock()
 
-        with patch('utils.resy_browser_client.SelectorHelper') as mock_helper:
-            mock_helper.find_element.side_effect = [mock_map, mock_search_btn]
-            client.page.wait_for_function = MagicMock()
+        stub_find_element(mock_map, mock_search_btn)
+        client.page.wait_for_function = MagicMock()
 
-            result = client._pan_map_to_neighborhood('Williamsburg')
+        result = client._pan_map_to_neighborhood('Williamsburg')
 
         assert result is True
         # Verify mouse drag fallback was used
         client.page.mouse.down.assert_called_once()
         client.page.mouse.up.assert_called_once()
 
-    def test_pan_map_clicks_search_here(self):
+    def test_pan_map_clicks_search_here(self, make_browser_client, stub_find_element):
         """'Search Here' button should be clicked after panning."""
-        client, _ = _make_browser_client()
+        client, _ = make_browser_client(page=MagicMock())
 
         mock_map = MagicMock()
         mock_map.count.return_value = 1
         client.page.evaluate = MagicMock(return_value='react_state')
         mock_search_btn = MagicMock()
 
-        with patch('utils.resy_browser_client.SelectorHelper') as mock_helper:
-            mock_helper.find_element.side_effect = [mock_map, mock_search_btn]
-            client.page.wait_for_function = MagicMock()
+        stub_find_element(mock_map, mock_search_btn)
+        client.page.wait_for_function = MagicMock()
 
-            client._pan_map_to_neighborhood('Williamsburg')
+        client._pan_map_to_neighborhood('Williamsburg')
 
         mock_search_btn.click.assert_called_once()
 
-    def test_pan_map_unknown_neighborhood_returns_false(self):
+    def test_pan_map_unknown_neighborhood_returns_false(self, make_browser_client):
         """Unknown neighborhood should return False without touching the map."""
-        client, _ = _make_browser_client()
+        client, _ = make_browser_client()
 
         result = client._pan_map_to_neighborhood('Narnia')
         assert result is False
 
-    def test_pan_map_no_map_element_returns_false(self):
+    def test_pan_map_no_map_element_returns_false(self, make_browser_client, stub_find_element):
         """If map element can't be found, should return False."""
-        client, _ = _make_browser_client()
+        client, _ = make_browser_client()
 
-        with patch('utils.resy_browser_client.SelectorHelper') as mock_helper:
-            mock_helper.find_element.return_value = None
+        stub_find_element(None)
 
-            result = client._pan_map_to_neighborhood('SoHo')
+        result = client._pan_map_to_neighborhood('SoHo')
 
         assert result is False
 
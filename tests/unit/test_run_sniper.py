@@ -0,0 +1,116 @@
+"""Unit tests for the run_sniper CLI."""
+
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import scripts.run_sniper as cli
+
+
+class TestRunSniperCli:
+    """Test subcommand dispatch."""
+
+    def _main(self, *argv):
+        """Invoke main() with the given command-line arguments."""
+        with patch.object(sys, 'argv', ['run_sniper.py', *argv]), \
+             patch.object(cli, 'setup_logging'):
+            cli.main()
+
+    @patch('scripts.sniper_worker.main')
+    def test_daemon_runs_worker_loop(self, mock_worker_main):
+        """--daemon hands off to the resident sniper_worker loop."""
+        self._main('--daemon')
+        mock_worker_main.assert_called_once()
+
+    def test_cron_runs_single_tick(self):
+        """--cron processes due jobs once."""
+        mock_cron = MagicMock()
+        with patch.dict(cli.MODE_COMMANDS, {'cron': mock_cron}):
+            self._main('--cron')
+        mock_cron.assert_called_once()
+
+    def test_mode_flags_dispatch_in_priority_order(self):
+        """The first mode flag set wins, as with the old if/elif chain."""
+        mock_cron, mock_list = MagicMock(), MagicMock()
+        with patch.dict(cli.MODE_COMMANDS, {'cron': mock_cron, 'list': mock_list}):
+            self._main('--list', '--cron')
+
+        mock_cron.assert_called_once()
+        mock_list.assert_not_called()
+
+    @patch('scripts.run_sniper.cmd_create_and_run')
+    def test_positional_args_create_job(self, mock_create):
+        """Venue and date without a mode flag create a job."""
+        self._main('fish-cheeks', '2026-03-01', '7:00 PM')
+
+        args = mock_create.call_args.args[0]
+        assert (args.venue_slug, args.date, args.times) == ('fish-cheeks', '2026-03-01', ['7:00 PM'])
+
+    def test_no_command_prints_help(self):
+        """No mode flag and no job args exits with usage."""
+        with pytest.raises(SystemExit) as exc:
+            self._main()
+
+        assert exc.value.code == 1
+
+    @patch('utils.reservation_sniper.ReservationSniper')
+    def test_cron_imports_sniper_on_demand(self, mock_sniper_cls):
+        """cmd_cron resolves ReservationSniper at call time."""
+        sniper = mock_sniper_cls.return_value.__enter__.return_value
+        sniper.run_scheduled_jobs.return_value = {'jobs_run': 0, 'results': {}}
+
+        with patch.object(cli, '_clear_session_for_proxy'):
+            cli.cmd_cron(MagicMock())
+
+        sniper.run_scheduled_jobs.assert_called_once()
+
+    def test_import_skips_sniper_and_http_stack(self):
+        """Importing the CLI (the --list/--cancel path) stays lightweight."""
+        project_root = Path(__file__).parents[2]
+        code = (
+            "import sys, scripts.run_sniper; "
+            "heavy = {'utils.reservation_sniper', 'requests', 'anthropic'} & set(sys.modules); "
+            "sys.exit(','.join(sorted(heavy)) or None)"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=project_root, capture_output=True, text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
+
+    @patch('scripts.run_sniper.ReservationStore')
+    def test_list_prints_table(self, mock_store_cls, capsys):
+        """--list writes a header, separator and one row per job."""
+        store = mock_store_cls.return_value.__enter__.return_value
+        store.get_sniper_job_columns.return_value = {
+            'id': [1, 2],
+            'status': ['pending', 'failed'],
+            'venue_slug': ['fish-cheeks', 'carbone'],
+            'date': ['2026-03-01', '2026-03-02'],
+            'preferred_times': [['7:00 PM'], []],
+            'scheduled_at': ['2026-02-22T09:00:00', '2026-02-23T09:00:00'],
+            'poll_count': [0, 60],
+            'max_attempts': [60, 60],
+        }
+
+        self._main('--list')
+
+        lines = capsys.readouterr().out.splitlines()
+        mock_store_cls.assert_called_once_with(readonly=True)
+        assert len(lines) == 4
+        assert lines[0].split()[:2] == ['ID', 'Status']
+        assert 'fish-cheeks' in lines[2] and '7:00 PM' in lines[2]
+        assert '(any)' in lines[3] and lines[3].endswith('60/60')
+
+    @patch('scripts.run_sniper.ReservationStore')
+    def test_list_empty(self, mock_store_cls, capsys):
+        """--list with no jobs prints a placeholder."""
+        store = mock_store_cls.return_value.__enter__.return_value
+        store.get_sniper_job_columns.return_value = {c: [] for c in cli.LIST_COLUMNS}
+
+        self._main('--list')
+
+        assert capsys.readouterr().out == "No sniper jobs found.\n"
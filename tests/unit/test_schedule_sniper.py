@@ -1,7 +1,9 @@
 """Unit tests for _schedule_sniper in ReservationAgent."""
 
+import json
 import subprocess
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
 
@@ -63,8 +65,11 @@ class TestScheduleSniper:
         assert "'7:00 PM; rm -rf /'" in remote_part
         # Restaurant name with apostrophe is normalized to a slug
         assert "obriens" in remote_part
-        # Verify the command uses ssh
+        # Verify the command uses ssh over a shared multiplexed connection
         assert cmd[0] == "ssh"
+        assert "ControlMaster=auto" in cmd
+        assert "ControlPath=~/.ssh/cm-%C" in cmd
+        assert cmd[-2] == 'root@server'
 
     @patch('subprocess.run')
     def test_ssh_success_returns_result(self, mock_run):
@@ -121,6 +126,34 @@ class TestScheduleSniper:
         assert result['success'] is False
         assert 'Permission denied' in result['error']
 
+    @patch('subprocess.run')
+    def test_ssh_connection_failure_is_reported_separately(self, mock_run):
+        """ssh's own exit status 255 is reported as a connection failure."""
+        agent = _make_agent()
+
+        mock_run.return_value = MagicMock(
+            returncode=255, stdout='', stderr='ssh: connect to host server port 22: Connection refused'
+        )
+
+        with patch('agents.reservation_agent.Settings') as S:
+            S.SNIPER_REMOTE_HOST = 'root@server'
+            S.SNIPER_REMOTE_DIR = '/root/ai-agents'
+            S.DEFAULT_PARTY_SIZE = 2
+
+            result = agent._schedule_sniper({
+                'restaurant': 'fish-cheeks',
+                'date': '2026-03-01',
+                'preferred_time': '7:00 PM',
+                'drop_time': '2026-02-22T09:00:00',
+            })
+
+        assert result['success'] is False
+        assert result['error'].startswith('SSH connection failed')
+        # Non-interactive with a bounded connect time, so a dead host can't hang the agent
+        cmd = mock_run.call_args[0][0]
+        assert 'BatchMode=yes' in cmd
+        assert 'ConnectTimeout=5' in cmd
+
     @patch('subprocess.run')
     def test_ssh_timeout_returns_error(self, mock_run):
         """Test SSH timeout returns error result."""
@@ -225,3 +258,187 @@ class TestScheduleSniper:
         assert result['venue_slug'] == 'fish-cheeks'
         remote_cmd = mock_run.call_args[0][0][-1]
         assert 'fish-cheeks' in remote_cmd
+
+
+def _sniper_input(restaurant):
+    """Build a schedule_sniper tool input for restaurant."""
+    return {
+        'restaurant': restaurant,
+        'date': '2026-03-01',
+        'preferred_time': '7:00 PM',
+        'drop_time': '2026-02-22T09:00:00',
+    }
+
+
+class TestScheduleRemoteSnipers:
+    """Test batching several remote sniper jobs into one SSH session."""
+
+    @patch('subprocess.run')
+    def test_batch_runs_one_ssh_exec_with_per_job_results(self, mock_run):
+        """Each job gets its own result from a single ssh call."""
+        agent = _make_agent()
+        agent.store.add_sniper_job.return_value = 7
+
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='Sniper job #1 scheduled\n__SNIPER_EXIT__0\nError: unknown venue\n__SNIPER_EXIT__1\n',
+            stderr='',
+        )
+
+        with patch('agents.reservation_agent.Settings') as S:
+            S.SNIPER_REMOTE_HOST = 'root@server'
+            S.SNIPER_REMOTE_DIR = '/root/ai-agents'
+            S.DEFAULT_PARTY_SIZE = 2
+
+            results = agent._schedule_remote_snipers([
+                _sniper_input('fish-cheeks'),
+                _sniper_input('not-a-venue'),
+            ])
+
+        mock_run.assert_called_once()
+        remote_cmd = mock_run.call_args[0][0][-1]
+        assert remote_cmd.count('scripts/run_sniper.py') == 2
+
+        assert results[0]['success'] is True
+        assert results[0]['job_id'] == 7
+        assert 'Sniper job #1' in results[0]['message']
+        assert results[1]['success'] is False
+        assert 'unknown venue' in results[1]['error']
+        # Only the successful job is recorded locally
+        agent.store.add_sniper_job.assert_called_once()
+
+    @patch('subprocess.run')
+    def test_batch_connection_failure_fails_every_job(self, mock_run):
+        """A connection failure before any job ran is reported for all of them."""
+        agent = _make_agent()
+
+        mock_run.return_value = MagicMock(
+            returncode=255, stdout='', stderr='Connection refused'
+        )
+
+        with patch('agents.reservation_agent.Settings') as S:
+            S.SNIPER_REMOTE_HOST = 'root@server'
+            S.SNIPER_REMOTE_DIR = '/root/ai-agents'
+            S.DEFAULT_PARTY_SIZE = 2
+
+            results = agent._schedule_remote_snipers([
+                _sniper_input('fish-cheeks'),
+                _sniper_input('carbone'),
+            ])
+
+        assert [r['success'] for r in results] == [False, False]
+        assert all(r['error'].startswith('SSH connection failed') for r in results)
+        agent.store.add_sniper_job.assert_not_called()
+
+    @patch('subprocess.run')
+    def test_batch_timeout_keeps_jobs_that_finished(self, mock_run):
+        """Jobs that finished before a timeout are recorded; only the rest time out."""
+        agent = _make_agent()
+        agent.store.add_sniper_job.return_value = 7
+
+        mock_run.side_effect = subprocess.TimeoutExpired(
+            cmd='ssh', timeout=17, output=b'Sniper job #1 scheduled\n__SNIPER_EXIT__0\nConnecting'
+        )
+
+        with patch('agents.reservation_agent.Settings') as S:
+            S.SNIPER_REMOTE_HOST = 'root@server'
+            S.SNIPER_REMOTE_DIR = '/root/ai-agents'
+            S.DEFAULT_PARTY_SIZE = 2
+
+            results = agent._schedule_remote_snipers([
+                _sniper_input('fish-cheeks'),
+                _sniper_input('carbone'),
+            ])
+
+        assert results[0]['success'] is True
+        assert results[0]['job_id'] == 7
+        assert results[1] == {'success': False, 'error': 'SSH connection timed out'}
+        agent.store.add_sniper_job.assert_called_once()
+
+    @patch('subprocess.run')
+    def test_batch_record_failure_is_not_retried(self, mock_run):
+        """A job that ran remotely but failed to record locally is reported, not rescheduled."""
+        agent = _make_agent()
+        agent.store.add_sniper_job.side_effect = [7, RuntimeError('database is locked')]
+
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='Sniper job #1 scheduled\n__SNIPER_EXIT__0\nSniper job #2 scheduled\n__SNIPER_EXIT__0\n',
+            stderr='',
+        )
+
+        with patch('agents.reservation_agent.Settings') as S:
+            S.SNIPER_REMOTE_HOST = 'root@server'
+            S.SNIPER_REMOTE_DIR = '/root/ai-agents'
+            S.DEFAULT_PARTY_SIZE = 2
+
+            results = agent._schedule_remote_snipers([
+                _sniper_input('fish-cheeks'),
+                _sniper_input('carbone'),
+            ])
+
+        mock_run.assert_called_once()
+        assert results[0]['success'] is True
+        assert results[1]['success'] is False
+        assert 'database is locked' in results[1]['error']
+
+    @pytest.mark.parametrize('names, batched', [
+        (['schedule_sniper'], False),
+        (['schedule_sniper', 'view_sniper_jobs'], False),
+        (['schedule_sniper', 'schedule_sniper'], True),
+    ])
+    def test_batch_only_for_multiple_sniper_calls(self, names, batched):
+        """Only responses with two or more schedule_sniper calls are batched."""
+        agent = _make_agent()
+        content = [
+            SimpleNamespace(type='tool_use', name=name, id=f'tool-{i}', input=_sniper_input('carbone'))
+            for i, name in enumerate(names)
+        ]
+        agent._schedule_remote_snipers = MagicMock(
+            side_effect=lambda inputs: [{'success': True}] * len(inputs)
+        )
+
+        with patch('agents.reservation_agent.Settings') as S:
+            S.SNIPER_REMOTE_HOST = 'root@server'
+            prefetched = agent._batch_remote_snipers(content)
+
+        assert agent._schedule_remote_snipers.called is batched
+        assert sorted(prefetched) == (['tool-0', 'tool-1'] if batched else [])
+
+    @patch('subprocess.run')
+    def test_run_batches_sniper_calls_from_one_response(self, mock_run):
+        """Two schedule_sniper calls in one response share one ssh exec and get their own results."""
+        agent = _make_agent()
+        agent.store.add_sniper_job.side_effect = [7, 8]
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='Sniper job #1 scheduled\n__SNIPER_EXIT__0\nSniper job #2 scheduled\n__SNIPER_EXIT__0\n',
+            stderr='',
+        )
+        agent.call_claude = MagicMock(side_effect=[
+            SimpleNamespace(stop_reason='tool_use', content=[
+                SimpleNamespace(type='tool_use', name='schedule_sniper', id='tool-0',
+                                input=_sniper_input('fish-cheeks')),
+                SimpleNamespace(type='tool_use', name='schedule_sniper', id='tool-1',
+                                input=_sniper_input('carbone')),
+            ]),
+            SimpleNamespace(stop_reason='end_turn', content=[SimpleNamespace(type='text', text='Both scheduled.')]),
+        ])
+        events = []
+
+        with patch('agents.reservation_agent.Settings') as S:
+            S.SNIPER_REMOTE_HOST = 'root@server'
+            S.SNIPER_REMOTE_DIR = '/root/ai-agents'
+            S.DEFAULT_PARTY_SIZE = 2
+
+            answer = agent.run('Snipe both', event_callback=lambda kind, data: events.append(kind))
+
+        assert answer == 'Both scheduled.'
+        mock_run.assert_called_once()
+
+        tool_results = agent.conversation_history[2]['content']
+        assert [r['tool_use_id'] for r in tool_results] == ['tool-0', 'tool-1']
+        assert [json.loads(r['content'])['job_id'] for r in tool_results] == [7, 8]
+        # Both calls are announced before either result is reported
+        assert events.index('tool_result') > max(i for i, kind in enumerate(events) if kind == 'tool_call')
+        assert events.count('tool_call') == 2
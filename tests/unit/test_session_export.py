@@ -1,28 +1,21 @@
 """Unit tests for Resy session export (storage state persistence)."""
 
 import json
-import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch, call
 
 import pytest
 
+from utils.resy_browser_client import ResyBrowserClient
+
 
 class TestGetStorageStatePath:
     """Test ResyBrowserClient._get_storage_state_path()."""
 
     def _make_client(self, storage_state_file):
-        """Create a minimal client with patched storage_state_file."""
-        with patch('utils.resy_browser_client.Settings') as mock_settings:
-            mock_settings.RESY_BROWSER_EMAIL = 'test@test.com'
-            mock_settings.RESY_BROWSER_PASSWORD = 'password'
-            mock_settings.RESY_RATE_LIMIT_MIN_SECONDS = 6
-            mock_settings.RESY_PROXY_SERVER = None
-            mock_settings.RESY_PROXY_USERNAME = None
-            mock_settings.RESY_PROXY_PASSWORD = None
-            from utils.resy_browser_client import ResyBrowserClient
-            client = ResyBrowserClient.__new__(ResyBrowserClient)
-            client.storage_state_file = storage_state_file
+        """Create a minimal client with only storage_state_file set."""
+        client = ResyBrowserClient.__new__(ResyBrowserClient)
+        client.storage_state_file = storage_state_file
         return client
 
     def test_returns_path_when_valid_json_exists(self, tmp_path):
@@ -51,15 +44,7 @@ class TestSaveSession:
 
     def test_calls_storage_state_on_context(self):
         """_save_session calls context.storage_state(path=...) and writes cookies."""
-        with patch('utils.resy_browser_client.Settings') as mock_settings:
-            mock_settings.RESY_BROWSER_EMAIL = 'test@test.com'
-            mock_settings.RESY_BROWSER_PASSWORD = 'password'
-            mock_settings.RESY_RATE_LIMIT_MIN_SECONDS = 6
-            mock_settings.RESY_PROXY_SERVER = None
-            mock_settings.RESY_PROXY_USERNAME = None
-            mock_settings.RESY_PROXY_PASSWORD = None
-            from utils.resy_browser_client import ResyBrowserClient
-            client = ResyBrowserClient.__new__(ResyBrowserClient)
+        client = ResyBrowserClient.__new__(ResyBrowserClient)
 
         client.storage_state_file = Path('/tmp/test_storage_state.json')
         client.cookie_file = Path('/tmp/test_cookies.json')
@@ -89,7 +74,6 @@ class TestLaunchBrowserStorageState:
         mock_settings.RESY_PROXY_PASSWORD = None
         mock_settings.has_proxy_configured.return_value = False
 
-        from utils.resy_browser_client import ResyBrowserClient
         client = ResyBrowserClient.__new__(ResyBrowserClient)
         client.headless = True
         client.storage_state_file = Path('/tmp/fake_state.json')
@@ -126,7 +110,6 @@ class TestLaunchBrowserStorageState:
         mock_settings.RESY_PROXY_PASSWORD = None
         mock_settings.has_proxy_configured.return_value = False
 
-        from utils.resy_browser_client import ResyBrowserClient
         client = ResyBrowserClient.__new__(ResyBrowserClient)
         client.headless = True
         client.storage_state_file = Path('/tmp/fake_state.json')
@@ -155,15 +138,7 @@ class TestEnsureAuthenticatedPrefersStorageState:
 
     def test_skips_cookie_loading_when_storage_state_exists(self):
         """When storage state file exists, cookie loading is skipped."""
-        with patch('utils.resy_browser_client.Settings') as mock_settings:
-            mock_settings.RESY_BROWSER_EMAIL = 'test@test.com'
-            mock_settings.RESY_BROWSER_PASSWORD = 'password'
-            mock_settings.RESY_RATE_LIMIT_MIN_SECONDS = 6
-            mock_settings.RESY_PROXY_SERVER = None
-            mock_settings.RESY_PROXY_USERNAME = None
-            mock_settings.RESY_PROXY_PASSWORD = None
-            from utils.resy_browser_client import ResyBrowserClient
-            client = ResyBrowserClient.__new__(ResyBrowserClient)
+        client = ResyBrowserClient.__new__(ResyBrowserClient)
 
         client.is_authenticated = False
         client.page = MagicMock()  # Already launched
@@ -183,15 +158,7 @@ class TestEnsureAuthenticatedPrefersStorageState:
 
     def test_falls_back_to_cookies_when_no_storage_state(self):
         """When no storage state, falls back to cookie loading."""
-        with patch('utils.resy_browser_client.Settings') as mock_settings:
-            mock_settings.RESY_BROWSER_EMAIL = 'test@test.com'
-            mock_settings.RESY_BROWSER_PASSWORD = 'password'
-            mock_settings.RESY_RATE_LIMIT_MIN_SECONDS = 6
-            mock_settings.RESY_PROXY_SERVER = None
-            mock_settings.RESY_PROXY_USERNAME = None
-            mock_settings.RESY_PROXY_PASSWORD = None
-            from utils.resy_browser_client import ResyBrowserClient
-            client = ResyBrowserClient.__new__(ResyBrowserClient)
+        client = ResyBrowserClient.__new__(ResyBrowserClient)
 
         client.is_authenticated = False
         client.page = MagicMock()
@@ -3,7 +3,20 @@ Utilities Package
 Shared utilities for all agents.
 """
 
-from .web_search import BraveSearch
-from .email_sender import EmailSender
+import importlib
 
 __all__ = ['BraveSearch', 'EmailSender']
+
+# Loaded on first access so importing a lightweight submodule (e.g.
+# utils.reservation_store from a cron tick) doesn't pull in requests.
+_LAZY_EXPORTS = {
+    'BraveSearch': '.web_search',
+    'EmailSender': '.email_sender',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,12 +2,27 @@
 
 import re
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
+# numpy is optional — only used to vectorize scoring on very large slot lists
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
+# Below this many slot x preferred-time pairs the scalar loop is faster
+# than building arrays
+_VECTORIZE_MIN_PAIRS = 256
+
+
+@lru_cache(maxsize=1024)
 def parse_time(time_str: str) -> Optional[datetime]:
     """Parse a time string like '7:00 PM' into a datetime (date part is today).
 
+    Results are memoized: sniper polls re-parse the same handful of slot
+    and preferred time strings on every attempt.
+
     Args:
         time_str: Time in "H:MM AM/PM" or "HH:MM AM/PM" format
 
@@ -23,10 +38,58 @@ def parse_time(time_str: str) -> Optional[datetime]:
     return None
 
 
-def _time_distance_minutes(t1: datetime, t2: datetime) -> int:
-    """Absolute distance in minutes between two times (ignoring date)."""
-    delta = abs((t1.hour * 60 + t1.minute) - (t2.hour * 60 + t2.minute))
-    return delta
+@lru_cache(maxsize=1024)
+def _minute_of_day(time_str: str) -> Optional[int]:
+    """Minutes since midnight for a time string, or None if unparseable."""
+    parsed = parse_time(time_str)
+    if parsed is None:
+        return None
+    return parsed.hour * 60 + parsed.minute
+
+
+def _preferred_minutes(preferred_times: List[str]) -> List[int]:
+    """Parse preferred times once per call, dropping unparseable entries."""
+    minutes = (_minute_of_day(t) for t in preferred_times)
+    return [m for m in minutes if m is not None]
+
+
+def _filter_vectorized(
+    parsed_slots: List[Tuple[Dict, int]],
+    pref_minutes: List[int],
+    window_minutes: int
+) -> List[Dict]:
+    """NumPy version of the filter_slots_by_time scoring loop.
+
+    Uses a stable sort so ties keep their original slot order, matching
+    the scalar path exactly.
+    """
+    slot_arr = np.fromiter((m for _, m in parsed_slots), dtype=np.int32, count=len(parsed_slots))
+    pref_arr = np.asarray(pref_minutes, dtype=np.int32)
+
+    distances = np.abs(slot_arr[:, None] - pref_arr[None, :]).min(axis=1)
+    in_window = np.flatnonzero(distances <= window_minutes)
+    order = in_window[np.argsort(distances[in_window], kind='stable')]
+    return [parsed_slots[i][0] for i in order]
+
+
+def _pick_vectorized(slots: List[Dict], pref_minutes: List[int]) -> Dict:
+    """NumPy version of the pick_best_slot scan.
+
+    argmin returns the first minimum, so ties go to the earliest slot,
+    matching the scalar path exactly.
+    """
+    parsed = [
+        (i, m) for i, m in enumerate(_minute_of_day(slot.get('time', '')) for slot in slots)
+        if m is not None
+    ]
+    if not parsed:
+        return slots[0]
+
+    slot_arr = np.fromiter((m for _, m in parsed), dtype=np.int32, count=len(parsed))
+    pref_arr = np.asarray(pref_minutes, dtype=np.int32)
+
+    distances = np.abs(slot_arr[:, None] - pref_arr[None, :]).min(axis=1)
+    return slots[parsed[int(distances.argmin())][0]]
 
 
 def filter_slots_by_time(
@@ -50,19 +113,23 @@ def filter_slots_by_time(
     if not preferred_times:
         return list(slots)
 
-    parsed_prefs = [parse_time(t) for t in preferred_times]
-    parsed_prefs = [t for t in parsed_prefs if t is not None]
+    pref_minutes = _preferred_minutes(preferred_times)
 
-    if not parsed_prefs:
+    if not pref_minutes:
         return list(slots)
 
-    scored = []
+    parsed_slots = []
     for slot in slots:
-        slot_time = parse_time(slot.get('time', ''))
-        if slot_time is None:
-            continue
+        slot_minute = _minute_of_day(slot.get('time', ''))
+        if slot_minute is not None:
+            parsed_slots.append((slot, slot_minute))
+
+    if np is not None and len(parsed_slots) * len(pref_minutes) >= _VECTORIZE_MIN_PAIRS:
+        return _filter_vectorized(parsed_slots, pref_minutes, window_minutes)
 
-        min_dist = min(_time_distance_minutes(slot_time, p) for p in parsed_prefs)
+    scored = []
+    for slot, slot_minute in parsed_slots:
+        min_dist = min(abs(slot_minute - p) for p in pref_minutes)
         if min_dist <= window_minutes:
             scored.append((min_dist, slot))
 
@@ -80,7 +147,8 @@ def pick_best_slot(
     Args:
         slots: List of slot dicts with 'time' key
         preferred_times: Preferred time strings
-        window_minutes: Max acceptable distance in minutes
+        window_minutes: Accepted for symmetry with filter_slots_by_time; the
+            closest slot is returned even when it is outside the window
 
     Returns:
         Best matching slot dict, or None if no slots available
@@ -91,26 +159,27 @@ def pick_best_slot(
     if not preferred_times:
         return slots[0]
 
-    filtered = filter_slots_by_time(slots, preferred_times, window_minutes)
-    if filtered:
-        return filtered[0]
-
-    # No slots within window — return the closest overall
-    parsed_prefs = [parse_time(t) for t in preferred_times]
-    parsed_prefs = [t for t in parsed_prefs if t is not None]
+    pref_minutes = _preferred_minutes(preferred_times)
 
-    if not parsed_prefs:
+    if not pref_minutes:
         return slots[0]
 
+    if np is not None and len(slots) * len(pref_minutes) >= _VECTORIZE_MIN_PAIRS:
+        return _pick_vectorized(slots, pref_minutes)
+
+    # Closest slot wins (earliest on ties) whether or not it falls inside the
+    # window, so one pass covers both cases; an exact match can't be beaten.
     best = None
-    best_dist = float('inf')
+    best_dist = None
     for slot in slots:
-        slot_time = parse_time(slot.get('time', ''))
-        if slot_time is None:
+        slot_minute = _minute_of_day(slot.get('time', ''))
+        if slot_minute is None:
             continue
-        dist = min(_time_distance_minutes(slot_time, p) for p in parsed_prefs)
-        if dist < best_dist:
+        dist = min(abs(slot_minute - p) for p in pref_minutes)
+        if best_dist is None or dist < best_dist:
             best_dist = dist
             best = slot
+            if dist == 0:
+                break
 
-    return best or slots[0]
+    return best if best is not None else slots[0]
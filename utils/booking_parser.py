@@ -5,6 +5,14 @@ from datetime import datetime
 from typing import Dict, Optional
 from utils.slug_utils import normalize_slug
 
+# Compiled once at import and shared by every parse() call
+_RESTAURANT_RE = re.compile(r'^(.+?)\s+on\s+', re.IGNORECASE)
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_MONTH_DAY_RE = re.compile(r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(\d{1,2})')
+_TIME_RE = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)')
+_PARTY_FOR_RE = re.compile(r'for\s+(\d+)')
+_PARTY_OF_RE = re.compile(r'party\s+of\s+(\d+)')
+
 
 class BookingRequestParser:
     """Parse natural language booking requests."""
@@ -48,7 +56,7 @@ class BookingRequestParser:
         request_lower = request_text.lower()
 
         # Extract restaurant name
-        restaurant_match = re.search(r'^(.+?)\s+on\s+', request_text, re.IGNORECASE)
+        restaurant_match = _RESTAURANT_RE.search(request_text)
         if not restaurant_match:
             raise ValueError("Could not find restaurant name (use format: 'Restaurant on date at time')")
 
@@ -76,12 +84,12 @@ class BookingRequestParser:
     def _parse_date(request_text: str, request_lower: str) -> str:
         """Parse date from request text."""
         # Try YYYY-MM-DD format first
-        date_match = re.search(r'\d{4}-\d{2}-\d{2}', request_text)
+        date_match = _ISO_DATE_RE.search(request_text)
         if date_match:
             return date_match.group(0)
 
         # Try "Feb 18" or "February 18" format
-        month_match = re.search(r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(\d{1,2})', request_lower)
+        month_match = _MONTH_DAY_RE.search(request_lower)
         if month_match:
             month_name = month_match.group(1)
             day = month_match.group(2).zfill(2)
@@ -106,7 +114,7 @@ class BookingRequestParser:
     @staticmethod
     def _parse_time(request_lower: str) -> str:
         """Parse time from request text."""
-        time_match = re.search(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)', request_lower)
+        time_match = _TIME_RE.search(request_lower)
         if not time_match:
             raise ValueError("Could not find time (use format: '6pm' or '7:30pm')")
 
@@ -127,11 +135,11 @@ class BookingRequestParser:
     @staticmethod
     def _parse_party_size(request_lower: str) -> int:
         """Parse party size from request text."""
-        party_match = re.search(r'for\s+(\d+)', request_lower)
+        party_match = _PARTY_FOR_RE.search(request_lower)
         if party_match:
             return int(party_match.group(1))
 
-        party_match = re.search(r'party\s+of\s+(\d+)', request_lower)
+        party_match = _PARTY_OF_RE.search(request_lower)
         if party_match:
             return int(party_match.group(1))
 
@@ -0,0 +1,109 @@
+"""
+News Search Cache
+SQLite cache of Brave Search results, bucketed by topic and hour.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Results are reused for the rest of the clock hour they were fetched in
+BUCKET_SECONDS = 3600
+
+# WAL so concurrent agent runs don't block each other; a lost write only
+# costs a refetch, so skip the fsync on every commit
+_CACHE_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+
+# Stored in PRAGMA user_version. Bump when the table changes; older cache
+# files are dropped and recreated rather than migrated.
+_SCHEMA_VERSION = 1
+
+_SELECT_ARTICLES = "SELECT requested, payload FROM news_cache WHERE topic = ? AND bucket = ?"
+_UPSERT_ARTICLES = (
+    "INSERT INTO news_cache (topic, bucket, requested, payload) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(topic, bucket) DO UPDATE SET "
+    "requested = excluded.requested, payload = excluded.payload"
+)
+
+
+def _bucket(ts: float) -> int:
+    """Return the hour bucket for a Unix timestamp."""
+    return int(ts // BUCKET_SECONDS)
+
+
+class NewsCache:
+    """Hour-bucketed cache of search results, safe to share across threads."""
+
+    def __init__(self, db_path=None):
+        """Open (and create if needed) the cache database.
+
+        Args:
+            db_path: SQLite file path (defaults to Settings.NEWS_CACHE_PATH)
+        """
+        self.db_path = db_path or Settings.NEWS_CACHE_PATH
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in _CACHE_PRAGMAS:
+            self.conn.execute(pragma)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS news_cache")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS news_cache (
+                topic TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                requested INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                UNIQUE(topic, bucket)
+            )
+        """)
+        self.conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def get(self, topic: str, num_results: int, ts: Optional[float] = None) -> Optional[List[Dict]]:
+        """Return up to num_results cached articles for topic in the hour containing ts.
+
+        An entry fetched for fewer results than num_results is a miss, so a
+        small earlier search never short-changes a larger later one.
+        """
+        bucket = _bucket(time.time() if ts is None else ts)
+        with self._lock:
+            row = self.conn.execute(_SELECT_ARTICLES, (topic, bucket)).fetchone()
+        if row is None or row[0] < num_results:
+            return None
+        return json.loads(row[1])[:num_results]
+
+    def put(self, topic: str, num_results: int, ts: Optional[float], articles: List[Dict]):
+        """Store articles fetched with num_results for topic in the hour containing ts."""
+        bucket = _bucket(time.time() if ts is None else ts)
+        with self._lock:
+            self.conn.execute(_UPSERT_ARTICLES, (topic, bucket, num_results, json.dumps(articles)))
+            self.conn.commit()
+
+    def prune(self, ts: Optional[float] = None) -> int:
+        """Delete entries older than the current hour. Returns rows removed."""
+        bucket = _bucket(time.time() if ts is None else ts)
+        with self._lock:
+            cursor = self.conn.execute("DELETE FROM news_cache WHERE bucket < ?", (bucket,))
+            self.conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
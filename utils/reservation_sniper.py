@@ -317,19 +317,34 @@ class ReservationSniper:
     def run_scheduled_jobs(self) -> Dict:
         """Run all pending sniper jobs whose scheduled_at has passed.
 
-        Uses atomic claim to prevent two concurrent cron processes from
-        picking up the same job.  Intended to be called by cron every minute.
+        Fetches due jobs in batches with a single query, then claims each one
+        atomically right before running it, so two concurrent cron processes
+        never run the same job and jobs cancelled mid-batch (e.g. siblings of
+        a successful booking) are skipped.  Intended to be called by cron
+        every minute.
 
         Returns:
             Dict with results per job ID
         """
         results = {}
         while not self._shutdown:
-            job = self._store.claim_next_sniper_job()
-            if not job:
+            due_jobs = self._store.fetch_due_sniper_jobs()
+            if not due_jobs:
+                break
+
+            claimed_any = False
+            for due in due_jobs:
+                if self._shutdown:
+                    break
+                job = self._store.claim_sniper_job(due['id'])
+                if not job:
+                    continue  # Claimed elsewhere or cancelled since the fetch
+                claimed_any = True
+                logger.info("Running scheduled sniper job #%d", job['id'])
+                results[job['id']] = self.run_job(job['id'])
+
+            if not claimed_any:
                 break
-            logger.info("Running scheduled sniper job #%d", job['id'])
-            results[job['id']] = self.run_job(job['id'])
 
         if not results:
             logger.debug("No pending sniper jobs to run")
@@ -4,39 +4,234 @@ SQLite database for tracking restaurant reservations.
 """
 
 import json
+import queue
 import sqlite3
 import os
+from contextlib import contextmanager
 from datetime import datetime
+from pathlib import Path
 from zoneinfo import ZoneInfo
 from typing import List, Dict, Optional
 from config.settings import Settings
 
 _EST = ZoneInfo("America/New_York")
 
+# Applied to every connection. WAL lets the CLI read while the sniper writes;
+# busy_timeout makes overlapping cron ticks wait instead of raising SQLITE_BUSY.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_spill=OFF",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Writer-only: journal mode is persisted in the database file.
+_WRITER_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+
+# Stored in PRAGMA user_version once the tables exist. Bump when the DDL in
+# _initialize_tables changes so existing databases re-run it.
+_SCHEMA_VERSION = 1
+
+# Idle read-only connections kept per store
+_MAX_IDLE_READERS = 4
+
+# sqlite3 keeps prepared statements per connection, keyed by SQL text.
+# Sized so the hot statements below (and update_sniper_job's handful of
+# SET-clause variants) are never evicted.
+_STATEMENT_CACHE_SIZE = 256
+
+# Statements run on every sniper poll / cron tick. Module constants keep
+# the SQL text identical across calls so each hits the statement cache.
+_SELECT_SNIPER_JOB = "SELECT * FROM sniper_jobs WHERE id = ?"
+_SELECT_NEXT_DUE_JOB = (
+    "SELECT id FROM sniper_jobs WHERE status = 'pending' AND scheduled_at <= ? "
+    "ORDER BY scheduled_at LIMIT 1"
+)
+_SELECT_DUE_JOBS = (
+    "SELECT * FROM sniper_jobs WHERE status = 'pending' AND scheduled_at <= ? "
+    "ORDER BY scheduled_at LIMIT ?"
+)
+_CLAIM_SNIPER_JOB = (
+    "UPDATE sniper_jobs SET status = 'active', updated_at = ? "
+    "WHERE id = ? AND status = 'pending'"
+)
+# Columns callers may request from get_sniper_job_columns()
+_SNIPER_JOB_COLUMNS = frozenset((
+    'id', 'venue_slug', 'date', 'preferred_times', 'party_size',
+    'time_window_minutes', 'status', 'poll_count', 'max_attempts',
+    'scheduled_at', 'auto_resolve_conflicts', 'reservation_id',
+    'created_at', 'updated_at', 'notes',
+))
+
+_INCREMENT_POLL_COUNT = (
+    "UPDATE sniper_jobs SET poll_count = poll_count + 1, updated_at = ? WHERE id = ?"
+)
+
+_INSERT_RESERVATION = (
+    "INSERT INTO reservations ("
+    "platform, venue_id, restaurant_name, date, time, "
+    "party_size, confirmation_number, confirmation_token, "
+    "status, created_at, updated_at, notes"
+    ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_SNIPER_JOB = (
+    "INSERT INTO sniper_jobs ("
+    "venue_slug, date, preferred_times, party_size, "
+    "time_window_minutes, status, poll_count, max_attempts, "
+    "scheduled_at, auto_resolve_conflicts, created_at, updated_at, notes"
+    ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _connect_readonly(db_path: str) -> sqlite3.Connection:
+    """Open a read-only connection to an existing database file."""
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(
+        uri, uri=True, check_same_thread=False, cached_statements=_STATEMENT_CACHE_SIZE
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 
 def _now_est() -> str:
     """Return current EST/EDT time as naive ISO string."""
     return datetime.now(_EST).replace(tzinfo=None).isoformat()
 
 
+def _reservation_row(data: Dict, now: str) -> tuple:
+    """Build the _INSERT_RESERVATION parameters for a reservation dict."""
+    return (
+        data.get('platform'),
+        data.get('venue_id'),
+        data.get('restaurant_name'),
+        data.get('date'),
+        data.get('time'),
+        data.get('party_size'),
+        data.get('confirmation_number'),
+        data.get('confirmation_token'),
+        data.get('status', 'confirmed'),
+        now,
+        now,
+        data.get('notes'),
+    )
+
+
+def _sniper_job_row(data: Dict, now: str) -> tuple:
+    """Build the _INSERT_SNIPER_JOB parameters for a sniper job dict."""
+    preferred_times = data.get('preferred_times', [])
+    if isinstance(preferred_times, list):
+        preferred_times = json.dumps(preferred_times)
+
+    return (
+        data['venue_slug'],
+        data['date'],
+        preferred_times,
+        data.get('party_size', Settings.DEFAULT_PARTY_SIZE),
+        data.get('time_window_minutes', Settings.SNIPER_DEFAULT_TIME_WINDOW_MINUTES),
+        'pending',
+        0,
+        data.get('max_attempts', Settings.SNIPER_MAX_ATTEMPTS),
+        data['scheduled_at'],
+        1 if data.get('auto_resolve_conflicts', True) else 0,
+        now,
+        now,
+        data.get('notes'),
+    )
+
+
 class ReservationStore:
-    """SQLite database for tracking reservations."""
+    """SQLite database for tracking reservations.
+
+    Holds one writer connection (``conn``) plus a pool of read-only
+    connections for the ``get_*`` methods, so reads from other threads
+    (e.g. the web API) don't queue behind the writer under WAL.
+    """
+
+    def __init__(self, db_path=None, readonly=False):
+        """Initialize database connection.
 
-    def __init__(self, db_path=None):
-        """Initialize database connection."""
+        Args:
+            db_path: SQLite file path (defaults to Settings.RESERVATION_DB_PATH)
+            readonly: Open with ``mode=ro`` for callers that only read (e.g. the
+                CLI job list). Falls back to a normal connection if the database
+                doesn't exist yet, so the schema still gets created.
+        """
         self.db_path = db_path or Settings.RESERVATION_DB_PATH
+        self.readonly = readonly and os.path.exists(self.db_path)
 
-        # Create data directory if it doesn't exist
-        db_dir = os.path.dirname(self.db_path)
-        if db_dir and not os.path.exists(db_dir):
-            os.makedirs(db_dir)
+        if self.readonly:
+            self.conn = _connect_readonly(self.db_path)
+        else:
+            # Create data directory if it doesn't exist
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
 
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        self._initialize_tables()
+            self.conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, cached_statements=_STATEMENT_CACHE_SIZE
+            )
+            self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            for pragma in _CONNECTION_PRAGMAS + _WRITER_PRAGMAS:
+                self.conn.execute(pragma)
+            self._initialize_tables()
+
+        # In-memory databases can't be shared across connections, and a
+        # read-only store's only connection is already a reader.
+        if self.readonly or self.db_path == ':memory:':
+            self._readers = None
+        else:
+            self._readers = queue.Queue(maxsize=_MAX_IDLE_READERS)
+
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection, returning it to the pool afterwards."""
+        if self._readers is None:
+            yield self.conn
+            return
+
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = _connect_readonly(self.db_path)
+
+        try:
+            yield conn
+        finally:
+            try:
+                self._readers.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def _write_transaction(self):
+        """Run a read-then-write sequence under BEGIN IMMEDIATE.
+
+        Takes the write lock up front so two cron processes can't both read
+        the same row before either updates it.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn.cursor()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
 
     def _initialize_tables(self):
-        """Create tables if they don't exist."""
+        """Create tables if they don't exist.
+
+        Skipped when user_version shows the schema is already current, so
+        reopening an initialized database (every cron tick) runs no DDL.
+        """
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return
+
         cursor = self.conn.cursor()
 
         # Reservations table
@@ -80,6 +275,7 @@ class ReservationStore:
             )
         ''')
 
+        cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         self.conn.commit()
 
     def add_reservation(self, data: Dict) -> int:
@@ -95,32 +291,25 @@ class ReservationStore:
             int: The ID of the newly created reservation
         """
         cursor = self.conn.cursor()
-        now = _now_est()
-
-        cursor.execute('''
-            INSERT INTO reservations (
-                platform, venue_id, restaurant_name, date, time,
-                party_size, confirmation_number, confirmation_token,
-                status, created_at, updated_at, notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            data.get('platform'),
-            data.get('venue_id'),
-            data.get('restaurant_name'),
-            data.get('date'),
-            data.get('time'),
-            data.get('party_size'),
-            data.get('confirmation_number'),
-            data.get('confirmation_token'),
-            data.get('status', 'confirmed'),
-            now,
-            now,
-            data.get('notes')
-        ))
+        cursor.execute(_INSERT_RESERVATION, _reservation_row(data, _now_est()))
 
         self.conn.commit()
         return cursor.lastrowid
 
+    def add_reservations(self, items: List[Dict]) -> int:
+        """Add several reservations in a single transaction.
+
+        Args:
+            items: Reservation dicts, as accepted by add_reservation
+
+        Returns:
+            int: Number of rows inserted
+        """
+        now = _now_est()
+        with self._write_transaction() as cursor:
+            cursor.executemany(_INSERT_RESERVATION, [_reservation_row(d, now) for d in items])
+        return len(items)
+
     def get_reservations(self, filters: Optional[Dict] = None) -> List[Dict]:
         """
         Get reservations with optional filtering.
@@ -132,7 +321,6 @@ class ReservationStore:
         Returns:
             List of reservation dictionaries
         """
-        cursor = self.conn.cursor()
         query = "SELECT * FROM reservations WHERE 1=1"
         params = []
 
@@ -155,17 +343,16 @@ class ReservationStore:
 
         query += " ORDER BY date DESC, time DESC"
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        with self._reader() as conn:
+            rows = conn.execute(query, params).fetchall()
 
         # Convert to list of dictionaries
         return [dict(row) for row in rows]
 
     def get_reservation_by_id(self, reservation_id: int) -> Optional[Dict]:
         """Get a single reservation by ID."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM reservations WHERE id = ?", (reservation_id,))
-        row = cursor.fetchone()
+        with self._reader() as conn:
+            row = conn.execute("SELECT * FROM reservations WHERE id = ?", (reservation_id,)).fetchone()
 
         return dict(row) if row else None
 
@@ -250,88 +437,130 @@ class ReservationStore:
             ID of the created job
         """
         cursor = self.conn.cursor()
-        now = _now_est()
-
-        preferred_times = data.get('preferred_times', [])
-        if isinstance(preferred_times, list):
-            preferred_times = json.dumps(preferred_times)
-
-        cursor.execute('''
-            INSERT INTO sniper_jobs (
-                venue_slug, date, preferred_times, party_size,
-                time_window_minutes, status, poll_count, max_attempts,
-                scheduled_at, auto_resolve_conflicts, created_at, updated_at, notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            data['venue_slug'],
-            data['date'],
-            preferred_times,
-            data.get('party_size', Settings.DEFAULT_PARTY_SIZE),
-            data.get('time_window_minutes', Settings.SNIPER_DEFAULT_TIME_WINDOW_MINUTES),
-            'pending',
-            0,
-            data.get('max_attempts', Settings.SNIPER_MAX_ATTEMPTS),
-            data['scheduled_at'],
-            1 if data.get('auto_resolve_conflicts', True) else 0,
-            now,
-            now,
-            data.get('notes'),
-        ))
+        cursor.execute(_INSERT_SNIPER_JOB, _sniper_job_row(data, _now_est()))
 
         self.conn.commit()
         return cursor.lastrowid
 
+    def add_sniper_jobs(self, items: List[Dict]) -> int:
+        """Add several sniper jobs in a single transaction.
+
+        Args:
+            items: Job dicts, as accepted by add_sniper_job
+
+        Returns:
+            Number of rows inserted
+        """
+        now = _now_est()
+        with self._write_transaction() as cursor:
+            cursor.executemany(_INSERT_SNIPER_JOB, [_sniper_job_row(d, now) for d in items])
+        return len(items)
+
     def get_sniper_job(self, job_id: int) -> Optional[Dict]:
         """Get a sniper job by ID."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM sniper_jobs WHERE id = ?", (job_id,))
-        row = cursor.fetchone()
+        with self._reader() as conn:
+            row = conn.execute(_SELECT_SNIPER_JOB, (job_id,)).fetchone()
         if not row:
             return None
         return self._deserialize_sniper_job(row)
 
     def get_pending_sniper_jobs(self) -> List[Dict]:
         """Get sniper jobs whose scheduled_at has passed and status is pending."""
-        cursor = self.conn.cursor()
         now = _now_est()
-        cursor.execute(
-            "SELECT * FROM sniper_jobs WHERE status = 'pending' AND scheduled_at <= ? ORDER BY scheduled_at",
-            (now,)
-        )
-        rows = cursor.fetchall()
+        with self._reader() as conn:
+            rows = conn.execute(
+                "SELECT * FROM sniper_jobs WHERE status = 'pending' AND scheduled_at <= ? ORDER BY scheduled_at",
+                (now,)
+            ).fetchall()
         return [self._deserialize_sniper_job(row) for row in rows]
 
     def get_all_sniper_jobs(self) -> List[Dict]:
         """Get all sniper jobs."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM sniper_jobs ORDER BY created_at DESC")
-        rows = cursor.fetchall()
+        with self._reader() as conn:
+            rows = conn.execute("SELECT * FROM sniper_jobs ORDER BY created_at DESC").fetchall()
+        return [self._deserialize_sniper_job(row) for row in rows]
+
+    def get_sniper_job_columns(self, columns: List[str]) -> Dict[str, List]:
+        """Get the requested columns of all sniper jobs, one list per column.
+
+        Cheaper than get_all_sniper_jobs() for scans that only read a few
+        fields (e.g. the CLI job table): only those columns are selected and
+        no per-row dict is built.
+
+        Args:
+            columns: sniper_jobs column names, e.g. ['id', 'status']
+
+        Returns:
+            Dict of column -> values, ordered newest job first
+        """
+        unknown = set(columns) - _SNIPER_JOB_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown sniper_jobs columns: {', '.join(sorted(unknown))}")
+
+        with self._reader() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(columns)} FROM sniper_jobs ORDER BY created_at DESC"
+            ).fetchall()
+
+        result = {column: [row[i] for row in rows] for i, column in enumerate(columns)}
+        if 'preferred_times' in result:
+            result['preferred_times'] = [json.loads(v) for v in result['preferred_times']]
+        if 'auto_resolve_conflicts' in result:
+            result['auto_resolve_conflicts'] = [bool(v) for v in result['auto_resolve_conflicts']]
+        return result
+
+    def fetch_due_sniper_jobs(self, now: Optional[str] = None, limit: int = 64) -> List[Dict]:
+        """Fetch up to ``limit`` due pending sniper jobs in one query.
+
+        Does not claim them — pair with claim_sniper_job() before running each.
+
+        Args:
+            now: ISO datetime cutoff (defaults to current EST time)
+            limit: Maximum number of jobs to return
+
+        Returns:
+            Due jobs ordered by scheduled_at
+        """
+        now = now or _now_est()
+        with self._reader() as conn:
+            rows = conn.execute(_SELECT_DUE_JOBS, (now, limit)).fetchall()
         return [self._deserialize_sniper_job(row) for row in rows]
 
+    def claim_sniper_job(self, job_id: int) -> Optional[Dict]:
+        """Atomically claim a specific pending sniper job.
+
+        The UPDATE only matches while the job is still pending, so a job that
+        was claimed by another process (or cancelled) in the meantime is skipped.
+
+        Returns:
+            Claimed job dict, or None if the job is no longer pending
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(_CLAIM_SNIPER_JOB, (_now_est(), job_id))
+        self.conn.commit()
+        if cursor.rowcount == 0:
+            return None
+        return self.get_sniper_job(job_id)
+
     def claim_next_sniper_job(self) -> Optional[Dict]:
         """Atomically claim the next due pending sniper job.
 
-        Uses SELECT then UPDATE WHERE status='pending' to prevent two
-        concurrent cron processes from claiming the same job.
+        Runs SELECT then UPDATE WHERE status='pending' inside BEGIN IMMEDIATE
+        to prevent two concurrent cron processes from claiming the same job.
 
         Returns:
             Claimed job dict, or None if no due jobs
         """
-        cursor = self.conn.cursor()
         now = _now_est()
-        cursor.execute(
-            "SELECT id FROM sniper_jobs WHERE status = 'pending' AND scheduled_at <= ? "
-            "ORDER BY scheduled_at LIMIT 1", (now,))
-        row = cursor.fetchone()
-        if not row:
-            return None
-        job_id = row['id']
-        cursor.execute(
-            "UPDATE sniper_jobs SET status = 'active', updated_at = ? "
-            "WHERE id = ? AND status = 'pending'", (now, job_id))
-        self.conn.commit()
-        if cursor.rowcount == 0:
-            return None  # Another process claimed it
+        with self._write_transaction() as cursor:
+            cursor.execute(_SELECT_NEXT_DUE_JOB, (now,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            job_id = row['id']
+            cursor.execute(_CLAIM_SNIPER_JOB, (now, job_id))
+            if cursor.rowcount == 0:
+                return None  # Another process claimed it
         return self.get_sniper_job(job_id)
 
     def update_sniper_job(self, job_id: int, updates: Dict) -> bool:
@@ -389,15 +618,18 @@ class ReservationStore:
         """Increment the poll_count for a sniper job."""
         cursor = self.conn.cursor()
         now = _now_est()
-        cursor.execute(
-            "UPDATE sniper_jobs SET poll_count = poll_count + 1, updated_at = ? WHERE id = ?",
-            (now, job_id)
-        )
+        cursor.execute(_INCREMENT_POLL_COUNT, (now, job_id))
         self.conn.commit()
         return cursor.rowcount > 0
 
     def close(self):
-        """Close the database connection."""
+        """Close the writer and any pooled reader connections."""
+        if self._readers is not None:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
         if self.conn:
             self.conn.close()
 
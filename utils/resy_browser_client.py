@@ -9,6 +9,7 @@ from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page,
 import time
 import random
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional
 from config.settings import Settings
@@ -17,6 +18,21 @@ from utils.selectors import ResySelectors, SelectorHelper
 
 logger = logging.getLogger(__name__)
 
+# Venue slug in a card href, e.g. /cities/new-york-ny/venues/peking-duck-house?seats=2
+_VENUE_SLUG_RE = re.compile(r'/venues/([^/?#]+)')
+
+# Venue card fields, matched once per card in search_by_cuisine
+_RATING_RE = re.compile(r'(\d+\.?\d*)')
+_REVIEW_COUNT_RE = re.compile(r'\((\d+)\)')
+_PRICE_RE = re.compile(r'(\$+)')
+
+# Time in an event card's date text, e.g. "Fri Mar 6 at 5:30 PM"
+_EVENT_TIME_RE = re.compile(r'(\d{1,2}:\d{2}\s*[AP]M)', re.IGNORECASE)
+
+# Resy search page URL; the cuisine facet is appended only when one is given
+_SEARCH_URL = "https://resy.com/cities/{location}/search?seats={seats}&date={date}"
+_CUISINE_FACET = "&facet=cuisine:{}"
+
 
 def _is_threading_error(e: Exception) -> bool:
     """Check if exception is a Playwright greenlet threading error."""
@@ -31,14 +47,38 @@ LOCATION_CODES = {
 }
 
 
+def _extract_venue_slug(href: str) -> Optional[str]:
+    """Return the venue slug from a Resy venue href, or None if it has none."""
+    match = _VENUE_SLUG_RE.search(href)
+    return match.group(1) if match else None
+
+
+def _build_search_url(location: str, date: str, party_size: int,
+                      cuisine: Optional[str] = None) -> str:
+    """Build the Resy search URL for a location, date and party size.
+
+    Neighborhood is never part of the URL: Resy's facet=neighborhood is
+    unreliable (doesn't work for boroughs like Manhattan/Brooklyn), so
+    neighborhood targeting is done by panning the map instead.
+    """
+    url = _SEARCH_URL.format(location=resolve_location(location), seats=party_size, date=date)
+    return url + _CUISINE_FACET.format(cuisine) if cuisine else url
+
+
+@lru_cache(maxsize=32)
 def resolve_location(location: str) -> str:
-    """Resolve a short location code to its full Resy location name."""
+    """Resolve a short location code to its full Resy location name (memoized)."""
     return LOCATION_CODES.get(location.lower(), location.lower())
 
 
 class ResyBrowserClient:
     """Browser automation client for Resy - mirrors ResyClient interface."""
 
+    # Clock used for rate limiting, waits and deadlines; override per instance
+    # (e.g. client._sleep = lambda s: None) to run without real delays
+    _sleep = staticmethod(time.sleep)
+    _now = staticmethod(time.time)
+
     # Quick auth check selectors (used before login attempt)
     AUTH_INDICATORS_QUICK = [
         '[data-test-id="user-menu"]',
@@ -209,11 +249,11 @@ class ResyBrowserClient:
             navigation: If True (default), use full delays for HTTP navigations.
                         If False, use lighter delays for in-page actions.
         """
-        if not force and (time.time() - self.last_request_time) < 2:
+        if not force and (self._now() - self.last_request_time) < 2:
             # Skip rate limit for fast local operations
             return
 
-        current_time = time.time()
+        current_time = self._now()
         time_since_last = current_time - self.last_request_time
 
         if navigation:
@@ -225,11 +265,11 @@ class ResyBrowserClient:
                 )
                 sleep_time = (self.min_delay_seconds - time_since_last) + jitter
                 print(f"  ⏳ Rate limiting: waiting {sleep_time:.1f}s...")
-                time.sleep(sleep_time)
+                self._sleep(sleep_time)
             else:
                 # Even when not rate-limited, add small random delay
                 small_jitter = random.uniform(0.3, 0.8)
-                time.sleep(small_jitter)
+                self._sleep(small_jitter)
         else:
             # Lighter rate limiting for in-page actions (no HTTP navigation)
             min_delay = 1.0
@@ -237,14 +277,14 @@ class ResyBrowserClient:
                 jitter = random.uniform(0.2, 0.5)
                 sleep_time = (min_delay - time_since_last) + jitter
                 print(f"  ⏳ Rate limiting (in-page): waiting {sleep_time:.1f}s...")
-                time.sleep(sleep_time)
+                self._sleep(sleep_time)
 
-        self.last_request_time = time.time()
+        self.last_request_time = self._now()
 
     def _add_human_behavior(self, page):
         """Add realistic delays and behavior to avoid detection and account flagging."""
         # Random delay
-        time.sleep(random.uniform(0.1, 0.4))
+        self._sleep(random.uniform(0.1, 0.4))
 
         # Occasional random scroll
         if random.random() > 0.7:
@@ -341,12 +381,12 @@ class ResyBrowserClient:
         Returns:
             Tuple of (locator, frame) or None if not found within timeout
         """
-        deadline = time.time() + timeout
-        while time.time() < deadline:
+        deadline = self._now() + timeout
+        while self._now() < deadline:
             result = self._find_in_frames(selectors)
             if result is not None:
                 return result
-            time.sleep(0.5)
+            self._sleep(0.5)
         return None
 
     def _is_session_valid(self) -> bool:
@@ -357,7 +397,7 @@ class ResyBrowserClient:
 
             # Wait for dynamic content to load
             print("     → Waiting for page to fully load...")
-            time.sleep(0.5)
+            self._sleep(0.5)
 
             # Take screenshot for debugging
             self._screenshot('session_check')
@@ -479,7 +519,7 @@ class ResyBrowserClient:
 
             # Wait for login modal/form to appear
             print("    Waiting for login modal...")
-            time.sleep(2)  # Give modal time to animate in
+            self._sleep(2)  # Give modal time to animate in
 
             # Resy login flow: First shows phone number login
             # Need to click "Log in with email & password" link at bottom
@@ -491,7 +531,7 @@ class ResyBrowserClient:
             if email_login_link:
                 print("    Clicking 'Log in with email & password'...")
                 email_login_link.click()
-                time.sleep(2)  # Wait for form to load
+                self._sleep(2)  # Wait for form to load
             else:
                 print("    No email/password link found, trying direct email input...")
 
@@ -580,7 +620,7 @@ class ResyBrowserClient:
 
             # Wait for navigation/login to complete (longer for proxy latency)
             print("    Waiting for login to complete...")
-            time.sleep(8)  # Give time for authentication (proxy adds latency)
+            self._sleep(8)  # Give time for authentication (proxy adds latency)
 
             # Check for success message first (Resy shows "You are all set" modal)
             login_success_selectors = [
@@ -651,7 +691,7 @@ class ResyBrowserClient:
 
                 # Wait for success modal to close (optional)
                 print("    Waiting for success modal to close...")
-                time.sleep(2)
+                self._sleep(2)
             else:
                 self._screenshot('login_after_submit')
                 raise Exception("Could not confirm login success")
@@ -794,14 +834,14 @@ class ResyBrowserClient:
 
             if moved:
                 print(f"     ✓ Map moved via {moved}")
-                time.sleep(1)
+                self._sleep(1)
             else:
                 # Fallback: mouse drag
                 print(f"     ⚠️  Google Maps API not accessible, falling back to mouse drag")
                 self._pan_map_by_drag(map_elem, lat, lng)
 
             # Wait for pan animation, then re-fire idle to ensure button renders
-            time.sleep(2)
+            self._sleep(2)
             self.page.evaluate("""() => {
                 const container = document.querySelector('.MapContainer');
                 if (!container) return;
@@ -864,7 +904,7 @@ class ResyBrowserClient:
                     self.page.mouse.down()
                     self.page.mouse.move(cx + 5, cy + 5, steps=3)
                     self.page.mouse.up()
-                    time.sleep(1)
+                    self._sleep(1)
                     search_btn = SelectorHelper.find_element(
                         self.page, ResySelectors.SEARCH_HERE_BUTTON, timeout=5000
                     )
@@ -872,7 +912,7 @@ class ResyBrowserClient:
             if search_btn:
                 search_btn.click()
                 print(f"     ✓ Clicked 'Search Here' button")
-                time.sleep(2)
+                self._sleep(2)
                 try:
                     self.page.wait_for_function(
                         """() => {
@@ -927,10 +967,10 @@ class ResyBrowserClient:
                 center_x - drag_x * frac,
                 center_y - drag_y * frac
             )
-            time.sleep(random.uniform(0.05, 0.15))
+            self._sleep(random.uniform(0.05, 0.15))
 
         self.page.mouse.up()
-        time.sleep(0.5)
+        self._sleep(0.5)
 
     def search_by_cuisine(self, cuisine=None, neighborhood=None, location='ny',
                           date=None, party_size=2) -> List[Dict]:
@@ -967,15 +1007,9 @@ class ResyBrowserClient:
         self._rate_limit()
 
         try:
-            # Build search URL
-            full_location = resolve_location(location)
-            url = f"https://resy.com/cities/{full_location}/search?seats={party_size}&date={date}"
-
-            if cuisine:
-                url += f"&facet=cuisine:{cuisine}"
-            # Note: neighborhood facet removed — Resy's facet=neighborhood is unreliable
-            # (doesn't work for boroughs like Manhattan/Brooklyn). Neighborhood targeting
-            # is done via _pan_map_to_neighborhood after initial results load.
+            # Neighborhood targeting is done via _pan_map_to_neighborhood
+            # after initial results load, not in the URL
+            url = _build_search_url(location, date, party_size, cuisine)
 
             print(f"     Navigating to: {url}")
             self.page.goto(url, wait_until='domcontentloaded', timeout=Settings.RESY_BROWSER_TIMEOUT_MS)
@@ -991,7 +1025,7 @@ class ResyBrowserClient:
                     }""",
                     timeout=15000
                 )
-                time.sleep(0.5)  # Additional buffer for all cards to render
+                self._sleep(0.5)  # Additional buffer for all cards to render
                 print(f"     ✓ Search results loaded")
             except Exception as e:
                 print(f"     ⚠️  Timeout waiting for results: {e}")
@@ -1016,10 +1050,7 @@ class ResyBrowserClient:
                 try:
                     href = link.get_attribute('href') or ''
 
-                    # Extract slug from href (e.g., /cities/new-york-ny/venues/peking-duck-house)
-                    slug = None
-                    if '/venues/' in href:
-                        slug = href.split('/venues/')[-1].split('?')[0].strip('/')
+                    slug = _extract_venue_slug(href)
 
                     if not slug or slug in seen_slugs:
                         continue
@@ -1054,10 +1085,10 @@ class ResyBrowserClient:
                         if rating_elem.count() > 0:
                             rating_text = rating_elem.inner_text().strip()
                             # Parse "4.8 (123)" or just "4.8"
-                            rating_match = re.search(r'(\d+\.?\d*)', rating_text)
+                            rating_match = _RATING_RE.search(rating_text)
                             if rating_match:
                                 rating = float(rating_match.group(1))
-                            count_match = re.search(r'\((\d+)\)', rating_text)
+                            count_match = _REVIEW_COUNT_RE.search(rating_text)
                             if count_match:
                                 review_count = int(count_match.group(1))
                     except:
@@ -1077,7 +1108,7 @@ class ResyBrowserClient:
                         if price_elem.count() > 0:
                             price_text = price_elem.inner_text().strip()
                             # Look for $ symbols
-                            price_match = re.search(r'(\$+)', price_text)
+                            price_match = _PRICE_RE.search(price_text)
                             if price_match:
                                 price_range = price_match.group(1)
                     except:
@@ -1278,14 +1309,14 @@ class ResyBrowserClient:
             print(f"    Waiting for availability calendar to load...")
             try:
                 self.page.wait_for_function(self._SLOT_DETECT_JS, timeout=10000)
-                time.sleep(0.5)  # Additional buffer
+                self._sleep(0.5)  # Additional buffer
                 print(f"    ✓ Calendar loaded")
             except Exception:
                 # First wait failed — give slow pages a second chance
                 print(f"    ⚠️  Slots not found yet, waiting longer...")
                 try:
                     self.page.wait_for_function(self._SLOT_DETECT_JS, timeout=20000)
-                    time.sleep(0.5)
+                    self._sleep(0.5)
                     print(f"    ✓ Calendar loaded (after extended wait)")
                 except Exception as e:
                     print(f"    ⚠️  Timeout waiting for calendar: {e}")
@@ -1368,7 +1399,7 @@ class ResyBrowserClient:
                             continue
                         date_text = date_el.inner_text().strip()  # e.g. "Fri Mar 6 at 5:30 PM"
                         # Extract time from "... at H:MM PM"
-                        time_match = re.search(r'(\d{1,2}:\d{2}\s*[AP]M)', date_text, re.IGNORECASE)
+                        time_match = _EVENT_TIME_RE.search(date_text)
                         if not time_match:
                             continue
                         actual_time = time_match.group(1)
@@ -1407,12 +1438,15 @@ class ResyBrowserClient:
                 print(f"    ✗ No availability found (could not find time slots)")
                 return []
 
+        except PlaywrightTimeoutError as e:
+            # Slow page loads are routine on a poll loop — no traceback needed
+            logger.warning("Availability check timed out: %s", e)
+            return []
         except Exception as e:
             print(f"    ✗ Availability check failed: {e}")
             if _is_threading_error(e):
                 raise
-            import traceback
-            traceback.print_exc()
+            logger.debug("Availability check traceback", exc_info=True)
             return []
 
     def get_booking_details(self, config_id: str, date: str, party_size: int) -> Optional[Dict]:
@@ -1498,20 +1532,20 @@ class ResyBrowserClient:
                 print(f"     Waiting for availability calendar to load...")
                 try:
                     self.page.wait_for_function(self._SLOT_DETECT_JS, timeout=10000)
-                    time.sleep(0.5)
+                    self._sleep(0.5)
                     print(f"     ✓ Availability calendar loaded")
                 except Exception:
                     print(f"     ⚠️  Slots not found yet, waiting longer...")
                     try:
                         self.page.wait_for_function(self._SLOT_DETECT_JS, timeout=20000)
-                        time.sleep(0.5)
+                        self._sleep(0.5)
                         print(f"     ✓ Availability calendar loaded (after extended wait)")
                     except Exception as e:
                         print(f"     ⚠️  Timeout waiting for availability: {e}")
             else:
                 # Already on page, calendar should be loaded
                 print(f"     Calendar should already be loaded from previous check")
-                time.sleep(0.5)
+                self._sleep(0.5)
 
             # Find and click the time slot button
             print(f"     Looking for time slot: {time_text}")
@@ -1564,7 +1598,7 @@ class ResyBrowserClient:
 
             # Look for booking form or confirmation modal
             print(f"     Waiting for booking modal to appear...")
-            time.sleep(0.5)  # Brief wait for modal animation to start
+            self._sleep(0.5)  # Brief wait for modal animation to start
 
             # Wait for modal to appear (shorter timeout, modal should appear quickly)
             modal_appeared = False
@@ -1574,7 +1608,7 @@ class ResyBrowserClient:
                 self.page.wait_for_selector(combined_modal, timeout=5000)
                 print(f"     ✓ Booking modal appeared")
                 modal_appeared = True
-                time.sleep(0.3)  # Brief wait for modal content
+                self._sleep(0.3)  # Brief wait for modal content
 
             except Exception as e:
                 print(f"     ⚠️  Modal might not have appeared, proceeding anyway...")
@@ -1638,7 +1672,7 @@ class ResyBrowserClient:
             iframe_result = self._wait_for_in_frames([booking_button_selector], timeout=10)
             if iframe_result is not None:
                 print(f"     ✓ Booking iframe loaded")
-                time.sleep(0.5)
+                self._sleep(0.5)
             else:
                 print(f"     ⚠️  Booking iframe not loaded after 10s, proceeding anyway...")
 
@@ -1657,14 +1691,14 @@ class ResyBrowserClient:
                             try:
                                 # Scroll the iframe content to bottom
                                 frame.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                                time.sleep(0.5)
+                                self._sleep(0.5)
                             except:
                                 pass
 
                             # Try to scroll element into view
                             try:
                                 elem.scroll_into_view_if_needed(timeout=3000)
-                                time.sleep(0.5)
+                                self._sleep(0.5)
                             except:
                                 pass
 
@@ -1685,7 +1719,7 @@ class ResyBrowserClient:
                     if self.page.locator(booking_button_selector).count() > 0:
                         elem = self.page.locator(booking_button_selector).first
                         elem.scroll_into_view_if_needed(timeout=2000)
-                        time.sleep(0.5)
+                        self._sleep(0.5)
                         if elem.is_visible() and not elem.is_disabled():
                             continue_button = elem
                             print(f"       ✓ Found on main page")
@@ -1737,7 +1771,7 @@ class ResyBrowserClient:
                         if clicked and clicked.get('success'):
                             print(f"       ✓ JavaScript click succeeded: '{clicked.get('text')}' via {clicked.get('method')}")
                             # Give time for click to process
-                            time.sleep(2)
+                            self._sleep(2)
                             # Mark as found so we don't show error
                             continue_button = "javascript_clicked"
                         else:
@@ -1798,9 +1832,9 @@ class ResyBrowserClient:
                         if booking_frame:
                             try:
                                 booking_frame.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                                time.sleep(0.3)
+                                self._sleep(0.3)
                                 continue_button.scroll_into_view_if_needed(timeout=3000)
-                                time.sleep(0.3)
+                                self._sleep(0.3)
                             except:
                                 pass
 
@@ -1844,7 +1878,7 @@ class ResyBrowserClient:
                     print(f"       ✗ Reserve Now click failed: {str(e)[:100]}")
                     raise e
 
-                time.sleep(2)  # Wait for Resy to process booking before checking confirmation
+                self._sleep(2)  # Wait for Resy to process booking before checking confirmation
 
                 # Check for existing reservation conflict modal
                 # Search main page AND all iframes (conflict modal is inside booking iframe)
@@ -1936,7 +1970,7 @@ class ResyBrowserClient:
                 if 'confirm' in btn_text and not btn.is_disabled():
                     print(f"       ✓ Found Confirm button: '{btn_text}'")
                     btn.scroll_into_view_if_needed(timeout=1000)
-                    time.sleep(0.3)
+                    self._sleep(0.3)
                     btn.click(timeout=3000)
                     print(f"       ✓ Final Confirm button clicked!")
                     final_button_found = True
@@ -1944,10 +1978,10 @@ class ResyBrowserClient:
                 pass
 
         if final_button_found:
-            time.sleep(1)  # Wait for booking to complete
+            self._sleep(1)  # Wait for booking to complete
         else:
             print(f"       ⚠️  Final Confirm button not found (may not be needed)")
-            time.sleep(0.5)
+            self._sleep(0.5)
 
         # Look for confirmation or final booking button
         final_button_selectors = [
@@ -1974,7 +2008,7 @@ class ResyBrowserClient:
 
             print(f"     Clicking final booking button...")
             final_button.click()
-            time.sleep(1)  # Brief wait for confirmation
+            self._sleep(1)  # Brief wait for confirmation
 
         # Look for confirmation message
         print(f"     Checking for confirmation...")
@@ -2135,7 +2169,7 @@ class ResyBrowserClient:
                         'error': 'Continue Booking button not found'
                     }
 
-                time.sleep(2)  # Wait for Resy to process
+                self._sleep(2)  # Wait for Resy to process
 
                 # Now check for booking confirmation
                 return self._check_booking_confirmation(